@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Cascade engine: fused stages vs. chained encrypt() calls.
+
+Encrypts a natural-text corpus through Caesar -> Hill -> Affine ->
+Hill -> Caesar, once by chaining each cipher's encrypt() (a full pass and a new
+string per stage) and once with ciphers.cascade.Cascade (one fused
+lookup), and compares both with a single Hill pass.
+
+Usage:
+    python benchmarks/bench_cascade.py
+    python benchmarks/bench_cascade.py --mb 50
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_layout import natural_text
+from ciphers import get_cipher
+from ciphers.cascade import Cascade
+
+STAGES = (('caesar', 3), ('hill', '3,3,2,5'), ('affine', '5,8'), ('hill', '5,8,17,3'), ('caesar', 11))
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def chained(text):
+    for name, key in STAGES:
+        text = get_cipher(name).encrypt(text, key)
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cascade fusion benchmark')
+    parser.add_argument('--mb', type=float, default=10, help='Corpus size in MB (default: 10)')
+    args = parser.parse_args()
+
+    text = natural_text(int(args.mb * 1_000_000))
+    cascade = Cascade([name for name, _ in STAGES])
+    key = cascade.compile_key([key for _, key in STAGES])
+    mb = len(text) / 1e6
+
+    single_seconds, _ = timed(get_cipher('hill').encrypt, text, '3,3,2,5')
+    chained_seconds, chained_result = timed(chained, text)
+    fused_seconds, fused_result = timed(cascade.encrypt, text, key)
+    assert fused_result == chained_result
+
+    print(f"{mb:.0f} MB, stages: {' -> '.join(name for name, _ in STAGES)}")
+    print(f"hill alone          {single_seconds:7.3f} s  ({mb / single_seconds:6.1f} MB/s)")
+    print(f"chained encrypt()   {chained_seconds:7.3f} s  ({mb / chained_seconds:6.1f} MB/s)")
+    print(f"fused cascade       {fused_seconds:7.3f} s  ({mb / fused_seconds:6.1f} MB/s)"
+          f"  {chained_seconds / fused_seconds:.1f}x faster than chained")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Hill cipher bulk engine: throughput vs. thread count.
+
+Encrypts a random digraph array with ciphers.hill_cipher.transform_pairs
+using 1..N threads (N = os.cpu_count() by default) and prints a
+throughput curve.
+
+Usage:
+    python benchmarks/bench_hill_threads.py
+    python benchmarks/bench_hill_threads.py --mb 256 --max-threads 16
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ciphers.hill_cipher import SLAB_PAIRS, transform_pairs
+
+
+def measure(pairs, matrix, threads, slab_pairs, repeat):
+    """Best-of-N wall time for one full pass"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        transform_pairs(pairs, matrix, threads=threads, slab_pairs=slab_pairs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Hill bulk engine thread scaling')
+    parser.add_argument('--mb', type=int, default=64,
+                        help='Letters to encrypt, in millions (default: 64)')
+    parser.add_argument('--max-threads', type=int, default=os.cpu_count() or 1,
+                        help='Largest thread count to try (default: CPU count)')
+    parser.add_argument('--slab', type=int, default=SLAB_PAIRS,
+                        help=f'Digraphs per slab (default: {SLAB_PAIRS})')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Runs per point, best is reported (default: 3)')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    pairs = rng.integers(0, 26, size=(args.mb * 1_000_000 // 2, 2), dtype=np.uint8)
+    matrix = np.array([[3, 3], [2, 5]])
+
+    print(f"{args.mb}M letters, slab = {args.slab} digraphs, {os.cpu_count()} CPUs")
+    print(f"{'threads':>7}  {'seconds':>8}  {'MB/s':>8}  {'speedup':>7}")
+
+    baseline = None
+    for threads in range(1, args.max_threads + 1):
+        seconds = measure(pairs, matrix, threads, args.slab, args.repeat)
+        baseline = baseline or seconds
+        print(f"{threads:7d}  {seconds:8.3f}  {args.mb / seconds:8.1f}  {baseline / seconds:6.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Layout restoration benchmark on natural text.
+
+Compares the old per-space list.insert restoration (O(n*k)) with the
+single-pass TextBuffer layout stage, then times full Hill and Playfair
+encryption of the whole corpus (10 MB by default).
+
+The old restoration is quadratic, so it only runs on a small prefix;
+its 10 MB figure is extrapolated from that.
+
+Usage:
+    python benchmarks/bench_layout.py
+    python benchmarks/bench_layout.py --mb 50 --legacy-kb 256
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ciphers import HillCipher, PlayfairCipher, TextBuffer
+
+WORDS = ("the of and to in a is that for it as was with be by on not he this are or his "
+         "from at which but have an they you were her she there been one all we their "
+         "Cipher Matrix Hill Playfair London Monday message letter secret key attack").split()
+
+
+def natural_text(size, seed=0):
+    """Prose-like text: words, capitals, punctuation, line breaks"""
+    rng = random.Random(seed)
+    parts, length = [], 0
+    while length < size:
+        sentence = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(4, 18)))
+        sentence = sentence[0].upper() + sentence[1:] + rng.choice('.....?!;,')
+        sentence += '\n' if rng.random() < 0.15 else ' '
+        parts.append(sentence)
+        length += len(sentence)
+    return ''.join(parts)[:size]
+
+
+def legacy_restore(text):
+    """Old HillCipher/PlayfairCipher layout handling: strip, then insert spaces one by one"""
+    letters, space_positions = [], []
+    for c in text:
+        if c == ' ':
+            space_positions.append(len(letters))
+        elif c.isalpha():
+            letters.append(c)
+    result = letters
+    for pos in sorted(space_positions, reverse=True):
+        if pos <= len(result):
+            result.insert(pos, ' ')
+    return ''.join(result)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Layout restoration benchmark')
+    parser.add_argument('--mb', type=float, default=10, help='Corpus size in MB (default: 10)')
+    parser.add_argument('--legacy-kb', type=int, default=128,
+                        help='Prefix size for the quadratic legacy path (default: 128)')
+    args = parser.parse_args()
+
+    text = natural_text(int(args.mb * 1_000_000))
+    prefix = text[:args.legacy_kb * 1000]
+    print(f"Corpus: {len(text) / 1e6:.1f} MB, {text.count(' ')} spaces, {text.count(chr(10))} newlines")
+
+    legacy_seconds, _ = timed(legacy_restore, prefix)
+    # Each insert moves the tail of the list: cost grows with length x spaces
+    scale = (len(text) / len(prefix)) ** 2
+    print(f"\nlist.insert restore, {len(prefix) // 1000} KB prefix: {legacy_seconds:8.3f} s"
+          f"  (full corpus extrapolated: ~{legacy_seconds * scale:,.0f} s)")
+
+    parse_seconds, buffer = timed(TextBuffer.from_text, text)
+    restore_seconds, restored = timed(buffer.to_text)
+    assert restored == text
+    print(f"TextBuffer.from_text:            {parse_seconds:8.3f} s  ({len(text) / 1e6 / parse_seconds:6.1f} MB/s)")
+    print(f"TextBuffer.to_text (layout):     {restore_seconds:8.3f} s  ({len(text) / 1e6 / restore_seconds:6.1f} MB/s)")
+
+    print()
+    for name, cipher, key in (('Hill', HillCipher(), '3,3,2,5'), ('Playfair', PlayfairCipher(), 'MONARCHY')):
+        enc_seconds, ciphertext = timed(cipher.encrypt, text, key)
+        dec_seconds, _ = timed(cipher.decrypt, ciphertext, key)
+        print(f"{name:8s} encrypt {enc_seconds:7.3f} s   decrypt {dec_seconds:7.3f} s"
+              f"   ({len(text) / 1e6 / enc_seconds:6.1f} MB/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Process-pool executor: throughput vs. worker count.
+
+Encrypts a natural-text corpus with ciphers.parallel.ParallelExecutor
+for Caesar, Affine and Hill using 1..N worker processes
+(N = os.cpu_count() by default) and prints a throughput curve.
+
+Usage:
+    python benchmarks/bench_parallel.py
+    python benchmarks/bench_parallel.py --mb 1000 --max-workers 16
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_layout import natural_text
+from ciphers.parallel import CHUNK_BYTES, ParallelExecutor
+
+CIPHERS = (('caesar', '3'), ('affine', '5,8'), ('hill', '3,3,2,5'))
+
+
+def measure(executor, data, cipher, key, repeat):
+    """Best-of-N wall time for one full pass"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        executor.transform_bytes(data, cipher, key)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Process-pool executor scaling')
+    parser.add_argument('--mb', type=float, default=100, help='Corpus size in MB (default: 100)')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1,
+                        help='Largest worker count to try (default: CPU count)')
+    parser.add_argument('--chunk', type=int, default=CHUNK_BYTES,
+                        help=f'Bytes per task (default: {CHUNK_BYTES})')
+    parser.add_argument('--repeat', type=int, default=2,
+                        help='Runs per point, best is reported (default: 2)')
+    args = parser.parse_args()
+
+    data = natural_text(int(args.mb * 1_000_000)).encode('ascii')
+    print(f"{len(data) / 1e6:.0f} MB corpus, chunk = {args.chunk} bytes, {os.cpu_count()} CPUs")
+
+    for cipher, key in CIPHERS:
+        print(f"\n{cipher}")
+        print(f"{'workers':>7}  {'seconds':>8}  {'MB/s':>8}  {'speedup':>7}")
+        baseline = None
+        for workers in range(1, args.max_workers + 1):
+            with ParallelExecutor(workers, args.chunk) as executor:
+                executor.transform_bytes(data[:args.chunk * workers], cipher, key)  # Start the pool
+                seconds = measure(executor, data, cipher, key, args.repeat)
+            baseline = baseline or seconds
+            print(f"{workers:7d}  {seconds:8.3f}  {len(data) / 1e6 / seconds:8.1f}  {baseline / seconds:6.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Import-time regression check.
+
+Runs short snippets in fresh interpreters under ``python -X importtime``
+and fails (exit status 1) if one of them imports a forbidden module
+(NumPy) or its own imports take longer than the budget. Lightweight
+entry points must stay lightweight: Caesar/Affine users, short CLI
+invocations and worker processes should not pay NumPy's import time.
+
+Usage:
+    python benchmarks/check_import_time.py
+    python benchmarks/check_import_time.py --budget-ms 30 --verbose
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Snippet -> modules it must not import
+CHECKS = (
+    ("import ciphers", ('numpy',)),
+    ("from ciphers import CaesarCipher; CaesarCipher().encrypt('Hello', 3)", ('numpy',)),
+    ("from ciphers import AffineCipher; AffineCipher().encrypt('Hello', '5,8')", ('numpy',)),
+    ("from ciphers import get_cipher; get_cipher('caesar').decrypt('Khoor', 3)", ('numpy',)),
+    ("from ciphers import HillCipher", ('numpy',)),
+    ("import cracker", ('numpy',)),
+    ("import main", ('numpy',)),
+)
+
+# Modules every interpreter imports at startup, excluded from the budget
+_BASELINE = "pass"
+
+
+def import_times(snippet):
+    """
+    Run a snippet under -X importtime
+    Returns:
+        dict: Top-level module name -> cumulative import time in microseconds,
+              for modules imported by the snippet itself
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', snippet],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nested imports are indented by two spaces per level
+        name = name[1:]
+        depth = (len(name) - len(name.lstrip())) // 2
+        times[name.strip()] = int(cumulative), depth
+    return times
+
+
+def measure(snippet, startup, repeat):
+    """
+    Best-of-N import time of a snippet, startup imports excluded
+    Returns:
+        tuple: (milliseconds, {module: (cumulative us, depth)} of the best run)
+    """
+    best = None
+    for _ in range(repeat):
+        times = import_times(snippet)
+        own = {name: value for name, value in times.items() if name not in startup}
+        # Depth-0 entries are the snippet's direct imports; their cumulative times add up
+        total_ms = sum(cumulative for cumulative, depth in own.values() if depth == 0) / 1000
+        if best is None or total_ms < best[0]:
+            best = total_ms, own
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import-time regression check')
+    parser.add_argument('--budget-ms', type=float, default=25,
+                        help='Max import time per snippet, startup excluded (default: 25)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Runs per snippet, best is reported (default: 3)')
+    parser.add_argument('--verbose', action='store_true', help='List the slowest imports')
+    args = parser.parse_args()
+
+    startup = set(import_times(_BASELINE))
+    failures = 0
+    for snippet, forbidden in CHECKS:
+        total_ms, own = measure(snippet, startup, args.repeat)
+        loaded = [name for name in own if name.split('.')[0] in forbidden]
+
+        problems = []
+        if loaded:
+            problems.append(f"imports {', '.join(sorted({n.split('.')[0] for n in loaded}))}")
+        if total_ms > args.budget_ms:
+            problems.append(f"over budget ({args.budget_ms:.0f} ms)")
+        failures += bool(problems)
+        status = 'FAIL' if problems else 'ok'
+        print(f"{status:4s} {total_ms:7.1f} ms  {snippet}" + (f"  <- {'; '.join(problems)}" if problems else ''))
+
+        if args.verbose:
+            slowest = sorted(own.items(), key=lambda item: -item[1][0])[:5]
+            for name, (cumulative, depth) in slowest:
+                print(f"         {cumulative / 1000:7.1f} ms  {'  ' * depth}{name}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,7 @@
 """Cipher operations (encrypt/decrypt)."""
 
+from ciphers.cache import ResultCache
+from ciphers.text_buffer import TextBuffer
 from cipher_gui.utils.helpers import show_error
 
 
@@ -8,6 +10,43 @@ class CipherActions:
     
     def __init__(self, parent):
         self.parent = parent
+        self._last_result = None  # (text, TextBuffer) of the last result
+        self.cache = ResultCache()
+    
+    def _buffer_for(self, text):
+        """
+        Get the TextBuffer for input text.
+        
+        After encrypt -> swap, the input is the previous result, whose
+        buffer is reused instead of scanning the text again. Only results
+        with the same letter count as their input are kept (see _run).
+        """
+        if self._last_result is not None and self._last_result[0] == text:
+            return self._last_result[1]
+        return TextBuffer.from_text(text)
+    
+    def _run(self, cipher, text, key, decrypt):
+        """
+        Run cipher.encrypt/decrypt on a buffer and remember the result.
+        
+        Repeated operations on the same text and key are served from
+        the result cache.
+        """
+        def compute(text, key):
+            operation = cipher.decrypt if decrypt else cipher.encrypt
+            buffer = self._buffer_for(text)
+            result_buffer = operation(buffer, key)
+            result = result_buffer.to_text()
+            # Padding removed by decryption leaves non-letter runs placed
+            # past the last letter; a fresh scan of the result would put
+            # them elsewhere, so such a buffer must not be reused
+            if result_buffer.letter_count == buffer.letter_count:
+                self._last_result = (result, result_buffer)
+            else:
+                self._last_result = None
+            return result
+        
+        return self.cache.run(cipher, text, key, decrypt, compute)
     
     def encrypt(self, cipher, text, key):
         """
@@ -30,8 +69,7 @@ class CipherActions:
             return None
         
         try:
-            result = cipher.encrypt(text, key)
-            return result
+            return self._run(cipher, text, key, decrypt=False)
         except ValueError as e:
             show_error(self.parent, str(e), "Encryption Error")
             return None
@@ -60,8 +98,7 @@ class CipherActions:
             return None
         
         try:
-            result = cipher.decrypt(text, key)
-            return result
+            return self._run(cipher, text, key, decrypt=True)
         except ValueError as e:
             show_error(self.parent, str(e), "Decryption Error")
             return None
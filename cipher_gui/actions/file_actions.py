@@ -3,6 +3,7 @@
 import os
 from datetime import datetime
 from PyQt6.QtWidgets import QFileDialog
+from ciphers.files import encrypt_file, decrypt_file, is_compressed
 from cipher_gui.utils.helpers import show_error
 
 
@@ -68,3 +69,50 @@ class FileActions:
                 return False, None
         
         return False, None
+    
+    def transform_file(self, cipher, key_text, mode):
+        """
+        Encrypt or decrypt a file straight to another file.
+        
+        The file is memory-mapped instead of being loaded into the editor,
+        so large files don't pass through the text widgets. .gz, .bz2 and
+        .xz files are decompressed/compressed on the fly.
+        
+        Args:
+            cipher: The cipher instance to use
+            key_text: The key text
+            mode: "encrypt" or "decrypt"
+            
+        Returns:
+            tuple: (bytes written, destination filename), or (None, None)
+        """
+        file_filter = "Text Files (*.txt);;Compressed Text (*.gz *.bz2 *.xz);;All Files (*)"
+        source, _ = QFileDialog.getOpenFileName(
+            self.parent,
+            f"{mode.capitalize()} File",
+            "",
+            file_filter
+        )
+        if not source:
+            return None, None
+        
+        # Keep the compression suffix last: notes.txt.gz -> notes_encrypted.txt.gz
+        base, compression = os.path.splitext(source) if is_compressed(source) else (source, "")
+        root, ext = os.path.splitext(base)
+        destination, _ = QFileDialog.getSaveFileName(
+            self.parent,
+            "Save Result As",
+            f"{root}_{mode}ed{ext}{compression}",
+            file_filter
+        )
+        if not destination:
+            return None, None
+        
+        transform = encrypt_file if mode == "encrypt" else decrypt_file
+        try:
+            return transform(source, destination, cipher, key_text), destination
+        except ValueError as e:
+            show_error(self.parent, str(e), "Invalid Key")
+        except Exception as e:
+            show_error(self.parent, f"Failed to {mode} file: {str(e)}", "File Error")
+        return None, None
@@ -19,10 +19,7 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
 from PyQt6.QtGui import QAction, QKeySequence, QFont
 from PyQt6.QtCore import QSize
 
-from ciphers.caesar_cipher import CaesarCipher
-from ciphers.affine_cipher import AffineCipher
-from ciphers.playfair_cipher import PlayfairCipher
-from ciphers.hill_cipher import HillCipher
+from ciphers.registry import get_cipher
 
 from cipher_gui.models.history import HistoryManager
 from cipher_gui.models.cipher_config import CipherConfig
@@ -62,12 +59,7 @@ class CipherGUI(QMainWindow):
         self.crack_mode = crack_mode
         
         # Initialize cipher instances
-        self.cipher_map = {
-            "Caesar": CaesarCipher(),
-            "Affine": AffineCipher(),
-            "Playfair": PlayfairCipher(),
-            "Hill (2×2)": HillCipher()
-        }
+        self.cipher_map = {name: get_cipher(name) for name in CipherConfig.get_all_cipher_names()}
         
         # Initialize managers
         self.history_manager = HistoryManager()
@@ -201,6 +193,11 @@ class CipherGUI(QMainWindow):
         export_action.triggered.connect(self.export_result)
         file_menu.addAction(export_action)
         
+        file_action = QAction("🗂️ Encrypt/Decrypt File...", self)
+        file_action.setShortcut(QKeySequence("Ctrl+Shift+O"))
+        file_action.triggered.connect(self.transform_file)
+        file_menu.addAction(file_action)
+        
         file_menu.addSeparator()
         
         exit_action = QAction("🚪 Exit", self)
@@ -363,8 +360,10 @@ class CipherGUI(QMainWindow):
         
         if result:
             self.left_panel.output_section.set_text(result)
+            stats = self.cipher_actions.cache.stats()
             self.statusBar().showMessage(
-                f"✓ {mode.capitalize()}ed successfully! ({len(result)} characters)", 
+                f"✓ {mode.capitalize()}ed successfully! ({len(result)} characters) "
+                f"· cache {stats.hit_rate:.0%} hits, {stats.bytes / 1024:.0f} KB",
                 3000
             )
             
@@ -436,6 +435,19 @@ class CipherGUI(QMainWindow):
                 3000
             )
     
+    def transform_file(self):
+        """Encrypt or decrypt a file directly to another file."""
+        mode = self.left_panel.get_mode()
+        cipher, _ = self.get_current_cipher()
+        key_text = self.left_panel.key_section.get_key()
+        
+        written, filename = self.file_actions.transform_file(cipher, key_text, mode)
+        if filename:
+            self.statusBar().showMessage(
+                f"✓ {mode.capitalize()}ed file to {os.path.basename(filename)} ({written} bytes)",
+                3000
+            )
+    
     def show_history(self):
         """Show history dialog."""
         dialog = HistoryDialog(self.history_manager, self)
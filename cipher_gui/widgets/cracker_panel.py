@@ -9,7 +9,7 @@ from PyQt6.QtGui import QFont
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-from cracker import HillCipherCracker
+from ciphers.crack import HillCipherCracker
 
 
 class CrackerPanel(QFrame):
@@ -412,16 +412,12 @@ class CrackerPanel(QFrame):
 <span style="color: #8b949e;">Matrix Pairs:</span><br>
 '''
         
-        from itertools import combinations
         invertible_count = 0
         
         if n < 2:
             result_html += '<span style="color: #f0883e;">Need at least 4 characters (2 digraphs)</span>'
         else:
-            for i, j in combinations(range(n), 2):
-                p1, p2 = digraphs[i]
-                p3, p4 = digraphs[j]
-                det = self.cracker._det_2x2(p1, p3, p2, p4)
+            for i, j, det in zip(*self.cracker._pair_determinants(digraphs)):
                 invertible = det in self.cracker.VALID_DETS
                 if invertible:
                     invertible_count += 1
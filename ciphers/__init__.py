@@ -1,6 +1,53 @@
-from .caesar_cipher import CaesarCipher
-from .affine_cipher import AffineCipher
-from .playfair_cipher import PlayfairCipher
-from .hill_cipher import HillCipher
+"""
+Classical ciphers and the engines that run them.
 
-__all__ = ['CaesarCipher', 'AffineCipher', 'PlayfairCipher', 'HillCipher']
+Attributes are loaded on first access (PEP 562), so ``import ciphers``
+or ``from ciphers import CaesarCipher`` does not import NumPy or the
+modules of the other ciphers.
+"""
+
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'CaesarCipher': '.caesar_cipher',
+    'AffineCipher': '.affine_cipher',
+    'PlayfairCipher': '.playfair_cipher',
+    'HillCipher': '.hill_cipher',
+    'TextBuffer': '.text_buffer',
+    'Cipher': '.protocol',
+    'CipherStream': '.stream',
+    'get_cipher': '.registry',
+    'register_cipher': '.registry',
+    'cipher_names': '.registry',
+    'encrypt_file': '.files',
+    'decrypt_file': '.files',
+    'ParallelExecutor': '.parallel',
+    'Cascade': '.cascade',
+    'ResultCache': '.cache',
+    'fold_accents': '.normalize',
+    'decrypt_range': '.letter_index',
+    'write_container': '.container',
+    'read_container': '.container',
+    'ContainerReader': '.container',
+    'LogEncryptor': '.append_log',
+    'encrypt_many': '.batch',
+    'decrypt_many': '.batch',
+    'AdaptiveScheduler': '.scheduler',
+    'HillCipherCracker': '.crack',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,6 +1,14 @@
+from .protocol import TableKey
+
+
 class AffineCipher:
     """Affine Cipher implementation using formula: E(x) = (ax + b) mod 26"""
     
+    name = 'affine'
+    block_size = 1
+    stateless = True
+    supports_streaming = True
+    
     def __init__(self):
         self.alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
         self.m = 26
@@ -24,60 +32,73 @@ class AffineCipher:
             raise ValueError(f"Key 'a' ({a}) must be coprime with 26. Valid values: 1,3,5,7,9,11,15,17,19,21,23,25")
         return True
     
-    def encrypt(self, plaintext, key):
+    def compile_key(self, key):
         """
-        Encrypt plaintext using Affine cipher
+        Parse and validate (a, b) once into letter index tables
         Args:
-            plaintext (str): Text to encrypt
-            key (tuple): (a, b) where a is multiplicative key and b is additive key
+            key: "a,b" string, (a, b) tuple, or an already compiled key
         Returns:
-            str: Encrypted ciphertext
+            TableKey: Encryption and decryption tables
         """
+        if isinstance(key, TableKey):
+            return key
         if isinstance(key, str):
             key = tuple(map(int, key.split(',')))
         
         a, b = int(key[0]), int(key[1])
         self._validate_key(a)
         
-        ciphertext = ''
-        for char in plaintext:
-            if char.upper() in self.alphabet:
-                x = self.alphabet.index(char.upper())
-                encrypted_value = (a * x + b) % self.m
-                new_char = self.alphabet[encrypted_value]
-                ciphertext += new_char if char.isupper() else new_char.lower()
-            else:
-                ciphertext += char
+        a_inv = self._mod_inverse(a % self.m, self.m)
+        if a_inv is None:
+            raise ValueError(f"No modular inverse exists for a={a}")
+        return TableKey(bytes((a * x + b) % self.m for x in range(self.m)),
+                        bytes((a_inv * (y - b)) % self.m for y in range(self.m)))
+    
+    def encrypt_array(self, letters, key, final=True):
+        """Encrypt a uint8 letter-index array (length is preserved)"""
+        import numpy as np
+        return np.frombuffer(self.compile_key(key).encrypt, dtype=np.uint8)[letters]
+    
+    def decrypt_array(self, letters, key, final=True):
+        """Decrypt a uint8 letter-index array (length is preserved)"""
+        import numpy as np
+        return np.frombuffer(self.compile_key(key).decrypt, dtype=np.uint8)[letters]
+    
+    def _apply(self, text, table):
+        """
+        Substitute every letter through an index table
+        Args:
+            text: str, or TextBuffer (transformed without re-scanning)
+            table (bytes): 26-entry letter index table
+        Returns:
+            Same type as text
+        """
+        if not isinstance(text, str):
+            return text.map_letters(table)
         
-        return ciphertext
+        mapped = ''.join(self.alphabet[i] for i in table)
+        translation = str.maketrans(self.alphabet + self.alphabet.lower(),
+                                    mapped + mapped.lower())
+        return text.translate(translation)
+    
+    def encrypt(self, plaintext, key):
+        """
+        Encrypt plaintext using Affine cipher
+        Args:
+            plaintext (str or TextBuffer): Text to encrypt
+            key (tuple): (a, b) where a is multiplicative key and b is additive key
+        Returns:
+            str (or TextBuffer): Encrypted ciphertext
+        """
+        return self._apply(plaintext, self.compile_key(key).encrypt)
     
     def decrypt(self, ciphertext, key):
         """
         Decrypt ciphertext using Affine cipher
         Args:
-            ciphertext (str): Text to decrypt
+            ciphertext (str or TextBuffer): Text to decrypt
             key (tuple): (a, b) where a is multiplicative key and b is additive key
         Returns:
-            str: Decrypted plaintext
+            str (or TextBuffer): Decrypted plaintext
         """
-        if isinstance(key, str):
-            key = tuple(map(int, key.split(',')))
-        
-        a, b = int(key[0]), int(key[1])
-        self._validate_key(a)
-        
-        a_inv = self._mod_inverse(a, self.m)
-        if a_inv is None:
-            raise ValueError(f"No modular inverse exists for a={a}")
-        
-        plaintext = ''
-        for char in ciphertext:
-            if char.upper() in self.alphabet:
-                y = self.alphabet.index(char.upper())
-                decrypted_value = (a_inv * (y - b)) % self.m
-                new_char = self.alphabet[decrypted_value]
-                plaintext += new_char if char.isupper() else new_char.lower()
-            else:
-                plaintext += char
-        
-        return plaintext
+        return self._apply(ciphertext, self.compile_key(key).decrypt)
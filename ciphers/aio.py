@@ -0,0 +1,233 @@
+"""
+asyncio front end for encryption, decryption and cracking.
+
+CPU-bound work runs on an executor (the loop's default thread pool, or
+any ThreadPoolExecutor/ProcessPoolExecutor passed to configure()), with
+a semaphore bounding how many jobs are in flight at once, so large texts
+never block the event loop and a burst of requests cannot queue
+unbounded work. Texts shorter than INLINE_CHARS are transformed inline,
+where a hop to the executor would cost more than the work.
+
+With a ciphers.scheduler.AdaptiveScheduler configured instead, each job
+is routed inline, to threads or to processes by its predicted cost.
+
+Streams are transformed chunk by chunk from an asyncio.StreamReader into
+an asyncio.StreamWriter with back-pressure (writer.drain()).
+
+Usage:
+    from ciphers import aio
+    ciphertext = await aio.encrypt("Attack at dawn", 'hill', '3,3,2,5')
+    key = await aio.crack("HELP", "HIAT")
+    await aio.encrypt_stream(reader, writer, 'caesar', 3)
+
+    aio.configure(executor=ProcessPoolExecutor(4), max_concurrency=4)
+"""
+
+import asyncio
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+from .registry import get_cipher
+from .tuning import tuned
+
+# Jobs running on the executor at once
+DEFAULT_CONCURRENCY = 4
+
+# Shorter texts are transformed without leaving the event loop
+INLINE_CHARS = tuned('inline_chars', 4096)
+
+# Bytes read from a StreamReader per chunk
+STREAM_CHUNK = 1 << 20
+
+
+def _transform(cipher, text, key, decrypt):
+    """Executor job: one encrypt/decrypt call (picklable for process pools)"""
+    if isinstance(cipher, str):
+        cipher = get_cipher(cipher)
+    return (cipher.decrypt if decrypt else cipher.encrypt)(text, key)
+
+
+def _crack(plaintext, ciphertext):
+    """Executor job: known-plaintext attack on a 2x2 Hill key"""
+    from .crack import HillCipherCracker
+    return HillCipherCracker().crack_key(plaintext, ciphertext)
+
+
+class AsyncCipherRunner:
+    """Coroutine API over an executor with bounded concurrency"""
+
+    def __init__(self, executor=None, max_concurrency=DEFAULT_CONCURRENCY, scheduler=None):
+        """
+        Args:
+            executor: concurrent.futures executor (None: the loop's default thread pool)
+            max_concurrency (int): Jobs allowed on the executor at once
+            scheduler (AdaptiveScheduler): Routes encrypt/decrypt/crack jobs instead
+                of the fixed INLINE_CHARS rule and executor
+        """
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+        self.scheduler = scheduler
+        self._semaphores = weakref.WeakKeyDictionary()  # Event loop -> semaphore
+
+    @property
+    def _semaphore(self):
+        """
+        Concurrency limit of the running event loop
+
+        A semaphore binds to the loop it is first contended on, so each loop
+        gets its own; the runner can then serve several asyncio.run() calls.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    async def run(self, func, *args):
+        """Run func(*args) on the executor once a concurrency slot is free"""
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+
+    async def _schedule(self, future_factory, *args):
+        """Await a job submitted to the scheduler, within the concurrency limit"""
+        async with self._semaphore:
+            return await asyncio.wrap_future(future_factory(*args))
+
+    async def _run_cipher(self, text, cipher, key, decrypt):
+        if self.scheduler is not None:
+            return await self._schedule(self.scheduler.transform, text, cipher, key, decrypt)
+        if len(text) < INLINE_CHARS:
+            return _transform(cipher, text, key, decrypt)
+        return await self.run(_transform, cipher, text, key, decrypt)
+
+    async def encrypt(self, plaintext, cipher, key):
+        """
+        Encrypt without blocking the event loop
+        Args:
+            plaintext (str): Text to encrypt
+            cipher: Cipher instance or registry name
+            key: Key (raw or compiled)
+        Returns:
+            str: Encrypted ciphertext
+        """
+        return await self._run_cipher(plaintext, cipher, key, decrypt=False)
+
+    async def decrypt(self, ciphertext, cipher, key):
+        """
+        Decrypt without blocking the event loop
+        Args:
+            ciphertext (str): Text to decrypt
+            cipher: Cipher instance or registry name
+            key: Key (raw or compiled)
+        Returns:
+            str: Decrypted plaintext
+        """
+        return await self._run_cipher(ciphertext, cipher, key, decrypt=True)
+
+    async def crack(self, plaintext, ciphertext):
+        """
+        Recover a 2x2 Hill key from a known plaintext-ciphertext pair
+        Returns:
+            np.ndarray: 2x2 key matrix, or None if not found
+        """
+        if self.scheduler is not None:
+            return await self._schedule(self.scheduler.crack, plaintext, ciphertext)
+        return await self.run(_crack, plaintext, ciphertext)
+
+    async def transform_stream(self, reader, writer, cipher, key, decrypt=False,
+                               chunk_size=STREAM_CHUNK):
+        """
+        Transform a byte stream chunk by chunk
+        Args:
+            reader (asyncio.StreamReader): UTF-8/ASCII text source
+            writer (asyncio.StreamWriter): Destination (drained, not closed)
+            cipher: Cipher instance or registry name
+            key: Key (raw or compiled)
+            decrypt (bool): Direction
+            chunk_size (int): Bytes per read
+        Returns:
+            int: Bytes written
+        """
+        from .byte_text import ByteStream
+
+        if isinstance(cipher, str):
+            cipher = get_cipher(cipher)
+        key = cipher.compile_key(key)
+
+        if not cipher.stateless:
+            # Playfair's X insertion needs the whole text
+            data = await reader.read()
+            output = (await self._run_cipher(data.decode('utf-8'), cipher, key, decrypt)).encode('utf-8')
+            writer.write(output)
+            await writer.drain()
+            return len(output)
+
+        # The stream keeps state between chunks, so it stays in this
+        # process: chunk work goes to a thread even if a process pool is set
+        executor = None if isinstance(self.executor, ProcessPoolExecutor) else self.executor
+        loop = asyncio.get_running_loop()
+        stream = ByteStream(cipher, key, decrypt)
+        written = 0
+        while True:
+            chunk = await reader.read(chunk_size)
+            job = (stream.feed, chunk) if chunk else (stream.finish,)
+            async with self._semaphore:
+                output = await loop.run_in_executor(executor, *job)
+            if output:
+                writer.write(output)
+                await writer.drain()
+                written += len(output)
+            if not chunk:
+                return written
+
+    async def encrypt_stream(self, reader, writer, cipher, key, chunk_size=STREAM_CHUNK):
+        """Encrypt from a StreamReader into a StreamWriter; returns bytes written"""
+        return await self.transform_stream(reader, writer, cipher, key, False, chunk_size)
+
+    async def decrypt_stream(self, reader, writer, cipher, key, chunk_size=STREAM_CHUNK):
+        """Decrypt from a StreamReader into a StreamWriter; returns bytes written"""
+        return await self.transform_stream(reader, writer, cipher, key, True, chunk_size)
+
+
+_runner = AsyncCipherRunner()
+
+
+def configure(executor=None, max_concurrency=DEFAULT_CONCURRENCY, scheduler=None):
+    """
+    Set the executor and concurrency limit used by the module-level coroutines
+    Args:
+        executor: concurrent.futures executor (None: the loop's default thread pool)
+        max_concurrency (int): Jobs allowed on the executor at once
+        scheduler (AdaptiveScheduler): Adaptive routing of jobs instead of executor
+    Returns:
+        AsyncCipherRunner: The new default runner
+    """
+    global _runner
+    _runner = AsyncCipherRunner(executor, max_concurrency, scheduler)
+    return _runner
+
+
+async def encrypt(plaintext, cipher, key):
+    """Encrypt on the default runner (see AsyncCipherRunner.encrypt)"""
+    return await _runner.encrypt(plaintext, cipher, key)
+
+
+async def decrypt(ciphertext, cipher, key):
+    """Decrypt on the default runner (see AsyncCipherRunner.decrypt)"""
+    return await _runner.decrypt(ciphertext, cipher, key)
+
+
+async def crack(plaintext, ciphertext):
+    """Crack a Hill key on the default runner (see AsyncCipherRunner.crack)"""
+    return await _runner.crack(plaintext, ciphertext)
+
+
+async def encrypt_stream(reader, writer, cipher, key, chunk_size=STREAM_CHUNK):
+    """Encrypt a stream on the default runner (see AsyncCipherRunner.transform_stream)"""
+    return await _runner.encrypt_stream(reader, writer, cipher, key, chunk_size)
+
+
+async def decrypt_stream(reader, writer, cipher, key, chunk_size=STREAM_CHUNK):
+    """Decrypt a stream on the default runner (see AsyncCipherRunner.transform_stream)"""
+    return await _runner.decrypt_stream(reader, writer, cipher, key, chunk_size)
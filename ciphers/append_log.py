@@ -0,0 +1,238 @@
+"""
+Resumable encryption of growing (append-only) log files.
+
+LogEncryptor encrypts only the bytes appended to a file since its last
+run and appends the result to the encrypted copy. Its position is kept in
+a small JSON checkpoint next to the output ('app.log.enc' ->
+'app.log.enc.ckpt'):
+    offset       source bytes encrypted so far
+    output_size  bytes of the encrypted copy they produced
+    pending      letters of the unfinished block (Hill's or Playfair's
+                 unpaired letter), re-read from the source at offset
+A restart truncates the output to output_size (dropping anything
+written after the last checkpoint) and carries on from offset, so a
+crash never duplicates or loses output. The carried letters are read
+back from the source and must match pending; otherwise the source was
+rewritten and the restart is refused.
+
+For stateless ciphers the encrypted copy is byte for byte what
+encrypt_file() would write for the same text, minus the final padding,
+which finish() adds once the log is closed for good. Playfair pairs the
+letters across runs the same way too (doubled letters included), but its
+inserted X letters shift the layout within each run only.
+
+Usage:
+    log = LogEncryptor('app.log', 'app.log.enc', 'hill', '3,3,2,5')
+    log.sync()      # Encrypt what was appended since the last sync/run
+    log.finish()    # Log rotated: pad and flush the last block
+"""
+
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from .byte_text import letter_indices, letter_positions, write_letters
+from .container import key_fingerprint
+from .registry import get_cipher
+from .text_buffer import TextBuffer
+
+# Checkpoint file suffix
+CHECKPOINT_SUFFIX = '.ckpt'
+
+# Source bytes read per step
+READ_CHUNK = 1 << 22
+
+
+def _utf8_boundary(data):
+    """Length of the longest prefix of data not ending inside a UTF-8 character"""
+    for back in range(1, min(4, len(data)) + 1):
+        byte = data[-back]
+        if byte < 0x80:
+            return len(data)
+        if byte >= 0xC0:
+            # Lead byte: 110xxxxx, 1110xxxx or 11110xxx start 2, 3 or 4 byte sequences
+            needed = 2 if byte < 0xE0 else 3 if byte < 0xF0 else 4
+            return len(data) if back >= needed else len(data) - back
+    return len(data)
+
+
+class LogEncryptor:
+    """Appends the encryption of newly written source bytes to an output file"""
+
+    def __init__(self, src, dst, cipher, key, checkpoint=None):
+        """
+        Args:
+            src: Growing plaintext file
+            dst: Encrypted copy (created on the first sync)
+            cipher: Cipher instance or registry name
+            key: Key (raw or compiled)
+            checkpoint: Checkpoint path (default: dst + '.ckpt')
+        Raises:
+            ValueError: If the checkpoint was written for another cipher or key
+        """
+        self.src = src
+        self.dst = dst
+        self.cipher = get_cipher(cipher) if isinstance(cipher, str) else cipher
+        self.key = self.cipher.compile_key(key)
+        self.checkpoint = checkpoint or os.fspath(dst) + CHECKPOINT_SUFFIX
+        self.state = {'cipher': self.cipher.name,
+                      'key_fingerprint': key_fingerprint(self.cipher, self.key),
+                      'offset': 0, 'output_size': 0, 'pending': '', 'finished': False}
+        if os.path.exists(self.checkpoint):
+            with open(self.checkpoint, encoding='utf-8') as f:
+                saved = json.load(f)
+            if (saved.get('cipher'), saved.get('key_fingerprint')) != \
+                    (self.state['cipher'], self.state['key_fingerprint']):
+                raise ValueError("Checkpoint was written with another cipher or key")
+            self.state.update(saved)
+
+    def _save(self):
+        """Write the checkpoint atomically, through a temp file of its own"""
+        directory = os.path.dirname(os.path.abspath(self.checkpoint))
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory,
+                                         prefix='.ckpt-', suffix='.tmp',
+                                         delete=False) as f:
+            temp = f.name
+            try:
+                json.dump(self.state, f)
+                f.flush()
+                os.fsync(f.fileno())
+            except BaseException:
+                f.close()
+                os.unlink(temp)
+                raise
+        try:
+            os.replace(temp, self.checkpoint)
+        except OSError:
+            os.unlink(temp)
+            raise
+
+    def _encrypt_stateless(self, data):
+        """Encrypt the whole blocks at the start of data; returns (output, bytes consumed)"""
+        codes = np.frombuffer(data, dtype=np.uint8)
+        positions = letter_positions(codes, 0, len(codes))
+        ready = len(positions) - len(positions) % self.cipher.block_size
+        split = int(positions[ready]) if ready < len(positions) else len(codes)
+        out = codes[:split].copy()
+        if ready:
+            letters = self.cipher.encrypt_array(letter_indices(codes, positions[:ready]),
+                                                self.key, final=False)
+            write_letters(out, codes, positions[:ready], letters)
+        return out.tobytes(), split
+
+    def _encrypt_pairs(self, data):
+        """Playfair: encrypt up to the last unpaired letter; returns (output, bytes consumed)"""
+        codes = np.frombuffer(data, dtype=np.uint8)
+        positions = letter_positions(codes, 0, len(codes))
+        letters = letter_indices(codes, positions)
+        letters[letters == 9] = 8  # J is I
+        # Pairs restart after every doubled letter; an odd run leaves its last letter unpaired
+        doubles = np.flatnonzero(letters[:-1] == letters[1:])
+        run_start = int(doubles[-1]) + 1 if len(doubles) else 0
+        if (len(letters) - run_start) % 2:
+            split = int(positions[-1])
+        else:
+            split = _utf8_boundary(data)
+        text = data[:split].decode('utf-8')
+        output = self.cipher.encrypt(TextBuffer.from_text(text), self.key).to_text()
+        return output.encode('utf-8'), split
+
+    def _pending(self, data):
+        """Letters of data (the carried unfinished block), for the checkpoint"""
+        codes = np.frombuffer(data, dtype=np.uint8)
+        return codes[letter_positions(codes, 0, len(codes))].tobytes().decode('ascii')
+
+    def _check_pending(self, source):
+        """
+        Re-read the carried letters at offset and compare them to the checkpoint
+        Raises:
+            ValueError: If the source no longer holds the pending letters there
+        """
+        pending = self.state['pending']
+        if not pending:
+            return
+        source.seek(self.state['offset'])
+        data = source.read(READ_CHUNK)
+        if self._pending(data)[:len(pending)] != pending:
+            raise ValueError("Source does not match the checkpoint (was it rewritten?)")
+
+    def sync(self):
+        """
+        Encrypt everything appended to the source since the last sync
+        Returns:
+            int: Bytes appended to the output
+        Raises:
+            ValueError: If the source shrank or was rewritten (rotated), or
+                finish() was called
+        """
+        if self.state['finished']:
+            raise ValueError("Log was finished; start a new output file")
+        size = os.path.getsize(self.src)
+        if size < self.state['offset']:
+            raise ValueError("Source is shorter than the checkpoint (was it rotated?)")
+        stateless = getattr(self.cipher, 'stateless', False)
+        encrypt = self._encrypt_stateless if stateless else self._encrypt_pairs
+
+        appended = 0
+        mode = 'r+b' if os.path.exists(self.dst) else 'w+b'
+        with open(self.src, 'rb') as source, open(self.dst, mode) as target:
+            self._check_pending(source)
+            target.truncate(self.state['output_size'])
+            target.seek(self.state['output_size'])
+            read_size = READ_CHUNK
+            while self.state['offset'] < size:
+                source.seek(self.state['offset'])
+                data = source.read(min(read_size, size - self.state['offset']))
+                output, consumed = encrypt(data)
+                if not consumed:
+                    if self.state['offset'] + len(data) >= size:
+                        break  # Only the unfinished block so far
+                    read_size *= 2  # A long run without a second letter
+                    continue
+                target.write(output)
+                target.flush()
+                os.fsync(target.fileno())
+                appended += len(output)
+                self.state['offset'] += consumed
+                self.state['output_size'] += len(output)
+                self.state['pending'] = self._pending(data[consumed:])
+                self._save()
+                read_size = READ_CHUNK
+        return appended
+
+    def finish(self):
+        """
+        Sync, then encrypt the unfinished block with the end-of-message rule (padding)
+        Returns:
+            int: Bytes appended to the output
+        """
+        appended = self.sync()
+        with open(self.src, 'rb') as source, open(self.dst, 'r+b') as target:
+            source.seek(self.state['offset'])
+            text = source.read().decode('utf-8')
+            target.truncate(self.state['output_size'])
+            target.seek(self.state['output_size'])
+            output = self.cipher.encrypt(text, self.key).encode('utf-8') if text else b''
+            target.write(output)
+            target.flush()
+            os.fsync(target.fileno())
+        self.state['offset'] += len(text.encode('utf-8'))
+        self.state['output_size'] += len(output)
+        self.state['pending'] = ''
+        self.state['finished'] = True
+        self._save()
+        return appended + len(output)
+
+    def follow(self, interval=1.0, stop=None):
+        """
+        Keep syncing as the source grows
+        Args:
+            interval (float): Seconds between syncs
+            stop: Optional callable; following ends once it returns True
+        """
+        while stop is None or not stop():
+            self.sync()
+            time.sleep(interval)
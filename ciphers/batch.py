@@ -0,0 +1,198 @@
+"""
+Batch API for many short messages.
+
+encrypt_many()/decrypt_many() pay the per-call overhead (key parsing,
+text scanning, NumPy dispatch) once per batch instead of once per
+message:
+    - all messages are packed into one contiguous byte buffer with an
+      offsets array, and scanned for letters in one pass
+    - keys are compiled once per distinct key, and the messages are
+      grouped by compiled key
+    - every group's letters (whole blocks only) go through one
+      encrypt_array/decrypt_array call
+    - each message's last letters get the end-of-message rule (padding);
+      their results are computed once per distinct tail and key, not
+      once per message
+and the results are sliced back out into one string per message,
+identical to calling cipher.encrypt()/decrypt() on each one.
+
+Ciphers that are not stateless (Playfair) still get their keys compiled
+once per group but run message by message.
+
+Usage:
+    ciphertexts = encrypt_many(messages, 'hill', '3,3,2,5')
+    ciphertexts = encrypt_many(messages, 'caesar', keys=[3, 7, 3, ...])
+"""
+
+import numpy as np
+
+from .byte_text import letter_indices, letter_positions, write_letters
+from .registry import get_cipher
+
+
+def _compile_keys(cipher, key, keys, count):
+    """
+    Compile the batch's keys once per distinct key
+    Returns:
+        tuple: (list of compiled keys, group number of every message)
+    """
+    if (key is None) == (keys is None):
+        raise ValueError("Pass either one shared key or keys (one per message)")
+    if keys is None:
+        return [cipher.compile_key(key)], np.zeros(count, dtype=np.intp)
+    if len(keys) != count:
+        raise ValueError(f"Got {len(keys)} keys for {count} messages")
+
+    compiled, groups = [], np.empty(count, dtype=np.intp)
+    by_raw, by_compiled = {}, {}
+    for i, raw in enumerate(keys):
+        try:
+            hash(raw)
+            lookup = raw
+        except TypeError:  # Unhashable raw key (e.g. a nested list)
+            lookup = repr(raw)
+        group = by_raw.get(lookup)
+        if group is None:
+            compiled_key = cipher.compile_key(raw)
+            group = by_compiled.setdefault(compiled_key, len(compiled))
+            if group == len(compiled):
+                compiled.append(compiled_key)
+            by_raw[lookup] = group
+        groups[i] = group
+    return compiled, groups
+
+
+def _run_stateful(texts, cipher, compiled, groups, decrypt):
+    """Message-by-message fallback (keys already compiled)"""
+    transform = cipher.decrypt if decrypt else cipher.encrypt
+    return [transform(text, compiled[group]) for text, group in zip(texts, groups)]
+
+
+def _transform_tails(tails, tail_groups, cipher, compiled, decrypt):
+    """
+    End-of-message rule for every message's tail letters
+    Args:
+        tails: (messages, r) uint8 tail letters, all with the same length r
+        tail_groups: Key group of each row
+    Returns:
+        tuple: (output letters of each distinct (group, tail), distinct index of each row)
+    """
+    transform = cipher.decrypt_array if decrypt else cipher.encrypt_array
+    # One call per distinct (key group, tail); tails are at most a block long
+    codes = tail_groups.astype(np.int64)
+    for column in tails.T:
+        codes = codes * 26 + column
+    unique, first, inverse = np.unique(codes, return_index=True, return_inverse=True)
+    results = [transform(tails[row], compiled[tail_groups[row]], final=True) for row in first]
+    return results, inverse
+
+
+def _run_stateless(texts, cipher, compiled, groups, decrypt):
+    """Packed, grouped transform of a batch for a stateless cipher"""
+    encoded = [text.encode('utf-8') for text in texts]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    starts = np.cumsum(lengths) - lengths
+    codes = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    block = cipher.block_size
+
+    positions = letter_positions(codes, 0, len(codes))
+    message = np.searchsorted(starts, positions, side='right') - 1
+    counts = np.bincount(message, minlength=len(texts))
+    first_letter = np.cumsum(counts) - counts
+    rank = np.arange(len(positions)) - first_letter[message]
+
+    # Tail: the unfinished block, plus the last whole block when decrypting
+    tail_counts = counts % block
+    if decrypt:
+        tail_counts[(tail_counts == 0) & (counts > 0)] = block
+    in_tail = rank >= (counts - tail_counts)[message]
+
+    out = codes.copy()
+    letters = letter_indices(codes, positions)
+    transform = cipher.decrypt_array if decrypt else cipher.encrypt_array
+
+    # Body: whole blocks, one call per key group
+    body = np.flatnonzero(~in_tail)
+    if len(compiled) > 1:
+        order = np.argsort(groups[message[body]], kind='stable')
+        body = body[order]
+        bounds = np.searchsorted(groups[message[body]], np.arange(len(compiled) + 1))
+    else:
+        bounds = [0, len(body)]
+    for group, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:])):
+        if hi > lo:
+            chosen = body[lo:hi]
+            write_letters(out, codes, positions[chosen],
+                          transform(letters[chosen], compiled[group], final=False))
+
+    # Tails: letters kept in place, letters removed, and padding appended
+    removed = np.zeros(len(codes), dtype=bool)
+    added_owners, added = [], []
+    tail_letters = np.flatnonzero(in_tail)
+    for size in np.unique(tail_counts[tail_counts > 0]).tolist():
+        owners = np.flatnonzero(tail_counts == size)
+        rows = tail_letters[np.isin(message[tail_letters], owners)].reshape(-1, size)
+        results, inverse = _transform_tails(letters[rows], groups[owners], cipher, compiled, decrypt)
+        for distinct, result in enumerate(results):
+            same = inverse == distinct
+            kept = min(len(result), size)
+            write_letters(out, codes, positions[rows[same, :kept]].ravel(),
+                          np.tile(result[:kept], int(np.count_nonzero(same))))
+            removed[positions[rows[same, kept:]].ravel()] = True
+            if len(result) > size:
+                added_owners.append(np.repeat(owners[same], len(result) - size))
+                added.append(np.tile(result[size:] + 97, int(np.count_nonzero(same))))
+
+    # Reassemble: drop removed letters, append padding at message ends
+    removed_before = np.concatenate(([0], np.cumsum(removed)))
+    new_starts = starts - removed_before[starts]
+    out = out[~removed]
+    if added:
+        owners = np.concatenate(added_owners)
+        ends = starts[owners] + lengths[owners]
+        out = np.insert(out, ends - removed_before[ends], np.concatenate(added).astype(np.uint8))
+        extra = np.bincount(owners, minlength=len(texts))
+        new_starts = new_starts + np.cumsum(extra) - extra
+    new_ends = np.append(new_starts[1:], len(out))
+    data = out.tobytes()
+    return [data[lo:hi].decode('utf-8') for lo, hi in zip(new_starts.tolist(), new_ends.tolist())]
+
+
+def _run_many(texts, cipher, key, keys, decrypt):
+    if isinstance(cipher, str):
+        cipher = get_cipher(cipher)
+    texts = list(texts)
+    compiled, groups = _compile_keys(cipher, key, keys, len(texts))
+    if not texts:
+        return []
+    if getattr(cipher, 'stateless', False):
+        return _run_stateless(texts, cipher, compiled, groups, decrypt)
+    return _run_stateful(texts, cipher, compiled, groups, decrypt)
+
+
+def encrypt_many(texts, cipher, key=None, keys=None):
+    """
+    Encrypt a batch of messages
+    Args:
+        texts: Iterable of str
+        cipher: Cipher instance or registry name
+        key: One key (raw or compiled) shared by all messages
+        keys: Alternatively, one key per message
+    Returns:
+        list: Ciphertexts, same as [cipher.encrypt(text, key) for each message]
+    """
+    return _run_many(texts, cipher, key, keys, decrypt=False)
+
+
+def decrypt_many(texts, cipher, key=None, keys=None):
+    """
+    Decrypt a batch of messages
+    Args:
+        texts: Iterable of str
+        cipher: Cipher instance or registry name
+        key: One key (raw or compiled) shared by all messages
+        keys: Alternatively, one key per message
+    Returns:
+        list: Plaintexts, same as [cipher.decrypt(text, key) for each message]
+    """
+    return _run_many(texts, cipher, key, keys, decrypt=True)
@@ -0,0 +1,231 @@
+"""
+Letter transforms over raw ASCII/UTF-8 bytes.
+
+The same layout rule as TextBuffer, applied in place to byte arrays:
+ASCII A-Z/a-z bytes are letters, everything else (punctuation, newlines,
+the bytes of multi-byte UTF-8 characters) stays where it is. Letter bytes
+keep their case bit (0x20).
+
+A transform splits into a body and a tail:
+    - the body holds whole blocks of letters and transforms in place,
+      slab by slab or range by range (mmap'd files, shared memory workers)
+    - the tail is the last few letters that get the cipher's
+      end-of-message rule (padding appended or stripped), which may
+      change the output length
+"""
+
+import numpy as np
+
+from .tuning import tuned
+
+# Bytes per slab when scanning or transforming large arrays
+SLAB_BYTES = tuned('slab_bytes', 1 << 24)
+
+
+def letter_mask(codes):
+    """True for ASCII letter bytes"""
+    folded = codes | 0x20
+    return (folded >= 97) & (folded <= 122)
+
+
+def letter_positions(codes, lo, hi):
+    """Absolute positions of the letter bytes in codes[lo:hi]"""
+    return np.flatnonzero(letter_mask(codes[lo:hi])) + lo
+
+
+def count_letters(codes, lo=0, hi=None):
+    """Number of letter bytes in codes[lo:hi], counted slab by slab"""
+    hi = len(codes) if hi is None else hi
+    return sum(int(np.count_nonzero(letter_mask(codes[start:min(start + SLAB_BYTES, hi)])))
+               for start in range(lo, hi, SLAB_BYTES))
+
+
+def letter_indices(codes, positions):
+    """Letter indices (0-25) of the letter bytes at positions"""
+    return ((codes[positions] | 0x20) - 97).astype(np.uint8)
+
+
+def write_letters(out, codes, positions, letters):
+    """Store letter indices at positions, keeping each input byte's case bit"""
+    out[positions] = (letters + 65).astype(np.uint8) | (codes[positions] & 0x20)
+
+
+def last_letters(codes, count, slab=SLAB_BYTES):
+    """Positions of the last count letters, found by scanning slabs backwards"""
+    found = []
+    needed = count
+    hi = len(codes)
+    while needed and hi:
+        lo = max(0, hi - slab)
+        positions = letter_positions(codes, lo, hi)
+        found.insert(0, positions[max(0, len(positions) - needed):])
+        needed -= len(found[0])
+        hi = lo
+    return np.concatenate(found) if found else np.zeros(0, dtype=np.intp)
+
+
+def plan_tail(codes, cipher, key, decrypt, count=None):
+    """
+    Apply the end-of-message rule to the last letters
+    Args:
+        codes: uint8 input bytes
+        cipher: Stateless cipher
+        key: Compiled key
+        decrypt (bool): Direction
+        count (int): Letters in codes, if already known
+    Returns:
+        tuple: (tail positions, transformed tail letters, output size).
+            Everything before tail[0] is body (whole blocks).
+    """
+    if count is None:
+        count = count_letters(codes)
+    block = cipher.block_size
+    transform = cipher.decrypt_array if decrypt else cipher.encrypt_array
+
+    # The unfinished block, plus the last whole block when decrypting
+    # (padding may be stripped from it)
+    tail_count = count % block
+    if decrypt and not tail_count and count:
+        tail_count = block
+    tail = last_letters(codes, tail_count)
+    tail_letters = transform(letter_indices(codes, tail), key, final=True)
+    return tail, tail_letters, len(codes) + len(tail_letters) - len(tail)
+
+
+def body_end(codes, tail):
+    """Byte offset where the tail starts"""
+    return int(tail[0]) if len(tail) else len(codes)
+
+
+def transform_body(codes, out, lo, hi, cipher, key, decrypt):
+    """
+    Transform codes[lo:hi] into out[lo:hi]
+
+    codes[:lo] must hold a whole number of blocks; a slab's unfinished
+    block waits for the next slab, and codes[lo:hi] as a whole must hold
+    whole blocks too.
+    """
+    block = cipher.block_size
+    transform = cipher.decrypt_array if decrypt else cipher.encrypt_array
+    carry = np.zeros(0, dtype=np.intp)
+    for start in range(lo, hi, SLAB_BYTES):
+        stop = min(start + SLAB_BYTES, hi)
+        out[start:stop] = codes[start:stop]
+        positions = np.concatenate((carry, letter_positions(codes, start, stop)))
+        ready = len(positions) - len(positions) % block
+        carry = positions[ready:]
+        if ready:
+            letters = letter_indices(codes, positions[:ready])
+            write_letters(out, codes, positions[:ready], transform(letters, key, final=False))
+
+
+def write_tail(codes, out, tail, tail_letters):
+    """
+    Write the tail region: bytes after the body, with letters removed by
+    the end-of-message rule cut out and added (lowercase) letters appended
+    """
+    size = len(codes)
+    kept = min(len(tail_letters), len(tail))
+    start, removed = body_end(codes, tail), 0
+    for position in tail[kept:]:
+        out[start - removed:position - removed] = codes[start:position]
+        start, removed = int(position) + 1, removed + 1
+    out[start - removed:size - removed] = codes[start:size]
+    write_letters(out, codes, tail[:kept], tail_letters[:kept])
+    if len(tail_letters) > len(tail):
+        out[size:] = tail_letters[len(tail):] + 97
+
+
+def transform_bytes(codes, cipher, key, decrypt):
+    """
+    Whole-input transform in one process
+    Args:
+        codes: uint8 input bytes
+        cipher: Stateless cipher
+        key: Compiled key
+        decrypt (bool): Direction
+    Returns:
+        np.ndarray: uint8 output bytes
+    """
+    tail, tail_letters, out_size = plan_tail(codes, cipher, key, decrypt)
+    out = np.empty(out_size, dtype=np.uint8)
+    transform_body(codes, out, 0, body_end(codes, tail), cipher, key, decrypt)
+    write_tail(codes, out, tail, tail_letters)
+    return out
+
+
+class ByteStream:
+    """
+    Incremental byte-level transform for stateless ciphers
+
+    The bytes counterpart of ciphers.stream.CipherStream: input from the
+    first unfinished block on (and, when decrypting, the last whole block)
+    is carried to the next chunk, and finish() applies the end-of-message
+    rule. Chunks may split multi-byte UTF-8 characters anywhere.
+
+    Each chunk is scanned once: the carry is kept as a list of chunks with
+    the positions of its letters, so letterless chunks are only appended.
+    """
+
+    def __init__(self, cipher, key, decrypt=False):
+        self.cipher = cipher
+        self.key = cipher.compile_key(key)
+        self.decrypt = decrypt
+        self._carry = []        # Input chunks starting at the first held letter
+        self._carry_bytes = 0
+        self._held = np.zeros(0, dtype=np.intp)  # Positions of the held letters in the carry
+
+    def feed(self, chunk):
+        """
+        Process the next chunk of bytes
+        Returns:
+            bytes: Output that is final so far (may be empty)
+        """
+        chunk = bytes(chunk)
+        found = letter_positions(np.frombuffer(chunk, dtype=np.uint8), 0, len(chunk))
+        positions = np.concatenate((self._held, found + self._carry_bytes))
+        count = len(positions)
+        block = self.cipher.block_size
+        ready = count - count % block
+        if self.decrypt and ready == count and count:
+            ready -= block
+
+        if not ready:
+            if not count:
+                return chunk
+            if self._carry:
+                # Still waiting for the block to complete: hold without rescanning
+                self._carry.append(chunk)
+                self._carry_bytes += len(chunk)
+                self._held = positions
+                return b''
+            split = int(found[0])
+            self._carry, self._carry_bytes = [chunk[split:]], len(chunk) - split
+            self._held = found - split
+            return chunk[:split]
+
+        codes = np.frombuffer(b''.join(self._carry) + chunk, dtype=np.uint8)
+        split = int(positions[ready]) if ready < count else len(codes)
+        carry = codes[split:].tobytes()
+        self._carry, self._carry_bytes = ([carry] if carry else []), len(carry)
+        self._held = positions[ready:] - split
+        out = codes[:split].copy()
+        if ready:
+            transform = self.cipher.decrypt_array if self.decrypt else self.cipher.encrypt_array
+            letters = transform(letter_indices(codes, positions[:ready]), self.key, final=False)
+            write_letters(out, codes, positions[:ready], letters)
+        return out.tobytes()
+
+    def finish(self):
+        """
+        Flush the stream, applying the cipher's end-of-message rule
+        Returns:
+            bytes: Remaining output
+        """
+        carry = b''.join(self._carry)
+        self._carry, self._carry_bytes = [], 0
+        self._held = np.zeros(0, dtype=np.intp)
+        if not carry:
+            return b''
+        codes = np.frombuffer(carry, dtype=np.uint8)
+        return transform_bytes(codes, self.cipher, self.key, self.decrypt).tobytes()
@@ -0,0 +1,138 @@
+"""
+Byte-bounded LRU cache of encryption/decryption results.
+
+Entries are keyed by (cipher name, compiled key, mode, BLAKE2b digest of
+the input), so the same document under the same key is transformed
+once, however the key was spelled ("3,3,2,5" and [[3, 3], [2, 5]]
+compile to the same key) and without keeping the input text alive.
+The least recently used results are evicted once their total size
+exceeds max_bytes.
+
+Usage:
+    cache = ResultCache(max_bytes=64 << 20)
+    ciphertext = cache.encrypt(get_cipher('hill'), text, '3,3,2,5')
+    cache.stats()   # -> CacheStats(hits=..., misses=..., hit_rate=..., bytes=..., ...)
+"""
+
+import hashlib
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+
+DEFAULT_MAX_BYTES = 64 << 20
+
+CacheStats = namedtuple('CacheStats', ['hits', 'misses', 'hit_rate', 'entries',
+                                       'bytes', 'max_bytes', 'evictions'])
+
+
+def digest(text):
+    """BLAKE2b digest (16 bytes) of a text's UTF-8 encoding"""
+    data = text.encode('utf-8', 'surrogatepass') if isinstance(text, str) else bytes(text)
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class ResultCache:
+    """Thread-safe LRU map of operation results, bounded by their size in bytes"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            max_bytes (int): Memory budget for cached results
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # cache key -> (result, size)
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def make_key(self, cipher, key, decrypt, text):
+        """
+        Cache key of one operation
+        Args:
+            cipher: Cipher instance
+            key: Key (raw or compiled); normalized through cipher.compile_key()
+            decrypt (bool): Direction
+            text: Input text
+        Returns:
+            tuple: (cipher name, compiled key, mode, input digest)
+        """
+        mode = 'decrypt' if decrypt else 'encrypt'
+        return (cipher.name, cipher.compile_key(key), mode, digest(text))
+
+    def get(self, cache_key):
+        """Cached result for a key from make_key(), or None (counts a hit or miss)"""
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(cache_key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, cache_key, result):
+        """Store a result, evicting least recently used ones to stay within max_bytes"""
+        size = sys.getsizeof(result)
+        if size > self.max_bytes:
+            return  # Would evict everything else and still not fit
+        with self._lock:
+            old = self._entries.pop(cache_key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[cache_key] = (result, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._evictions += 1
+
+    def run(self, cipher, text, key, decrypt, compute=None):
+        """
+        Cached cipher operation
+        Args:
+            cipher: Cipher instance
+            text (str): Input text
+            key: Key (raw or compiled)
+            decrypt (bool): Direction
+            compute: Function (text, compiled key) -> result, called on a miss
+                     (default: cipher.encrypt / cipher.decrypt)
+        Returns:
+            str: Result
+        """
+        cache_key = self.make_key(cipher, key, decrypt, text)
+        result = self.get(cache_key)
+        if result is None:
+            compute = compute or (cipher.decrypt if decrypt else cipher.encrypt)
+            result = compute(text, cache_key[1])
+            self.put(cache_key, result)
+        return result
+
+    def encrypt(self, cipher, plaintext, key):
+        """Cached cipher.encrypt(plaintext, key)"""
+        return self.run(cipher, plaintext, key, decrypt=False)
+
+    def decrypt(self, cipher, ciphertext, key):
+        """Cached cipher.decrypt(ciphertext, key)"""
+        return self.run(cipher, ciphertext, key, decrypt=True)
+
+    def stats(self):
+        """
+        Current counters
+        Returns:
+            CacheStats: hits, misses, hit_rate (0-1), entries, bytes, max_bytes, evictions
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return CacheStats(self._hits, self._misses, self._hits / lookups if lookups else 0.0,
+                              len(self._entries), self._bytes, self.max_bytes, self._evictions)
+
+    def clear(self):
+        """Drop every entry (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
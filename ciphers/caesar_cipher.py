@@ -1,51 +1,75 @@
+from .protocol import TableKey, table_key
+
+
 class CaesarCipher:
     """Caesar Cipher implementation with shift-based encryption/decryption"""
     
+    name = 'caesar'
+    block_size = 1
+    stateless = True
+    supports_streaming = True
+    
     def __init__(self):
         self.alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
     
+    def compile_key(self, key):
+        """
+        Parse a shift once into letter index tables
+        Args:
+            key (int): Shift value (0-25), or an already compiled key
+        Returns:
+            TableKey: Encryption and decryption tables
+        """
+        if isinstance(key, TableKey):
+            return key
+        shift = int(key) % 26
+        return table_key((i + shift) % 26 for i in range(26))
+    
+    def encrypt_array(self, letters, key, final=True):
+        """Encrypt a uint8 letter-index array (length is preserved)"""
+        import numpy as np
+        return np.frombuffer(self.compile_key(key).encrypt, dtype=np.uint8)[letters]
+    
+    def decrypt_array(self, letters, key, final=True):
+        """Decrypt a uint8 letter-index array (length is preserved)"""
+        import numpy as np
+        return np.frombuffer(self.compile_key(key).decrypt, dtype=np.uint8)[letters]
+    
+    def _apply(self, text, table):
+        """
+        Substitute every letter through an index table
+        Args:
+            text: str, or TextBuffer (transformed without re-scanning)
+            table (bytes): 26-entry letter index table
+        Returns:
+            Same type as text
+        """
+        if not isinstance(text, str):
+            return text.map_letters(table)
+        
+        shifted = ''.join(self.alphabet[i] for i in table)
+        translation = str.maketrans(self.alphabet + self.alphabet.lower(),
+                                    shifted + shifted.lower())
+        return text.translate(translation)
+    
     def encrypt(self, plaintext, key):
         """
         Encrypt plaintext using Caesar cipher
         Args:
-            plaintext (str): Text to encrypt
+            plaintext (str or TextBuffer): Text to encrypt
             key (int): Shift value (0-25)
         Returns:
-            str: Encrypted ciphertext
+            str (or TextBuffer): Encrypted ciphertext
         """
-        key = int(key) % 26
-        ciphertext = ''
-        
-        for char in plaintext:
-            if char.upper() in self.alphabet:
-                old_index = self.alphabet.index(char.upper())
-                new_index = (old_index + key) % 26
-                new_char = self.alphabet[new_index]
-                ciphertext += new_char if char.isupper() else new_char.lower()
-            else:
-                ciphertext += char
-        
-        return ciphertext
+        return self._apply(plaintext, self.compile_key(key).encrypt)
     
     def decrypt(self, ciphertext, key):
         """
         Decrypt ciphertext using Caesar cipher
         Args:
-            ciphertext (str): Text to decrypt
+            ciphertext (str or TextBuffer): Text to decrypt
             key (int): Shift value (0-25)
         Returns:
-            str: Decrypted plaintext
+            str (or TextBuffer): Decrypted plaintext
         """
-        key = int(key) % 26
-        plaintext = ''
-        
-        for char in ciphertext:
-            if char.upper() in self.alphabet:
-                old_index = self.alphabet.index(char.upper())
-                new_index = (old_index - key) % 26
-                new_char = self.alphabet[new_index]
-                plaintext += new_char if char.isupper() else new_char.lower()
-            else:
-                plaintext += char
-        
-        return plaintext
+        return self._apply(ciphertext, self.compile_key(key).decrypt)
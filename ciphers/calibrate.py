@@ -0,0 +1,263 @@
+"""
+Engine calibration: micro-benchmarks that pick parameters for this machine.
+
+calibrate() measures, on a synthetic text sample:
+    hill_table_pairs     digraph count from which Hill's pair table beats
+                         the matmul (table build included)
+    hill_threads         threads of the Hill bulk engine
+    hill_slab_pairs      digraphs per slab of the Hill bulk engine
+    slab_bytes           bytes per slab of the byte-level kernels
+    stream_chunk         bytes per chunk when files are streamed
+    chunk_bytes          bytes per process-pool task (multi-core only)
+    thread_overhead      round trip of a thread-pool job, in seconds
+    process_overhead     round trip of a process-pool job, in seconds
+    transform_fixed      fixed cost of an encrypt() call, in seconds
+    transform_per_char   cost per character of an encrypt() call
+    inline_chars         largest text encrypted faster than an event-loop
+                         executor round trip, the inline-versus-pool
+                         threshold of ciphers.aio
+
+Each candidate is timed best-of-N. The results go to the tuning file
+(see ciphers.tuning), which the engines read when they are imported.
+
+Usage:
+    values = calibrate(report=print)
+    save_tuning(values)
+"""
+
+import asyncio
+import io
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from . import byte_text, hill_cipher
+from .byte_text import ByteStream, transform_bytes
+from .registry import get_cipher
+
+# Size of the synthetic text sample
+SAMPLE_BYTES = 1 << 25
+
+# Timed runs per candidate (the best one counts)
+REPEAT = 3
+
+# Key used for every measurement
+KEY = '3,3,2,5'
+
+SLAB_BYTES_CANDIDATES = [1 << shift for shift in range(18, 27, 2)]
+STREAM_CHUNK_CANDIDATES = [1 << shift for shift in range(18, 25, 2)]
+CHUNK_BYTES_CANDIDATES = [1 << shift for shift in range(21, 26)]
+SLAB_PAIRS_CANDIDATES = [1 << shift for shift in range(12, 19, 2)]
+TABLE_PAIRS_CANDIDATES = [1 << shift for shift in range(4, 17)]
+
+# Text sizes timed for the encrypt() cost model and the inline threshold
+COST_SIZES = [1 << shift for shift in range(6, 18)]
+
+
+def _best(function, *args, repeat=REPEAT):
+    """Fastest of repeat runs of function(*args), in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _fastest(candidates, measure, report, name):
+    """Candidate with the lowest measure(candidate); reports every timing"""
+    timings = {candidate: measure(candidate) for candidate in candidates}
+    if report:
+        report(f"  {name}: " + ", ".join(f"{candidate} {seconds * 1e3:.1f} ms"
+                                         for candidate, seconds in timings.items()))
+    return min(timings, key=timings.get)
+
+
+def sample_text(size=SAMPLE_BYTES, seed=0):
+    """
+    Synthetic English-like text: words of letters (some capitalized), spaces, punctuation
+    Returns:
+        np.ndarray: uint8 ASCII bytes
+    """
+    rng = np.random.default_rng(seed)
+    codes = rng.integers(97, 123, size, dtype=np.uint8)
+    codes[rng.random(size) < 0.18] = ord(' ')
+    codes[rng.random(size) < 0.02] = ord('.')
+    codes[rng.random(size) < 0.01] = ord('\n')
+    codes[rng.random(size) < 0.03] &= 0xDF  # Uppercase (no effect on ' ', '.', '\n')
+    return codes
+
+
+def calibrate_hill(pairs, report=None):
+    """
+    Table crossover, thread count and slab size of the Hill bulk engine
+    Args:
+        pairs: (N, 2) uint8 letter indices
+    Returns:
+        dict: hill_table_pairs, hill_threads, hill_slab_pairs
+    """
+    matrix = hill_cipher.HillCipher().compile_key(KEY).matrix
+
+    def matmul(count):
+        return _best(hill_cipher.transform_pairs, pairs[:count], matrix, 1,
+                     hill_cipher.SLAB_PAIRS, 26, 1 << 62, repeat=REPEAT * 5)
+
+    def cold_table(count):
+        def run():
+            hill_cipher._pair_table.cache_clear()
+            hill_cipher.transform_pairs(pairs[:count], matrix, 1, hill_cipher.SLAB_PAIRS, 26, 0)
+        return _best(run, repeat=REPEAT * 5)
+
+    # Smallest size from which the table (built from scratch) always wins
+    table_pairs = 1 << 62
+    for count in reversed(TABLE_PAIRS_CANDIDATES):
+        if cold_table(count) >= matmul(count):
+            break
+        table_pairs = count
+    if report:
+        report(f"  hill_table_pairs: {table_pairs if table_pairs < 1 << 62 else 'never'}")
+
+    hill_cipher._pair_table(matrix, 26)
+    threads = _fastest(range(1, (os.cpu_count() or 1) + 1),
+                       lambda count: _best(hill_cipher.transform_pairs, pairs, matrix, count,
+                                           hill_cipher.SLAB_PAIRS, 26, table_pairs),
+                       report, 'hill_threads')
+    slab_pairs = _fastest(SLAB_PAIRS_CANDIDATES,
+                          lambda slab: _best(hill_cipher.transform_pairs, pairs, matrix, threads,
+                                             slab, 26, table_pairs),
+                          report, 'hill_slab_pairs')
+    return {'hill_table_pairs': table_pairs, 'hill_threads': threads,
+            'hill_slab_pairs': slab_pairs}
+
+
+def calibrate_slab_bytes(codes, cipher, key, report=None):
+    """Bytes per slab of transform_bytes()"""
+    def measure(slab):
+        saved, byte_text.SLAB_BYTES = byte_text.SLAB_BYTES, slab
+        try:
+            return _best(transform_bytes, codes, cipher, key, False)
+        finally:
+            byte_text.SLAB_BYTES = saved
+    return _fastest(SLAB_BYTES_CANDIDATES, measure, report, 'slab_bytes')
+
+
+def calibrate_stream_chunk(codes, cipher, key, report=None):
+    """Bytes per chunk when a file is streamed through a ByteStream"""
+    data = codes.tobytes()
+
+    def stream(chunk):
+        source, stream = io.BytesIO(data), ByteStream(cipher, key)
+        while block := source.read(chunk):
+            stream.feed(block)
+        stream.finish()
+
+    return _fastest(STREAM_CHUNK_CANDIDATES, lambda chunk: _best(stream, chunk),
+                    report, 'stream_chunk')
+
+
+def calibrate_chunk_bytes(codes, cipher, key, report=None):
+    """Bytes per task of the process pool (None on a single core)"""
+    from .parallel import ParallelExecutor
+    workers = os.cpu_count() or 1
+    if workers == 1:
+        if report:
+            report("  chunk_bytes: skipped (single core, the pool is never used)")
+        return None
+
+    def measure(chunk_bytes):
+        with ParallelExecutor(workers, chunk_bytes) as executor:
+            executor.transform_bytes(codes[:chunk_bytes * workers], cipher, key)  # Start the pool
+            return _best(executor.transform_bytes, codes, cipher, key)
+
+    return _fastest(CHUNK_BYTES_CANDIDATES, measure, report, 'chunk_bytes')
+
+
+def _round_trip(pool, repeat):
+    """Median wall time of a no-op job on a warm pool"""
+    pool.submit(int).result()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pool.submit(int).result()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def _loop_round_trip(repeat):
+    """Median wall time of awaiting a no-op job on the event loop's default executor"""
+    async def measure():
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, int)
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await loop.run_in_executor(None, int)
+            times.append(time.perf_counter() - start)
+        return statistics.median(times)
+    return asyncio.run(measure())
+
+
+def calibrate_dispatch(cipher, key, report=None):
+    """
+    Pool round trips, the encrypt() cost model and the inline threshold
+    Returns:
+        dict: thread_overhead, process_overhead, transform_fixed,
+            transform_per_char, inline_chars
+    """
+    with ThreadPoolExecutor(1) as pool:
+        thread_overhead = _round_trip(pool, 200)
+    with ProcessPoolExecutor(1) as pool:
+        process_overhead = _round_trip(pool, 20)
+    loop_overhead = _loop_round_trip(200)
+
+    text = sample_text(COST_SIZES[-1], seed=1).tobytes().decode('ascii')
+    times = np.array([_best(cipher.encrypt, text[:size], key, repeat=REPEAT * 3)
+                      for size in COST_SIZES])
+    # Relative weights, so the small sizes pin down the fixed cost
+    per_char, fixed = np.polyfit(np.array(COST_SIZES, dtype=np.float64), times, 1, w=1 / times)
+    per_char = max(float(per_char), 1e-12)
+    fixed = max(float(fixed), 1e-7)
+
+    # Largest text encrypted faster than the hop to the executor and back
+    inline_chars = max((size for size, seconds in zip(COST_SIZES, times) if seconds <= loop_overhead),
+                       default=COST_SIZES[0])
+    values = {'thread_overhead': thread_overhead, 'process_overhead': process_overhead,
+              'transform_fixed': fixed, 'transform_per_char': per_char,
+              'inline_chars': inline_chars}
+    if report:
+        report(f"  round trips: thread pool {thread_overhead * 1e6:.0f} us, "
+               f"process pool {process_overhead * 1e6:.0f} us, event loop {loop_overhead * 1e6:.0f} us")
+        report(f"  encrypt(): {fixed * 1e6:.1f} us + {per_char * 1e9:.2f} ns/char "
+               f"-> inline_chars {inline_chars}")
+    return values
+
+
+def calibrate(size=SAMPLE_BYTES, report=None):
+    """
+    Benchmark the engines and pick their parameters
+    Args:
+        size (int): Bytes of synthetic text to time the bulk engines on
+        report: Optional callable receiving progress lines
+    Returns:
+        dict: Parameter name -> value, for ciphers.tuning.save_tuning()
+    """
+    cipher = get_cipher('hill')
+    key = cipher.compile_key(KEY)
+    codes = sample_text(size)
+    letters = codes[byte_text.letter_mask(codes)] | 0x20
+    pairs = (letters[:len(letters) // 2 * 2] - 97).reshape(-1, 2)
+
+    values = {}
+    steps = (('Hill bulk engine', lambda: calibrate_hill(pairs, report)),
+             ('Byte kernels', lambda: {'slab_bytes': calibrate_slab_bytes(codes, cipher, key, report)}),
+             ('File streaming', lambda: {'stream_chunk': calibrate_stream_chunk(codes, cipher, key, report)}),
+             ('Process pool', lambda: {'chunk_bytes': calibrate_chunk_bytes(codes, cipher, key, report)}),
+             ('Dispatch', lambda: calibrate_dispatch(cipher, key, report)))
+    for title, step in steps:
+        if report:
+            report(f"{title}...")
+        values.update((name, value) for name, value in step().items() if value is not None)
+    return values
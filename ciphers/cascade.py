@@ -0,0 +1,223 @@
+"""
+Cipher cascades: several ciphers applied one after another.
+
+Stages are fused when the key is compiled instead of being run one by one:
+    - adjacent monoalphabetic stages (Caesar, Affine) compose into one
+      26-entry letter table
+    - from the first block stage (Hill) on, every following stateless
+      stage, linear or not, composes into one 676-entry digraph table
+      (pair (a, b) -> output pair), so Caesar -> Affine -> Hill -> Caesar
+      is a single gather over the letter pairs
+
+The letter table is folded into the digraph table as well, so a whole
+run of stateless stages costs one pass over the letters, and the text
+layout is parsed and rebuilt once for the whole cascade.
+
+Padding is applied once, like a single Hill cipher: encryption pads an
+odd letter count with X where the first block stage sees it, and
+decryption strips it again at the end. (Chaining encrypt()/decrypt()
+calls instead would pad and strip at every Hill stage.)
+
+Stages that are not stateless (Playfair) cannot be fused; they run on
+their own between the fused runs.
+
+Usage:
+    cascade = Cascade(['caesar', 'affine', 'hill'])
+    ciphertext = cascade.encrypt("Attack at dawn", [3, '5,8', '3,3,2,5'])
+    plaintext = cascade.decrypt(ciphertext, [3, '5,8', '3,3,2,5'])
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from .protocol import transform_buffer
+from .registry import get_cipher
+from .text_buffer import TextBuffer
+
+# Padding letter of block stages ('X', as HillCipher uses)
+PAD = ord('X') - 65
+
+# All 676 letter pairs in (a, b) order: row a*26+b holds (a, b)
+_PAIRS = np.indices((26, 26), dtype=np.uint8).reshape(2, -1).T
+
+# Stage that could not be fused: index into Cascade.ciphers and its compiled key
+StageKey = namedtuple('StageKey', ['index', 'key'])
+
+CascadeKey = namedtuple('CascadeKey', ['steps'])
+
+
+class FusedStages(namedtuple('FusedStages', ['block_size', 'encrypt_table', 'decrypt_table',
+                                             'encrypt_pad', 'decrypt_strip'])):
+    """
+    Compiled run of stateless stages
+
+    block_size 1: 26-entry letter tables. block_size 2: 676-entry digraph
+    tables (2 bytes per row). encrypt_pad is the input letter that becomes
+    X in front of the first block stage; decrypt_strip is the output
+    letter that was X there, and is dropped from the end on decryption.
+    """
+
+    __slots__ = ()
+
+    def _lookup(self, letters, table):
+        lookup = np.frombuffer(table, dtype=np.uint8)
+        if self.block_size == 1:
+            return lookup[letters]
+        pairs = letters.reshape(-1, 2).astype(np.intp)
+        return lookup.reshape(-1, 2)[pairs[:, 0] * 26 + pairs[:, 1]].ravel()
+
+    def _pad(self, letters, pad, final):
+        if len(letters) % self.block_size:
+            if not final:
+                raise ValueError(f"Letter count must be a multiple of the block size ({self.block_size})")
+            letters = np.append(letters, np.uint8(pad))
+        return letters
+
+    def encrypt_array(self, letters, key=None, final=True):
+        """Encrypt letter indices through the fused tables"""
+        return self._lookup(self._pad(letters, self.encrypt_pad, final), self.encrypt_table)
+
+    def decrypt_array(self, letters, key=None, final=True):
+        """Decrypt letter indices through the fused tables"""
+        result = self._lookup(self._pad(letters, PAD, final), self.decrypt_table)
+        if final and self.block_size > 1 and len(result) and result[-1] == self.decrypt_strip:
+            result = result[:-1]
+        return result
+
+
+def _fuse(stages):
+    """
+    Compose stateless stages into FusedStages
+    Args:
+        stages: (cipher, compiled key) pairs, block sizes 1 or 2
+    Returns:
+        FusedStages
+    """
+    letters = np.arange(26, dtype=np.uint8)  # Letter table before the first block stage
+    pairs = None                             # Digraph table from the first block stage on
+    for cipher, key in stages:
+        if cipher.block_size == 1:
+            table = cipher.encrypt_array(np.arange(26, dtype=np.uint8), key)
+            if pairs is None:
+                letters = table[letters]
+            else:
+                pairs = table[pairs]
+        else:
+            if pairs is None:
+                pairs = _PAIRS
+            pairs = cipher.encrypt_array(pairs.ravel(), key, final=False).reshape(-1, 2)
+
+    if sorted(letters.tolist()) != list(range(26)):
+        raise ValueError("Cascade stage is not invertible")
+    inverse_letters = np.argsort(letters).astype(np.uint8)
+    if pairs is None:
+        return FusedStages(1, letters.tobytes(), inverse_letters.tobytes(), PAD, PAD)
+
+    # Fold the letter table in front of the digraph table
+    first, second = letters[_PAIRS[:, 0]].astype(np.intp), letters[_PAIRS[:, 1]].astype(np.intp)
+    encrypt = pairs[first * 26 + second]
+    codes = encrypt[:, 0].astype(np.intp) * 26 + encrypt[:, 1]
+    if len(np.unique(codes)) != len(codes):
+        raise ValueError("Cascade stage is not invertible")
+    decrypt = np.empty_like(_PAIRS)
+    decrypt[codes] = _PAIRS
+    pad = int(inverse_letters[PAD])
+    return FusedStages(2, encrypt.astype(np.uint8).tobytes(), decrypt.tobytes(), pad, pad)
+
+
+class Cascade:
+    """Several ciphers as one, with stateless runs fused into lookup tables"""
+
+    def __init__(self, ciphers):
+        """
+        Args:
+            ciphers: Cipher instances or registry names, in encryption order
+        """
+        self.ciphers = tuple(get_cipher(c) if isinstance(c, str) else c for c in ciphers)
+        if not self.ciphers:
+            raise ValueError("A cascade needs at least one cipher")
+        self.name = '+'.join(c.name for c in self.ciphers)
+        self.block_size = max(c.block_size for c in self.ciphers)
+        self.stateless = all(self._fusable(c) for c in self.ciphers)
+        self.supports_streaming = self.stateless
+
+    @staticmethod
+    def _fusable(cipher):
+        return cipher.stateless and cipher.block_size <= 2
+
+    def compile_key(self, key):
+        """
+        Compile every stage key and fuse stateless runs
+        Args:
+            key: One key per cipher (sequence), or an already compiled key
+        Returns:
+            CascadeKey
+        """
+        if isinstance(key, CascadeKey):
+            return key
+        keys = list(key)
+        if len(keys) != len(self.ciphers):
+            raise ValueError(f"Cascade needs {len(self.ciphers)} keys, got {len(keys)}")
+
+        steps, run = [], []
+        for index, (cipher, stage_key) in enumerate(zip(self.ciphers, keys)):
+            compiled = cipher.compile_key(stage_key)
+            if self._fusable(cipher):
+                run.append((cipher, compiled))
+                continue
+            if run:
+                steps.append(_fuse(run))
+                run = []
+            steps.append(StageKey(index, compiled))
+        if run:
+            steps.append(_fuse(run))
+        return CascadeKey(tuple(steps))
+
+    def _single_step(self, key):
+        steps = self.compile_key(key).steps
+        if not self.stateless:
+            raise ValueError(f"Cascade {self.name} has stages that cannot be fused")
+        return steps[0]
+
+    def encrypt_array(self, letters, key, final=True):
+        """Encrypt a uint8 letter-index array (stateless cascades only)"""
+        return self._single_step(key).encrypt_array(letters, final=final)
+
+    def decrypt_array(self, letters, key, final=True):
+        """Decrypt a uint8 letter-index array (stateless cascades only)"""
+        return self._single_step(key).decrypt_array(letters, final=final)
+
+    def _run(self, text, key, decrypt):
+        """Transform str or TextBuffer input, returning the same type"""
+        steps = self.compile_key(key).steps
+        buffer = TextBuffer.from_text(text) if isinstance(text, str) else text
+        for step in (reversed(steps) if decrypt else steps):
+            if isinstance(step, FusedStages):
+                buffer = transform_buffer(step, buffer, None, decrypt)
+            else:
+                cipher = self.ciphers[step.index]
+                buffer = (cipher.decrypt if decrypt else cipher.encrypt)(buffer, step.key)
+        return buffer.to_text() if isinstance(text, str) else buffer
+
+    def encrypt(self, plaintext, key):
+        """
+        Encrypt through every stage in order
+        Args:
+            plaintext (str or TextBuffer): Text to encrypt
+            key: One key per cipher
+        Returns:
+            str (or TextBuffer): Encrypted ciphertext
+        """
+        return self._run(plaintext, key, decrypt=False)
+
+    def decrypt(self, ciphertext, key):
+        """
+        Decrypt through every stage in reverse order
+        Args:
+            ciphertext (str or TextBuffer): Text to decrypt
+            key: One key per cipher
+        Returns:
+            str (or TextBuffer): Decrypted plaintext
+        """
+        return self._run(ciphertext, key, decrypt=True)
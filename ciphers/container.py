@@ -0,0 +1,292 @@
+"""
+Chunk-indexed container for encrypted text.
+
+Layout of a container file:
+    magic 'CIPHCTR1', u32 header length, JSON header
+        {"version", "cipher", "key_fingerprint", "block_size", "layout", "chunk_bytes"}
+    chunks: ciphertext, each one independently decryptable
+    chunk index: (offset, length, letters) per chunk, u64 little-endian
+    footer: u64 chunk count, u64 index offset, magic 'CIPHIDX1'
+
+Chunks are cut after a whole number of cipher blocks (see
+ciphers.parallel), so every chunk decrypts on its own; only the last
+chunk holding letters gets the end-of-message rule (padding). The
+layout is 'inline': non-letters stay in place inside the chunks, as in
+the plain ciphertext files written by encrypt_file().
+
+Writers and readers can spread the chunks over a process pool. Readers
+map the container and decrypt any chunk in any order; the key
+fingerprint in the header rejects a wrong key before any output is
+written.
+
+Usage:
+    write_container('plain.txt', 'secret.cph', 'hill', '3,3,2,5', workers=4)
+    read_container('secret.cph', 'plain.txt', '3,3,2,5', workers=4)
+
+    with ContainerReader('secret.cph') as reader:
+        text = reader.decrypt_chunk(reader.chunk_count - 1, '3,3,2,5')
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .byte_text import last_letters, letter_mask, transform_body, transform_bytes
+from .parallel import CHUNK_BYTES, _chunk_bounds, _chunk_counts
+from .registry import get_cipher
+
+MAGIC = b'CIPHCTR1'
+INDEX_MAGIC = b'CIPHIDX1'
+VERSION = 1
+
+_LENGTH = struct.Struct('<I')
+_ENTRY = struct.Struct('<QQQ')
+_FOOTER = struct.Struct('<QQ8s')
+
+
+def key_fingerprint(cipher, key):
+    """
+    Short digest identifying a compiled key (without revealing it directly)
+    Returns:
+        str: 16 hex digits
+    """
+    data = f"{cipher.name}:{cipher.compile_key(key)!r}".encode('utf-8')
+    return hashlib.blake2b(data, digest_size=8, person=b'cipherkey').hexdigest()
+
+
+def _transform_range(codes, cipher, key, decrypt, final):
+    """Transform one chunk's bytes; final chunks get the end-of-message rule"""
+    if final:
+        return transform_bytes(codes, cipher, key, decrypt)
+    out = np.empty(len(codes), dtype=np.uint8)
+    transform_body(codes, out, 0, len(codes), cipher, key, decrypt)
+    return out
+
+
+def _encrypt_chunk(path, lo, hi, cipher, key, final):
+    """Worker: encrypt bytes lo:hi of a text file"""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as source:
+        codes = np.frombuffer(source, dtype=np.uint8)[lo:hi]
+        out = _transform_range(codes, cipher, key, False, final)
+        del codes
+    return out.tobytes(), int(np.count_nonzero(letter_mask(out)))
+
+
+def _decrypt_chunk(path, offset, length, cipher, key, final):
+    """Worker: decrypt one chunk of a container file"""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as source:
+        codes = np.frombuffer(source, dtype=np.uint8, count=length, offset=offset)
+        out = _transform_range(codes, cipher, key, True, final)
+        del codes
+    return out.tobytes()
+
+
+def _ordered(jobs, workers, ahead=2):
+    """
+    Results of (function, *args) jobs, in order
+    With workers > 1 the jobs run on a process pool, at most ahead jobs
+    per worker in flight so finished chunks never pile up in memory.
+    """
+    if workers <= 1:
+        for function, *args in jobs:
+            yield function(*args)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for function, *args in jobs:
+            pending.append(pool.submit(function, *args))
+            if len(pending) >= workers * ahead:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _final_chunk(bounds, codes):
+    """Index of the chunk holding the last letter (0 if there are none)"""
+    last = last_letters(codes, 1)
+    if not len(last):
+        return 0
+    return int(np.searchsorted(bounds, last[0], side='right')) - 1
+
+
+def write_container(src, dst, cipher, key, chunk_bytes=CHUNK_BYTES, workers=1):
+    """
+    Encrypt a text file into a container
+    Args:
+        src: Uncompressed UTF-8/ASCII text file
+        dst: Container path (created or overwritten)
+        cipher: Cipher instance or registry name
+        key: Key (raw or compiled)
+        chunk_bytes (int): Target input bytes per chunk
+        workers (int): Processes encrypting chunks (1: in this process)
+    Returns:
+        int: Chunks written
+    """
+    if isinstance(cipher, str):
+        cipher = get_cipher(cipher)
+    key = cipher.compile_key(key)
+    header = json.dumps({
+        'version': VERSION,
+        'cipher': cipher.name,
+        'key_fingerprint': key_fingerprint(cipher, key),
+        'block_size': cipher.block_size,
+        'layout': 'inline',
+        'chunk_bytes': chunk_bytes,
+    }).encode('utf-8')
+
+    with open(src, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        stateless = getattr(cipher, 'stateless', False)
+        if stateless:
+            source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        else:
+            # Playfair's X insertion needs the whole text; its ciphertext
+            # is still cut into digraph-aligned chunks below
+            source = cipher.encrypt(f.read().decode('utf-8'), key).encode('utf-8')
+    try:
+        codes = np.frombuffer(source, dtype=np.uint8)
+        bounds = (_chunk_bounds(codes, len(codes), _chunk_counts(codes, chunk_bytes),
+                                chunk_bytes, cipher.block_size) if len(codes) else [0])
+        final = _final_chunk(bounds, codes)
+        if stateless:
+            results = _ordered(((_encrypt_chunk, src, lo, hi, cipher, key, i == final)
+                                for i, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:]))), workers)
+        else:
+            results = ((codes[lo:hi].tobytes(), int(np.count_nonzero(letter_mask(codes[lo:hi]))))
+                       for lo, hi in zip(bounds[:-1], bounds[1:]))
+
+        entries = []
+        with open(dst, 'wb') as out:
+            out.write(MAGIC + _LENGTH.pack(len(header)) + header)
+            for data, letters in results:
+                entries.append(_ENTRY.pack(out.tell(), len(data), letters))
+                out.write(data)
+            index_offset = out.tell()
+            out.write(b''.join(entries))
+            out.write(_FOOTER.pack(len(entries), index_offset, INDEX_MAGIC))
+        del codes
+    finally:
+        if isinstance(source, mmap.mmap):
+            source.close()
+    return len(entries)
+
+
+class ContainerReader:
+    """Memory-mapped container with random access to its chunks"""
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Container file
+        Raises:
+            ValueError: If the file is not a container
+        """
+        self.path = os.fspath(path)
+        self._map = None
+        try:
+            # Mapping fails on an empty file, so it belongs to the checks too
+            with open(self.path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._parse()
+        except (ValueError, KeyError, struct.error) as e:
+            self.close()
+            raise ValueError(f"Not a cipher container: {e}") from None
+        except BaseException:
+            self.close()
+            raise
+
+    def _parse(self):
+        data = self._map
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError("bad magic")
+        (length,) = _LENGTH.unpack_from(data, len(MAGIC))
+        start = len(MAGIC) + _LENGTH.size
+        self.header = json.loads(bytes(data[start:start + length]).decode('utf-8'))
+        if self.header.get('version') != VERSION or self.header.get('layout') != 'inline':
+            raise ValueError("unsupported version or layout")
+
+        count, index_offset, magic = _FOOTER.unpack_from(data, len(data) - _FOOTER.size)
+        if magic != INDEX_MAGIC:
+            raise ValueError("missing chunk index")
+        self.chunks = [_ENTRY.unpack_from(data, index_offset + i * _ENTRY.size)
+                       for i in range(count)]
+        self.cipher = get_cipher(self.header['cipher'])
+        lettered = [i for i, (_, _, letters) in enumerate(self.chunks) if letters]
+        self._final = lettered[-1] if lettered else 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Unmap the file"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    @property
+    def chunk_count(self):
+        return len(self.chunks)
+
+    def check_key(self, key):
+        """
+        Compile a key and make sure it is the one the container was written with
+        Raises:
+            ValueError: On a wrong key
+        """
+        key = self.cipher.compile_key(key)
+        if key_fingerprint(self.cipher, key) != self.header['key_fingerprint']:
+            raise ValueError("Key does not match the container")
+        return key
+
+    def decrypt_chunk(self, i, key):
+        """
+        Decrypt one chunk
+        Args:
+            i (int): Chunk number
+            key: Key (raw or compiled)
+        Returns:
+            bytes: Plaintext of the chunk
+        """
+        key = self.check_key(key)
+        offset, length, _ = self.chunks[i]
+        codes = np.frombuffer(self._map, dtype=np.uint8, count=length, offset=offset)
+        result = _transform_range(codes, self.cipher, key, True, i == self._final).tobytes()
+        del codes
+        return result
+
+    def iter_decrypt(self, key, workers=1):
+        """Plaintext of every chunk in order, decrypted on workers processes"""
+        key = self.check_key(key)
+        return _ordered(((_decrypt_chunk, self.path, offset, length, self.cipher, key,
+                          i == self._final)
+                         for i, (offset, length, _) in enumerate(self.chunks)), workers)
+
+
+def read_container(src, dst, key, workers=1):
+    """
+    Decrypt a container into a text file
+    Args:
+        src: Container path
+        dst: Output text file (created or overwritten)
+        key: Key (raw or compiled) for the container's cipher
+        workers (int): Processes decrypting chunks (1: in this process)
+    Returns:
+        int: Bytes written
+    """
+    written = 0
+    with ContainerReader(src) as reader:
+        chunks = reader.iter_decrypt(key, workers)  # Checks the key before dst is opened
+        with open(dst, 'wb') as out:
+            for data in chunks:
+                out.write(data)
+                written += len(data)
+    return written
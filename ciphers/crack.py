@@ -0,0 +1,428 @@
+"""
+Known-plaintext attack on 2x2 Hill cipher keys.
+
+Mathematical Background:
+    - Hill cipher encryption: C = K × P (mod 26)
+    - To find key K: K = C × P⁻¹ (mod 26)
+    - P⁻¹ exists only when gcd(det(P), 26) = 1
+    - Valid determinants mod 26: {1, 3, 5, 7, 9, 11, 15, 17, 19, 21, 23, 25}
+
+Attack Strategy:
+    1. Algebraic Attack: Find invertible plaintext matrix, compute K = C × P⁻¹
+    2. Brute Force Fallback: Search each key row over its 676 candidates
+       (C = K × P splits row by row), then check the determinant of the
+       surviving row combinations
+    3. Exhaustive Mode: Test every invertible key, slab by slab, with
+       one vectorized multiply-mod-compare per known digraph
+
+The command line tool (cracker.py) and the async/scheduler front ends
+(ciphers.aio, ciphers.scheduler) all use this class.
+
+Usage:
+    from ciphers.crack import HillCipherCracker
+    key = HillCipherCracker().crack_key("hello", "hiozhn")
+"""
+
+# NumPy and the key table modules are imported on first use, so importing
+# the cracker (e.g. from the GUI) does not pay for them up front
+
+
+class HillCipherCracker:
+    """
+    Robust 2x2 Hill Cipher Cracker using Known Plaintext Attack.
+    
+    Works with ANY valid plaintext-ciphertext pair by combining:
+    1. Fast algebraic approach (when plaintext matrix is invertible)
+    2. Optimized brute force (when algebraic approach fails)
+    """
+    
+    ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    MOD = 26
+    # Determinants coprime with 26 (have modular inverse)
+    VALID_DETS = frozenset({1, 3, 5, 7, 9, 11, 15, 17, 19, 21, 23, 25})
+    # Digraph pairs per batch in the algebraic attack
+    BATCH_PAIRS = 1 << 14
+    # Candidate keys per slab in the exhaustive search (~0.5 MB of int16 keys)
+    SLAB_KEYS = 1 << 16
+    
+    def _char_to_num(self, char):
+        """Convert character to number (A=0, B=1, ..., Z=25)"""
+        return ord(char.upper()) - ord('A')
+    
+    def _num_to_char(self, num):
+        """Convert number to character"""
+        return chr((num % self.MOD) + ord('A'))
+    
+    def _clean_text(self, text):
+        """Fold accents, remove non-alphabetic characters and convert to uppercase"""
+        from ciphers.normalize import fold_accents
+        return ''.join(c.upper() for c in fold_accents(text) if c.isascii() and c.isalpha())
+    
+    def _pad_text(self, text):
+        """Pad text with 'X' to make length even (for 2x2 block size)"""
+        if len(text) % 2 != 0:
+            text += 'X'
+        return text
+    
+    def _text_to_digraphs(self, text):
+        """Convert text to list of digraph tuples [(a,b), (c,d), ...]"""
+        text = self._pad_text(self._clean_text(text))
+        return [(self._char_to_num(text[i]), self._char_to_num(text[i+1])) 
+                for i in range(0, len(text), 2)]
+    
+    def _det_2x2(self, a, b, c, d):
+        """Calculate determinant of 2x2 matrix [[a,b],[c,d]] mod 26"""
+        return (a * d - b * c) % self.MOD
+    
+    def _matrix_mod_inverse_2x2(self, matrix):
+        """
+        Calculate modular inverse of 2x2 matrix mod 26.
+        
+        For matrix [[a,b],[c,d]]:
+        - det = ad - bc
+        - inverse = det⁻¹ × [[d, -b], [-c, a]] (mod 26)
+        
+        Returns None if matrix is not invertible.
+        """
+        from ciphers.modular import inverse_mod, invertible_mask
+        if not invertible_mask(matrix)[0]:
+            return None
+        
+        # det⁻¹ × [[d, -b], [-c, a]] (mod 26), see ciphers.modular
+        return inverse_mod(matrix)[0].astype(int)
+    
+    def _pair_determinants(self, digraphs):
+        """
+        Determinants of every plaintext matrix built from two digraphs.
+        
+        Pair (i, j) forms P = [[p1, p3], [p2, p4]] (digraphs as columns).
+        All pairs are computed in one batch, in itertools.combinations order.
+        
+        Returns:
+            tuple: (i indices, j indices, determinants mod 26) as arrays
+        """
+        import numpy as np
+        from ciphers.modular import det_mod
+        digraphs = np.asarray(digraphs, dtype=int).reshape(-1, 2)
+        i, j = np.triu_indices(len(digraphs), k=1)
+        P = np.stack([digraphs[i], digraphs[j]], axis=2)
+        return i, j, det_mod(P)
+    
+    def _encrypt_digraph(self, digraph, key):
+        """Encrypt a single digraph (p1, p2) with key matrix"""
+        import numpy as np
+        p = np.array(digraph)
+        c = np.dot(key, p) % self.MOD
+        return (int(c[0]), int(c[1]))
+    
+    def _pair_batches(self, n, batch_pairs):
+        """
+        Index pairs (i, j), i < j < n, in itertools.combinations order.
+        
+        Yields:
+            tuple: (i indices, j indices) arrays of about batch_pairs pairs
+        """
+        import numpy as np
+        rows, size = [], 0
+        for i in range(n - 1):
+            rows.append(i)
+            size += n - 1 - i
+            if size >= batch_pairs or i == n - 2:
+                counts = n - 1 - np.array(rows)
+                first = np.repeat(rows, counts)
+                # j runs from i + 1 to n - 1 within each row
+                offsets = np.arange(size) - np.repeat(np.cumsum(counts) - counts, counts)
+                yield first, first + 1 + offsets
+                rows, size = [], 0
+    
+    def _crack_algebraic(self, pt_digraphs, ct_digraphs):
+        """
+        Algebraic attack: Find key using K = C × P⁻¹ (mod 26)
+        
+        We need to find 2 plaintext digraphs that form an invertible 2x2 matrix.
+        The matrix P has digraphs as columns: P = [[p1, p3], [p2, p4]]
+        
+        Pairs are taken in batches: their determinants are computed at once,
+        and every invertible pair of the first batch that has any yields a
+        candidate K = C × P⁻¹ in one batched matmul. Candidates are
+        deduplicated, and each one is verified against all digraphs with a
+        single matmul. An invertible P determines K uniquely, so if none of
+        them verifies, no key fits the crib and the search stops.
+        """
+        import numpy as np
+        from ciphers.modular import inverse_mod, invertible_mask
+        pt = np.asarray(pt_digraphs, dtype=int).reshape(-1, 2)
+        ct = np.asarray(ct_digraphs, dtype=int).reshape(-1, 2)
+        # Repeated digraphs add no new pairs: pair up the first occurrence of
+        # each distinct one (at most 676, so at most ~228k pairs)
+        _, first = np.unique(pt[:, 0] * self.MOD + pt[:, 1], return_index=True)
+        first = np.sort(first)
+        
+        for i, j in self._pair_batches(len(first), self.BATCH_PAIRS):
+            i, j = first[i], first[j]
+            # Plaintext and ciphertext matrices with the two digraphs as columns
+            P = np.stack([pt[i], pt[j]], axis=2)
+            invertible = invertible_mask(P)
+            if not invertible.any():
+                continue
+            C = np.stack([ct[i[invertible]], ct[j[invertible]]], axis=2)
+            candidates = np.unique((C @ inverse_mod(P[invertible])) % self.MOD, axis=0)
+            
+            # Verify each distinct candidate on ALL digraphs at once
+            for K in candidates:
+                if ((pt @ K.T) % self.MOD == ct).all():
+                    return K.astype(int)
+            return None
+        
+        return None
+    
+    def _row_candidates(self, pt_digraphs, ct_values):
+        """
+        All key rows (k0, k1) with k0·p1 + k1·p2 ≡ c (mod 26) for every digraph.
+        
+        Each row of K produces one letter of every ciphertext digraph, so it
+        can be searched on its own: 676 candidates, tested against all
+        digraphs in one broadcast multiply-mod-compare.
+        
+        Args:
+            pt_digraphs: (n, 2) plaintext digraphs
+            ct_values: (n,) ciphertext letters produced by this row
+        Returns:
+            np.ndarray: (m, 2) matching rows, in lexicographic order
+        """
+        import numpy as np
+        rows = np.indices((self.MOD, self.MOD)).reshape(2, -1).T
+        produced = (rows @ np.asarray(pt_digraphs, dtype=int).T) % self.MOD
+        return rows[(produced == np.asarray(ct_values, dtype=int)).all(axis=1)]
+    
+    def _crack_bruteforce(self, pt_digraphs, ct_digraphs):
+        """
+        Brute force attack, searching the two key rows separately.
+        
+        C = K × P means the top row of K alone yields the first letter of
+        every ciphertext digraph, and the bottom row the second. Instead of
+        26⁴ keys, each row is searched over 26² candidates, and only the
+        cross product of the two survivor sets is checked for an invertible
+        determinant. Every survivor pair already encrypts all digraphs
+        correctly, so no further verification is needed.
+        
+        The first invertible key in (a, b, c, d) order is returned, the same
+        key a full search of the key table would find first.
+        """
+        import numpy as np
+        from ciphers.modular import MOD_INVERSES
+        pt = np.asarray(pt_digraphs, dtype=int)
+        ct = np.asarray(ct_digraphs, dtype=int)
+        top = self._row_candidates(pt, ct[:, 0])
+        bottom = self._row_candidates(pt, ct[:, 1])
+        if not len(top) or not len(bottom):
+            return None
+        
+        # det(K) = a·d - b·c for every (top, bottom) combination
+        det = (np.outer(top[:, 0], bottom[:, 1]) - np.outer(top[:, 1], bottom[:, 0])) % self.MOD
+        invertible = np.flatnonzero(MOD_INVERSES[det] != 0)
+        if not len(invertible):
+            return None
+        i, j = divmod(int(invertible[0]), len(bottom))
+        return np.array([top[i], bottom[j]], dtype=int)
+    
+    def _keyspace_slabs(self, keyspace, slab_keys):
+        """
+        Candidate keys in (a, b, c, d) order, slab_keys matrices at a time.
+        
+        'invertible' reads the precomputed table of the 157,248 invertible
+        keys (ciphers.hill_keys). 'all' enumerates all 26⁴ = 456,976
+        matrices slab by slab and drops the non-invertible ones with the
+        determinant mask. Either way at most one slab is in memory.
+        
+        Yields:
+            np.ndarray: (m, 2, 2) int16 invertible keys
+        """
+        import numpy as np
+        from ciphers.modular import invertible_mask
+        if keyspace == 'invertible':
+            from ciphers.hill_keys import load_key_table
+            table = load_key_table()['key']
+            for start in range(0, len(table), slab_keys):
+                yield table[start:start + slab_keys].astype(np.int16)
+            return
+        
+        total = self.MOD ** 4
+        places = self.MOD ** np.arange(3, -1, -1)
+        for start in range(0, total, slab_keys):
+            index = np.arange(start, min(start + slab_keys, total))
+            keys = (index[:, None] // places % self.MOD).astype(np.int16).reshape(-1, 2, 2)
+            yield keys[invertible_mask(keys)]
+    
+    def _crack_exhaustive(self, pt_digraphs, ct_digraphs, keyspace='invertible',
+                          slab_keys=SLAB_KEYS):
+        """
+        Vectorized brute force over the whole keyspace.
+        
+        Each slab of keys is narrowed down digraph by digraph: one broadcast
+        multiply-mod-compare per known digraph keeps only the keys that
+        produce its ciphertext, so later digraphs test fewer keys. Its run
+        time does not depend on the crib, which makes it the predictable
+        worst case when neither the algebraic nor the row attack applies.
+        
+        Args:
+            keyspace (str): 'invertible' (precomputed table) or 'all' (26⁴ matrices)
+            slab_keys (int): Keys held in memory at once
+        Returns:
+            np.ndarray: First matching key in (a, b, c, d) order, or None
+        """
+        import numpy as np
+        if keyspace not in ('invertible', 'all'):
+            raise ValueError(f"Unknown keyspace {keyspace!r} (use 'invertible' or 'all')")
+        pt = np.asarray(pt_digraphs, dtype=np.int16)
+        ct = np.asarray(ct_digraphs, dtype=np.int16)
+        for keys in self._keyspace_slabs(keyspace, slab_keys):
+            for (p1, p2), expected in zip(pt, ct):
+                produced = (keys[:, :, 0] * p1 + keys[:, :, 1] * p2) % self.MOD
+                keys = keys[(produced == expected).all(axis=1)]
+                if not len(keys):
+                    break
+            if len(keys):
+                return keys[0].astype(int)
+        return None
+    
+    def crack_key(self, plaintext, ciphertext, method='auto'):
+        """
+        Crack 2x2 Hill Cipher key using known plaintext attack.
+        
+        Args:
+            plaintext: Known plaintext string
+            ciphertext: Corresponding ciphertext string
+            method (str): 'auto' (strategy below), or 'exhaustive' to test
+                the whole invertible keyspace with the NumPy brute force
+        
+        Returns:
+            2x2 numpy array containing the key matrix, or None if not found
+        
+        Strategy:
+            1. Try algebraic approach first (fast, vectorized over digraph pairs)
+            2. Fall back to optimized brute force if algebraic fails
+        
+        Note: With only 1 digraph (2 chars), multiple keys may produce the same
+        ciphertext. Use at least 4 characters (2 digraphs) for unique key recovery.
+        """
+        if method not in ('auto', 'exhaustive'):
+            raise ValueError(f"Unknown method {method!r} (use 'auto' or 'exhaustive')")
+        
+        # Prepare digraphs
+        pt_digraphs = self._text_to_digraphs(plaintext)
+        ct_digraphs = self._text_to_digraphs(ciphertext)
+        
+        # Validate input
+        if len(pt_digraphs) < 1:
+            print("Error: Need at least 2 characters (1 digraph)")
+            return None
+        
+        if len(pt_digraphs) != len(ct_digraphs):
+            print(f"Error: Plaintext ({len(pt_digraphs)} digraphs) and ciphertext ({len(ct_digraphs)} digraphs) must have same length")
+            return None
+        
+        # Warn about uniqueness with insufficient data
+        if len(pt_digraphs) < 2:
+            print("Warning: Only 1 digraph provided. Multiple keys may match.")
+            print("         Use 4+ characters for guaranteed unique key recovery.")
+        
+        if method == 'exhaustive':
+            return self._crack_exhaustive(pt_digraphs, ct_digraphs)
+        
+        # Method 1: Algebraic attack (requires invertible plaintext matrix)
+        key = self._crack_algebraic(pt_digraphs, ct_digraphs)
+        if key is not None:
+            return key
+        
+        # Method 2: Optimized brute force
+        print("Algebraic approach failed (no invertible plaintext matrix). Using brute force...")
+        return self._crack_bruteforce(pt_digraphs, ct_digraphs)
+    
+    def encrypt(self, plaintext, key):
+        """Encrypt plaintext using key matrix"""
+        digraphs = self._text_to_digraphs(plaintext)
+        result = ''
+        for dg in digraphs:
+            enc = self._encrypt_digraph(dg, key)
+            result += self._num_to_char(enc[0]) + self._num_to_char(enc[1])
+        return result
+    
+    def decrypt(self, ciphertext, key, original_plaintext_length=None):
+        """Decrypt ciphertext using key matrix, preserving original case and spacing.
+        
+        Args:
+            ciphertext: The ciphertext to decrypt
+            key: The key matrix
+            original_plaintext_length: If provided, strips padding 'X' if it was added
+        """
+        key_inv = self._matrix_mod_inverse_2x2(key)
+        if key_inv is None:
+            print("Error: Key is not invertible")
+            return None
+        
+        # Letters as _clean_text() sees them (accents folded, ASCII only),
+        # with the layout of everything else kept by the buffer
+        import numpy as np
+        from ciphers.normalize import fold_accents
+        from ciphers.text_buffer import TextBuffer
+        buffer = TextBuffer.from_text(fold_accents(ciphertext))
+        letters = buffer.letters
+        if len(letters) % 2:
+            letters = np.append(letters, np.uint8(self._char_to_num('X')))
+        pairs = letters.reshape(-1, 2).astype(np.int64)
+        decrypted = (pairs @ np.asarray(key_inv, dtype=np.int64).T % self.MOD).astype(np.uint8)
+        decrypted = decrypted.ravel()[:buffer.letter_count]
+        upper = buffer.upper
+        
+        # Strip padding X if original plaintext length is known and was odd
+        if original_plaintext_length is not None:
+            if len(decrypted) > original_plaintext_length and decrypted[-1] == self._char_to_num('X'):
+                decrypted, upper = decrypted[:-1], upper[:-1]
+        
+        return buffer.replace_letters(decrypted, upper).to_text()
+    
+    def format_key(self, key):
+        """Format key matrix for display"""
+        if key is None:
+            return "No key found"
+        
+        det = self._det_2x2(key[0][0], key[0][1], key[1][0], key[1][1])
+        
+        result = f"\n{'='*50}\n"
+        result += "CRACKED KEY MATRIX (2x2):\n"
+        result += f"{'='*50}\n"
+        result += f"┌{'─'*15}┐\n"
+        result += f"│ {int(key[0][0]):5d}  {int(key[0][1]):5d} │\n"
+        result += f"│ {int(key[1][0]):5d}  {int(key[1][1]):5d} │\n"
+        result += f"└{'─'*15}┘\n"
+        result += f"Determinant (mod 26): {det}\n"
+        result += f"Key as flat array: [{','.join(str(int(x)) for x in key.flatten())}]\n"
+        result += f"{'='*50}\n"
+        
+        return result
+    
+    def analyze_plaintext(self, plaintext):
+        """Analyze plaintext to check if algebraic attack is possible"""
+        digraphs = self._text_to_digraphs(plaintext)
+        n = len(digraphs)
+        
+        print(f"\nPlaintext Analysis: '{plaintext}'")
+        print(f"Cleaned & padded: '{self._pad_text(self._clean_text(plaintext))}'")
+        print(f"Digraphs: {digraphs}")
+        print(f"\nPossible matrix pairs and their determinants:")
+        
+        invertible_count = 0
+        
+        for i, j, det in zip(*self._pair_determinants(digraphs)):
+            invertible = det in self.VALID_DETS
+            if invertible:
+                invertible_count += 1
+            status = "✓ INVERTIBLE" if invertible else "✗ not invertible"
+            print(f"  Digraphs ({i},{j}): det = {det:2d} -> {status}")
+        
+        print(f"\nResult: {invertible_count} invertible pairs found")
+        if invertible_count > 0:
+            print("Algebraic attack WILL work.")
+        else:
+            print("Algebraic attack will fail. Brute force required.")
@@ -0,0 +1,209 @@
+"""
+File-to-file encryption over memory-mapped views.
+
+The input file is mapped read-only and the output file is sized up front
+(ftruncate) and mapped read-write. Ciphers that implement the array
+protocol are run slab by slab directly on the mapped bytes: letters are
+ASCII A-Z/a-z bytes, every other byte (punctuation, newlines, UTF-8
+sequences) is copied unchanged, and no Python string of the file is ever
+built. Only the last block or two of letters, which may gain or lose
+padding, are handled separately.
+
+Ciphers that are not stateless (Playfair inserts letters mid-text) fall
+back to a TextBuffer of the whole file.
+
+Paths ending in .gz, .bz2 or .xz are decompressed/compressed on the fly
+with the stdlib codecs. Compressed files cannot be mapped, so they are
+streamed instead: large buffered reads, chunk by chunk through a
+ByteStream, straight into the (compressing) output. No temporary
+decompressed file is written and the whole text is never held in memory.
+
+encrypt_file(..., fold=True) folds accented letters to A-Z first (see
+ciphers.normalize); the text changes length, so it is streamed as well.
+encrypt_file(..., index=True) also writes a letter-offset index of the
+output for decrypt_range() (see ciphers.letter_index).
+
+Usage:
+    from ciphers import encrypt_file, decrypt_file
+    encrypt_file('plain.txt', 'secret.txt', 'hill', '3,3,2,5')
+    decrypt_file('secret.txt', 'plain.txt', 'hill', '3,3,2,5')
+    encrypt_file('corpus.txt.xz', 'secret.txt.gz', 'caesar', 3)
+"""
+
+import bz2
+import codecs
+import gzip
+import lzma
+import mmap
+import os
+from contextlib import ExitStack
+
+import numpy as np
+
+from .byte_text import ByteStream, body_end, plan_tail, transform_body, write_tail
+from .letter_index import build_index, save_index
+from .normalize import fold_accents
+from .registry import get_cipher
+from .text_buffer import TextBuffer
+from .tuning import tuned
+
+# Compression codecs by file suffix, wrapping an already open binary file
+CODECS = {
+    '.gz': lambda f, mode: gzip.GzipFile(fileobj=f, mode=mode, compresslevel=6),
+    '.bz2': lambda f, mode: bz2.BZ2File(f, mode),
+    '.xz': lambda f, mode: lzma.LZMAFile(f, mode),
+}
+
+# Uncompressed bytes per chunk when streaming
+STREAM_CHUNK = tuned('stream_chunk', 1 << 22)
+
+# Buffer size of the raw (compressed) files
+IO_BUFFER = 1 << 20
+
+
+def is_compressed(path):
+    """True if the path has a .gz, .bz2 or .xz suffix"""
+    return os.path.splitext(path)[1].lower() in CODECS
+
+
+def open_stream(stack, path, mode):
+    """
+    Open a file for binary streaming, through its codec if compressed
+    Args:
+        stack (ExitStack): Closes the raw file and the codec wrapper
+        path: File path
+        mode (str): 'rb' or 'wb'
+    Returns:
+        Binary file object
+    """
+    raw = stack.enter_context(open(path, mode, buffering=IO_BUFFER))
+    codec = CODECS.get(os.path.splitext(path)[1].lower())
+    if codec is None:
+        return raw
+    return stack.enter_context(codec(raw, mode))
+
+
+def _map_output(f, size):
+    """Resize an open file and map it read-write (None for an empty file)"""
+    f.truncate(size)
+    if not size:
+        return None
+    return mmap.mmap(f.fileno(), size)
+
+
+def _transform_mapped(codes, dst_file, cipher, key, decrypt):
+    """Array-protocol transform of mapped input bytes into dst_file"""
+    tail, tail_letters, out_size = plan_tail(codes, cipher, key, decrypt)
+    output = _map_output(dst_file, out_size)
+    if output is None:
+        return 0
+    try:
+        out = np.frombuffer(output, dtype=np.uint8)
+        transform_body(codes, out, 0, body_end(codes, tail), cipher, key, decrypt)
+        write_tail(codes, out, tail, tail_letters)
+        del out
+        output.flush()
+    finally:
+        output.close()
+    return out_size
+
+
+def _transform_streamed(src, dst, cipher, key, decrypt, fold=False):
+    """Chunked transform for compressed inputs or outputs, or folded input"""
+    written = 0
+    with ExitStack() as stack:
+        source = open_stream(stack, src, 'rb')
+        target = open_stream(stack, dst, 'wb')
+        if not getattr(cipher, 'stateless', False):
+            transform = cipher.decrypt if decrypt else cipher.encrypt
+            text = source.read().decode('utf-8')
+            data = transform(fold_accents(text) if fold else text, key).encode('utf-8')
+            target.write(data)
+            return len(data)
+
+        # Chunks may end inside a UTF-8 sequence, which the decoder holds back
+        decoder = codecs.getincrementaldecoder('utf-8')() if fold else None
+        stream = ByteStream(cipher, key, decrypt)
+        while True:
+            chunk = source.read(STREAM_CHUNK)
+            if not chunk:
+                break
+            if decoder is not None:
+                chunk = fold_accents(decoder.decode(chunk)).encode('utf-8')
+            output = stream.feed(chunk)
+            target.write(output)
+            written += len(output)
+        if decoder is not None:
+            decoder.decode(b'', final=True)  # Raises on a truncated last character
+        output = stream.finish()
+        target.write(output)
+        written += len(output)
+    return written
+
+
+def _transform_file(src, dst, cipher, key, decrypt, fold=False):
+    """Shared body of encrypt_file() and decrypt_file()"""
+    if isinstance(cipher, str):
+        cipher = get_cipher(cipher)
+    key = cipher.compile_key(key)
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise ValueError("Source and destination must be different files")
+    if fold or is_compressed(src) or is_compressed(dst):
+        return _transform_streamed(src, dst, cipher, key, decrypt, fold)
+
+    with open(src, 'rb') as src_file, open(dst, 'w+b') as dst_file:
+        size = os.fstat(src_file.fileno()).st_size
+        source = mmap.mmap(src_file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        try:
+            codes = np.frombuffer(source, dtype=np.uint8)
+            if getattr(cipher, 'stateless', False):
+                written = _transform_mapped(codes, dst_file, cipher, key, decrypt)
+            else:
+                buffer = TextBuffer.from_text(codes.tobytes().decode('utf-8'))
+                transform = cipher.decrypt if decrypt else cipher.encrypt
+                data = transform(buffer, key).to_text().encode('utf-8')
+                output = _map_output(dst_file, len(data))
+                if output is not None:
+                    output[:] = data
+                    output.close()
+                written = len(data)
+            del codes
+        finally:
+            if size:
+                source.close()
+    return written
+
+
+def encrypt_file(src, dst, cipher, key, fold=False, index=False):
+    """
+    Encrypt a file into another file
+    Args:
+        src: Input file path (UTF-8 or ASCII text; .gz/.bz2/.xz are decompressed)
+        dst: Output file path (created or overwritten; .gz/.bz2/.xz are compressed)
+        cipher: Cipher instance or registry name ('caesar', 'hill', ...)
+        key: Key (raw or compiled)
+        fold (bool): Fold accented letters to A-Z before encrypting
+        index (bool): Also write dst's letter-offset index (dst + '.lidx')
+    Returns:
+        int: Bytes of (uncompressed) output written
+    """
+    if index and is_compressed(dst):
+        raise ValueError("Compressed output cannot be indexed for random access")
+    written = _transform_file(src, dst, cipher, key, decrypt=False, fold=fold)
+    if index:
+        save_index(build_index(dst), dst)
+    return written
+
+
+def decrypt_file(src, dst, cipher, key):
+    """
+    Decrypt a file into another file
+    Args:
+        src: Input file path (UTF-8 or ASCII text; .gz/.bz2/.xz are decompressed)
+        dst: Output file path (created or overwritten; .gz/.bz2/.xz are compressed)
+        cipher: Cipher instance or registry name ('caesar', 'hill', ...)
+        key: Key (raw or compiled)
+    Returns:
+        int: Bytes of (uncompressed) output written
+    """
+    return _transform_file(src, dst, cipher, key, decrypt=True)
@@ -1,8 +1,126 @@
-import numpy as np
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+from .protocol import transform_buffer
+from .stream import CipherStream
+from .tuning import tuned
+
+# NumPy (and the modules built on it) is imported on first use, so
+# importing the package stays cheap for callers that never run Hill
+
+# Compiled key: matrix and inverse as nested tuples, reduced mod 26
+HillKey = namedtuple('HillKey', ['matrix', 'inverse'])
+
+# Digraphs per slab in the threaded bulk path (~256 KB of int32 work per slab)
+SLAB_PAIRS = tuned('hill_slab_pairs', 32768)
+
+# Worker threads of the bulk path when none are given (None: os.cpu_count())
+THREADS = tuned('hill_threads', None)
+
+# Pair-table engine: from this many digraphs on, transform_pairs gathers
+# each output pair from a per-key 65536-entry table (see _pair_table)
+# instead of multiplying by the matrix. Below it, building the table costs
+# more than it saves; `main.py calibrate` measures the crossover.
+TABLE_PAIRS = tuned('hill_table_pairs', 2048)
+
+
+@lru_cache(maxsize=32)
+def _pair_table(matrix, m):
+    """
+    Digraph lookup table of a key matrix
+    
+    A uint8 letter pair read as one uint16 indexes the table directly, so
+    a lookup is a single gather with no index arithmetic. Building it
+    costs a few hundred digraphs' worth of matmul; it is cached per key.
+    
+    Args:
+        matrix (tuple): 2x2 key matrix as nested tuples
+        m (int): Modulus (at most 256)
+    Returns:
+        np.ndarray: 65536-entry uint16 table, input pair -> output pair
+    """
+    import numpy as np
+    pairs = np.indices((m, m), dtype=np.uint8).reshape(2, -1).T.copy()
+    result = np.remainder(pairs.astype(np.int32) @ np.asarray(matrix, dtype=np.int32).T, m)
+    table = np.zeros(1 << 16, dtype=np.uint16)
+    table[pairs.view(np.uint16).ravel()] = result.astype(np.uint8).view(np.uint16).ravel()
+    return table
+
+
+def _transform_slab(pairs, out, matrix_t, m, start, stop):
+    """Multiply one slab of digraphs by the key matrix into out[start:stop]"""
+    import numpy as np
+    block = pairs[start:stop].astype(np.int32)
+    np.remainder(block @ matrix_t, m, out=out[start:stop], casting='unsafe')
+
+
+def _lookup_slab(source, target, table, start, stop):
+    """Look one slab of digraphs (as uint16) up in a pair table"""
+    import numpy as np
+    np.take(table, source[start:stop], out=target[start:stop], mode='clip')
+
+
+def transform_pairs(pairs, matrix, threads=None, slab_pairs=SLAB_PAIRS, m=26,
+                    table_pairs=TABLE_PAIRS):
+    """
+    Apply a 2x2 key matrix to an (N, 2) array of letter indices.
+    
+    The array is split into slabs that are processed by a thread pool and
+    written into one shared output array. NumPy releases the GIL inside
+    the matmul, modulo and gather loops, so slabs run on several cores at
+    once. uint8 arrays of at least table_pairs digraphs go through the
+    key's pair table instead of the matmul.
+    
+    Args:
+        pairs: (N, 2) array of letter indices (0-25)
+        matrix: 2x2 key matrix
+        threads (int): Worker threads (default: THREADS, else os.cpu_count())
+        slab_pairs (int): Digraphs per slab
+        m (int): Modulus
+        table_pairs (int): Smallest N that uses the pair table
+    Returns:
+        np.ndarray: (N, 2) uint8 array of transformed indices
+    """
+    import numpy as np
+    pairs = np.asarray(pairs).reshape(-1, 2)
+    out = np.empty(pairs.shape, dtype=np.uint8)
+    bounds = [(start, min(start + slab_pairs, len(pairs)))
+              for start in range(0, len(pairs), slab_pairs)]
+    
+    if len(pairs) >= table_pairs and pairs.dtype == np.uint8 and m <= 256:
+        table = _pair_table(tuple(map(tuple, np.asarray(matrix).tolist())), m)
+        work = _lookup_slab
+        args = (np.ascontiguousarray(pairs).view(np.uint16).ravel(),
+                out.view(np.uint16).ravel(), table)
+    else:
+        work = _transform_slab
+        matrix_t = np.asarray(matrix, dtype=np.int32).T.copy()
+        args = (pairs, out, matrix_t, m)
+    
+    threads = threads or THREADS or os.cpu_count() or 1
+    if threads == 1 or len(bounds) <= 1:
+        for start, stop in bounds:
+            work(*args, start, stop)
+        return out
+    
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=min(threads, len(bounds))) as pool:
+        futures = [pool.submit(work, *args, start, stop)
+                   for start, stop in bounds]
+        for future in futures:
+            future.result()
+    return out
+
 
 class HillCipher:
     """Hill Cipher implementation using 2x2 key matrix"""
     
+    name = 'hill'
+    block_size = 2
+    stateless = True
+    supports_streaming = True
+    
     def __init__(self):
         self.alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
         self.m = 26
@@ -13,39 +131,20 @@ class HillCipher:
             a, b = b, a % b
         return a
     
-    def _mod_inverse(self, a, m):
-        """Find modular multiplicative inverse of a under modulo m"""
-        a = a % m
-        for i in range(1, m):
-            if (a * i) % m == 1:
-                return i
-        return None
-    
     def _matrix_determinant_2x2(self, matrix):
         """Calculate determinant of 2x2 matrix"""
         return int(matrix[0][0] * matrix[1][1] - matrix[0][1] * matrix[1][0])
     
     def _matrix_inverse_2x2(self, matrix):
         """Calculate modular inverse of 2x2 matrix"""
-        det = self._matrix_determinant_2x2(matrix)
-        det_mod = det % self.m
+        det_mod = self._matrix_determinant_2x2(matrix) % self.m
         
         if self._gcd(det_mod, self.m) != 1:
             raise ValueError(f"Matrix determinant ({det_mod}) is not coprime with 26. Cannot find inverse.")
         
-        det_inv = self._mod_inverse(det_mod, self.m)
-        if det_inv is None:
-            raise ValueError("Cannot find modular inverse of determinant")
-        
-        # Adjugate matrix for 2x2: swap diagonal, negate off-diagonal
-        adj_matrix = np.array([
-            [matrix[1][1], -matrix[0][1]],
-            [-matrix[1][0], matrix[0][0]]
-        ])
-        
-        # Multiply by determinant inverse and take modulo
-        inv_matrix = (det_inv * adj_matrix) % self.m
-        return inv_matrix.astype(int)
+        # det⁻¹ × adjugate (mod 26), see ciphers.modular
+        from .modular import inverse_mod
+        return inverse_mod(matrix)[0].astype(int)
     
     def _validate_key_matrix(self, matrix):
         """Validate that matrix determinant is coprime with 26"""
@@ -58,6 +157,7 @@ class HillCipher:
     
     def _parse_key(self, key):
         """Parse key string into 2x2 matrix and validate"""
+        import numpy as np
         if isinstance(key, str):
             # Expected format: "a,b,c,d" for [[a,b],[c,d]]
             values = [int(x.strip()) for x in key.split(',')]
@@ -80,109 +180,133 @@ class HillCipher:
         
         return matrix
     
-    def _prepare_text(self, text):
-        """Prepare text by tracking spaces and removing non-alphabetic characters"""
-        case_map = []
-        clean_text = ''
-        space_positions = []  # Track where spaces were
-        current_pos = 0
-        
-        for i, c in enumerate(text):
-            if c == ' ':
-                space_positions.append(current_pos)
-            elif c.isalpha():
-                case_map.append(c.isupper())
-                clean_text += c.upper()
-                current_pos += 1
+    def compile_key(self, key):
+        """
+        Parse and validate a key matrix once
+        Args:
+            key: 2x2 matrix as string "a,b,c,d", array [[a,b],[c,d]], or compiled key
+        Returns:
+            HillKey: Key matrix and its inverse, reduced mod 26
+        """
+        if isinstance(key, HillKey):
+            return key
+        matrix = self._parse_key(key) % self.m
+        inverse = self._matrix_inverse_2x2(matrix)
+        return HillKey(tuple(map(tuple, matrix.tolist())), tuple(map(tuple, inverse.tolist())))
+    
+    def _transform_letters(self, letters, matrix, decrypt, final, threads):
+        """Apply a matrix to letter indices, with X padding when final"""
+        import numpy as np
+        if len(letters) % 2:
+            if not final:
+                raise ValueError("Letter count must be a multiple of the block size (2)")
+            # Pad with 'X' if odd length
+            letters = np.append(letters, np.uint8(self.alphabet.index('X')))
         
-        # Pad with 'X' if odd length
-        if len(clean_text) % 2 != 0:
-            clean_text += 'X'
-            case_map.append(False)  # Padding is lowercase by default
+        result = transform_pairs(letters, matrix, threads, m=self.m).ravel()
         
-        return clean_text, case_map, space_positions
+        # Remove padding X at the end if it exists
+        if final and decrypt and len(result) and result[-1] == self.alphabet.index('X'):
+            result = result[:-1]
+        return result
     
-    def _restore_spaces(self, text, space_positions):
-        """Restore spaces to their original positions"""
-        result = list(text)
-        for pos in sorted(space_positions, reverse=True):
-            if pos <= len(result):
-                result.insert(pos, ' ')
-        return ''.join(result)
+    def encrypt_array(self, letters, key, final=True, threads=1):
+        """
+        Encrypt a uint8 letter-index array
+        Args:
+            letters: Letter indices (0-25)
+            key: Key (raw or compiled)
+            final (bool): Pad an odd trailing letter with X
+            threads (int): Worker threads for the slab engine (None: all cores)
+        Returns:
+            np.ndarray: uint8 letter indices
+        """
+        return self._transform_letters(letters, self.compile_key(key).matrix, False, final, threads)
+    
+    def decrypt_array(self, letters, key, final=True, threads=1):
+        """
+        Decrypt a uint8 letter-index array
+        Args:
+            letters: Letter indices (0-25)
+            key: Key (raw or compiled)
+            final (bool): Pad an odd trailing letter, then drop a trailing X
+            threads (int): Worker threads for the slab engine (None: all cores)
+        Returns:
+            np.ndarray: uint8 letter indices
+        """
+        return self._transform_letters(letters, self.compile_key(key).inverse, True, final, threads)
+    
+    def _run(self, text, key, decrypt, threads=1):
+        """Transform str or TextBuffer input, returning the same type"""
+        key = self.compile_key(key)
+        if isinstance(text, str):
+            from .text_buffer import TextBuffer
+            buffer = TextBuffer.from_text(text)
+            return transform_buffer(self, buffer, key, decrypt, threads=threads).to_text()
+        return transform_buffer(self, text, key, decrypt, threads=threads)
     
     def encrypt(self, plaintext, key):
         """
         Encrypt plaintext using Hill cipher (2x2 matrix)
         Args:
-            plaintext (str): Text to encrypt
+            plaintext (str or TextBuffer): Text to encrypt
             key: 2x2 matrix as string "a,b,c,d" or array [[a,b],[c,d]]
         Returns:
-            str: Encrypted ciphertext
+            str (or TextBuffer): Encrypted ciphertext; non-letters stay in place
         """
-        key_matrix = self._parse_key(key)
-        prepared_text, case_map, space_positions = self._prepare_text(plaintext)
-        ciphertext = ''
-        
-        for i in range(0, len(prepared_text), 2):
-            # Convert digraph to vector
-            char1, char2 = prepared_text[i], prepared_text[i + 1]
-            vector = np.array([
-                self.alphabet.index(char1),
-                self.alphabet.index(char2)
-            ])
-            
-            # Multiply by key matrix and mod 26
-            encrypted_vector = np.dot(key_matrix, vector) % self.m
-            
-            # Convert back to characters with original case
-            enc1 = self.alphabet[encrypted_vector[0]]
-            enc2 = self.alphabet[encrypted_vector[1]]
-            
-            ciphertext += enc1 if case_map[i] else enc1.lower()
-            ciphertext += enc2 if case_map[i + 1] else enc2.lower()
-        
-        # Restore spaces
-        ciphertext = self._restore_spaces(ciphertext, space_positions)
-        
-        return ciphertext
+        return self._run(plaintext, key, decrypt=False)
     
     def decrypt(self, ciphertext, key):
         """
         Decrypt ciphertext using Hill cipher (2x2 matrix)
         Args:
-            ciphertext (str): Text to decrypt
+            ciphertext (str or TextBuffer): Text to decrypt
             key: 2x2 matrix as string "a,b,c,d" or array [[a,b],[c,d]]
         Returns:
-            str: Decrypted plaintext
+            str (or TextBuffer): Decrypted plaintext; non-letters stay in place
         """
-        key_matrix = self._parse_key(key)
-        inv_key_matrix = self._matrix_inverse_2x2(key_matrix)
-        prepared_text, case_map, space_positions = self._prepare_text(ciphertext)
-        plaintext = ''
-        
-        for i in range(0, len(prepared_text), 2):
-            # Convert digraph to vector
-            char1, char2 = prepared_text[i], prepared_text[i + 1]
-            vector = np.array([
-                self.alphabet.index(char1),
-                self.alphabet.index(char2)
-            ])
-            
-            # Multiply by inverse key matrix and mod 26
-            decrypted_vector = np.dot(inv_key_matrix, vector) % self.m
-            
-            # Convert back to characters with original case
-            dec1 = self.alphabet[int(decrypted_vector[0])]
-            dec2 = self.alphabet[int(decrypted_vector[1])]
-            
-            plaintext += dec1 if case_map[i] else dec1.lower()
-            plaintext += dec2 if case_map[i + 1] else dec2.lower()
-        
-        # Remove padding X at the end if it exists
-        if len(plaintext) > 0 and plaintext[-1].upper() == 'X':
-            plaintext = plaintext[:-1]
-        
-        # Restore spaces
-        plaintext = self._restore_spaces(plaintext, space_positions)
-        
-        return plaintext
+        return self._run(ciphertext, key, decrypt=True)
+    
+    def encrypt_bulk(self, plaintext, key, threads=None):
+        """
+        Encrypt large texts with the threaded array engine
+        Args:
+            plaintext (str or TextBuffer): Text to encrypt
+            key: 2x2 matrix as string "a,b,c,d" or array [[a,b],[c,d]]
+            threads (int): Worker threads (default: os.cpu_count())
+        Returns:
+            str (or TextBuffer): Encrypted ciphertext, identical to encrypt()
+        """
+        return self._run(plaintext, key, decrypt=False, threads=threads)
+    
+    def decrypt_bulk(self, ciphertext, key, threads=None):
+        """
+        Decrypt large texts with the threaded array engine
+        Args:
+            ciphertext (str or TextBuffer): Text to decrypt
+            key: 2x2 matrix as string "a,b,c,d" or array [[a,b],[c,d]]
+            threads (int): Worker threads (default: os.cpu_count())
+        Returns:
+            str (or TextBuffer): Decrypted plaintext, identical to decrypt()
+        """
+        return self._run(ciphertext, key, decrypt=True, threads=threads)
+    
+    def encryptor(self, key):
+        """
+        Create an incremental encryptor for this key
+        Args:
+            key: 2x2 matrix as string "a,b,c,d" or array [[a,b],[c,d]]
+        Returns:
+            CipherStream: Call feed(chunk) per chunk, then finish()
+        """
+        return CipherStream(self, key, decrypt=False)
+    
+    def decryptor(self, key):
+        """
+        Create an incremental decryptor for this key
+        Args:
+            key: 2x2 matrix as string "a,b,c,d" or array [[a,b],[c,d]]
+        Returns:
+            CipherStream: Call feed(chunk) per chunk, then finish()
+        """
+        return CipherStream(self, key, decrypt=True)
@@ -0,0 +1,165 @@
+"""
+Precomputed table of all invertible 2x2 Hill keys (mod 26).
+
+There are 157,248 keys [[a,b],[c,d]] whose determinant is coprime with 26.
+The table stores every one of them together with its modular inverse and
+determinant, in lexicographic (a, b, c, d) order. It is generated once,
+saved as a ``.npy`` file and loaded with ``mmap_mode='r'``, so every
+process using it shares the same read-only pages.
+
+Usage:
+    from ciphers.hill_keys import load_key_table, sample_keys
+    table = load_key_table()
+    table['key'][0]          # -> [[1, 0], [0, 1]] ... first invertible key
+    keys = sample_keys(10)   # -> (10, 2, 2) uniformly random keys
+
+    python -m ciphers.hill_keys [path]   # Build the table ahead of time
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from .modular import MOD, det_mod, inverse_mod, invertible_mask
+from .tuning import APP_DIR
+
+KEY_COUNT = 157248
+
+# One record per invertible key
+KEY_DTYPE = np.dtype([
+    ('key', np.uint8, (2, 2)),
+    ('inverse', np.uint8, (2, 2)),
+    ('det', np.uint8),
+])
+
+TABLE_FILENAME = 'hill2x2_keys.npy'
+
+_table = None
+
+
+def default_table_path():
+    """Return the cache location of the key table."""
+    cache_dir = os.environ.get('CIPHER_TOOL_CACHE')
+    if not cache_dir:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        cache_dir = os.path.join(base, APP_DIR)
+    return os.path.join(cache_dir, TABLE_FILENAME)
+
+
+def build_key_table():
+    """
+    Enumerate all invertible 2x2 keys mod 26.
+
+    Returns:
+        np.ndarray: Structured array of KEY_DTYPE records, lexicographic order
+    """
+    # All 26^4 matrices in (a, b, c, d) order
+    keys = np.indices((MOD,) * 4, dtype=np.uint8).reshape(4, -1).T.reshape(-1, 2, 2)
+    keys = keys[invertible_mask(keys)]
+
+    table = np.empty(len(keys), dtype=KEY_DTYPE)
+    table['key'] = keys
+    table['inverse'] = inverse_mod(keys)
+    table['det'] = det_mod(keys)
+    return table
+
+
+def save_key_table(path=None):
+    """
+    Build the key table and write it to disk atomically.
+
+    Args:
+        path: Destination .npy file (defaults to default_table_path())
+    Returns:
+        str: Path of the written table
+    """
+    path = path or default_table_path()
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    # Write to a unique temporary file first so concurrent readers never see
+    # a partial table and concurrent writers (threads included) never share one
+    with tempfile.NamedTemporaryFile(dir=directory, prefix='.hill-keys-', suffix='.tmp',
+                                     delete=False) as f:
+        tmp_path = f.name
+        try:
+            np.save(f, build_key_table())
+        except BaseException:
+            f.close()
+            os.unlink(tmp_path)
+            raise
+    try:
+        os.replace(tmp_path, path)
+    except OSError:
+        os.unlink(tmp_path)
+        raise
+    return path
+
+
+def load_key_table(path=None):
+    """
+    Load the key table as a read-only memory map, building it on first use.
+
+    Args:
+        path: Table file (defaults to default_table_path())
+    Returns:
+        np.memmap: Structured array of KEY_DTYPE records
+    """
+    global _table
+    if path is None and _table is not None:
+        return _table
+
+    table_path = path or default_table_path()
+    table = None
+    if os.path.exists(table_path):
+        try:
+            table = np.load(table_path, mmap_mode='r')
+        except (OSError, ValueError, EOFError):
+            table = None  # Truncated or corrupt file, rebuild it
+        else:
+            if table.dtype != KEY_DTYPE or table.shape != (KEY_COUNT,):
+                table = None  # Stale or foreign file, rebuild it
+
+    if table is None:
+        try:
+            save_key_table(table_path)
+            table = np.load(table_path, mmap_mode='r')
+        except OSError:
+            # Read-only cache location: keep an in-memory copy for this process
+            table = build_key_table()
+
+    if path is None:
+        _table = table
+    return table
+
+
+def sample_keys(n, rng=None, with_inverse=False):
+    """
+    Draw invertible keys uniformly at random.
+
+    Args:
+        n (int): Number of keys to draw
+        rng: numpy Generator or seed (None for fresh entropy)
+        with_inverse (bool): Also return the matching inverse matrices
+    Returns:
+        np.ndarray: (n, 2, 2) keys, or (keys, inverses) if with_inverse
+    """
+    rng = np.random.default_rng(rng)
+    table = load_key_table()
+    rows = table[rng.integers(0, len(table), size=n)]
+    keys = rows['key'].astype(int)
+    if with_inverse:
+        return keys, rows['inverse'].astype(int)
+    return keys
+
+
+def random_key(rng=None):
+    """Return one uniformly random invertible 2x2 key matrix."""
+    return sample_keys(1, rng)[0]
+
+
+if __name__ == '__main__':
+    written = save_key_table(sys.argv[1] if len(sys.argv) > 1 else None)
+    print(f"Wrote {KEY_COUNT} invertible 2x2 keys to {written}")
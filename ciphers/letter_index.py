@@ -0,0 +1,196 @@
+"""
+Sparse letter-offset index for random-access decryption.
+
+Hill and Playfair work on digraphs of letters, skipping everything else,
+so decrypting a byte range in the middle of a file needs to know how
+many letters come before it. The index records the letter count at every
+stride-th byte (64 KB by default: 8 bytes of index per 64 KB of text),
+so decrypt_range() scans at most one stride to find the digraph
+alignment, then decrypts only the requested slice plus the few bytes
+needed to complete its first and last blocks.
+
+The index is kept in a sidecar file next to the ciphertext
+('secret.txt' -> 'secret.txt.lidx') and rebuilt if the file's size no
+longer matches.
+
+Usage:
+    encrypt_file('plain.txt', 'secret.txt', 'hill', '3,3,2,5', index=True)
+    decrypt_range('secret.txt', 1_000_000, 1_004_096, 'hill', '3,3,2,5')
+"""
+
+import mmap
+import os
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+from .byte_text import (SLAB_BYTES, count_letters, last_letters, letter_mask,
+                        letter_positions, transform_body, transform_bytes)
+from .registry import get_cipher
+
+# Bytes between index entries
+INDEX_STRIDE = 1 << 16
+
+# Bytes scanned at a time when widening a range to whole blocks
+SCAN_BYTES = 1 << 12
+
+# Sidecar file suffix
+INDEX_SUFFIX = '.lidx'
+
+# Sidecar header: magic, stride, indexed file size; uint64 counts follow
+_HEADER = struct.Struct('<8sQQ')
+_MAGIC = b'LIDX\x00\x00\x00\x01'
+
+# counts[i]: letters in the first i * stride bytes (the last entry: all letters)
+LetterIndex = namedtuple('LetterIndex', ['stride', 'size', 'counts'])
+
+
+def index_path(path):
+    """Sidecar index path of a file"""
+    return os.fspath(path) + INDEX_SUFFIX
+
+
+def count_index(codes, stride=INDEX_STRIDE):
+    """
+    Index of bytes already in memory (or mapped)
+    Args:
+        codes: uint8 text bytes
+        stride (int): Bytes between entries
+    Returns:
+        LetterIndex
+    """
+    size = len(codes)
+    slab = stride * max(1, SLAB_BYTES // stride)
+    sums = [np.add.reduceat(letter_mask(codes[lo:lo + slab]),
+                            np.arange(0, min(slab, size - lo), stride), dtype=np.uint64)
+            for lo in range(0, size, slab)]
+    counts = np.zeros(-(-size // stride) + 1, dtype=np.uint64)
+    if sums:
+        np.cumsum(np.concatenate(sums), out=counts[1:])
+    return LetterIndex(stride, size, counts)
+
+
+def build_index(path, stride=INDEX_STRIDE):
+    """
+    Index a file in one pass over a read-only mapping
+    Args:
+        path: Text file path
+        stride (int): Bytes between entries
+    Returns:
+        LetterIndex
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return count_index(np.zeros(0, dtype=np.uint8), stride)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as source:
+            codes = np.frombuffer(source, dtype=np.uint8)
+            index = count_index(codes, stride)
+            del codes
+    return index
+
+
+def save_index(index, path):
+    """Write an index to the sidecar of path"""
+    with open(index_path(path), 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, index.stride, index.size))
+        f.write(index.counts.astype('<u8').tobytes())
+
+
+def load_index(path):
+    """
+    Read the sidecar index of path
+    Returns:
+        LetterIndex, or None if there is none or it does not match the file size
+    """
+    try:
+        with open(index_path(path), 'rb') as f:
+            magic, stride, size = _HEADER.unpack(f.read(_HEADER.size))
+            counts = np.frombuffer(f.read(), dtype='<u8').astype(np.uint64)
+    except (OSError, struct.error):
+        return None
+    if magic != _MAGIC or size != os.path.getsize(path) or len(counts) != -(-size // stride) + 1:
+        return None
+    return LetterIndex(stride, size, counts)
+
+
+def open_index(path, stride=INDEX_STRIDE):
+    """Sidecar index of path, built and saved first if missing or stale"""
+    index = load_index(path)
+    if index is None:
+        index = build_index(path, stride)
+        save_index(index, path)
+    return index
+
+
+def letters_before(codes, index, offset):
+    """Letters in codes[:offset], from the nearest index entry"""
+    entry = offset // index.stride
+    return int(index.counts[entry]) + count_letters(codes, entry * index.stride, offset)
+
+
+def _block_bounds(codes, index, start, end, block):
+    """
+    Widen start:end to whole blocks
+    Returns:
+        tuple: (lo, hi, is_last) byte range starting and ending on block
+            boundaries; is_last when no letters follow hi
+    """
+    size = len(codes)
+    letters = letters_before(codes, index, start)
+    back = letters % block
+    lo = int(last_letters(codes[:start], back, SCAN_BYTES)[0]) if back else start
+
+    letters = letters - back + count_letters(codes, lo, end)  # Letters in codes[:end]
+    need = -letters % block
+    hi = end
+    while need and hi < size:
+        stop = min(hi + SCAN_BYTES, size)
+        positions = letter_positions(codes, hi, stop)
+        taken = min(need, len(positions))
+        hi = int(positions[taken - 1]) + 1 if taken == need else stop
+        letters, need = letters + taken, need - taken
+    return lo, hi, letters == int(index.counts[-1])
+
+
+def decrypt_range(path, start, end, cipher, key, index=None):
+    """
+    Decrypt bytes start:end of a ciphertext file without reading what comes before
+    Args:
+        path: Uncompressed ciphertext file
+        start (int): First byte offset
+        end (int): Byte offset after the range (clipped to the file size)
+        cipher: Cipher instance or registry name
+        key: Key (raw or compiled)
+        index (LetterIndex): Index of the file (default: its sidecar, built if needed)
+    Returns:
+        bytes: Same as the decrypted file's bytes start:end
+    """
+    if isinstance(cipher, str):
+        cipher = get_cipher(cipher)
+    key = cipher.compile_key(key)
+    if index is None:
+        index = open_index(path)
+
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if index.size != size:
+            raise ValueError("Letter index does not match the file (rebuild it)")
+        start, end = max(0, start), min(end, size)
+        if start >= end:
+            return b''
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as source:
+            codes = np.frombuffer(source, dtype=np.uint8)
+            lo, hi, is_last = _block_bounds(codes, index, start, end, cipher.block_size)
+            if is_last:
+                # The end-of-message rule (padding) applies to this slice
+                region = codes[lo:]
+                out = transform_bytes(region, cipher, key, decrypt=True)
+            else:
+                region = codes[lo:hi]
+                out = np.empty(len(region), dtype=np.uint8)
+                transform_body(region, out, 0, len(region), cipher, key, decrypt=True)
+            result = out[start - lo:end - lo].tobytes()
+            del codes, region
+    return result
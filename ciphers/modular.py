@@ -0,0 +1,97 @@
+"""
+Batched modular arithmetic for 2x2 matrices (mod 26).
+
+Every function accepts a single (2, 2) matrix or a stack of shape
+(N, 2, 2) and works on the whole stack at once, so determinants and
+inverses of millions of matrices cost a few NumPy passes instead of a
+Python loop per matrix.
+
+Usage:
+    from ciphers.modular import det_mod, invertible_mask, inverse_mod
+    mats = np.array([[[3, 3], [2, 5]], [[2, 4], [3, 6]]])
+    det_mod(mats)           # -> [9, 0]
+    invertible_mask(mats)   # -> [True, False]
+    inverse_mod(mats)[0]    # -> [[15, 17], [20, 9]]
+"""
+
+import numpy as np
+
+MOD = 26
+
+# Modular multiplicative inverse of every residue mod 26 (0 = none)
+MOD_INVERSES = np.zeros(MOD, dtype=np.int64)
+for _value in range(1, MOD):
+    for _candidate in range(1, MOD):
+        if (_value * _candidate) % MOD == 1:
+            MOD_INVERSES[_value] = _candidate
+            break
+MOD_INVERSES.setflags(write=False)
+
+# Determinants coprime with 26 (have modular inverse)
+VALID_DETS = frozenset(int(v) for v in np.flatnonzero(MOD_INVERSES))
+
+
+def _as_stack(matrices):
+    """View input as an int64 (N, 2, 2) stack"""
+    return np.asarray(matrices, dtype=np.int64).reshape(-1, 2, 2)
+
+
+def det_mod(matrices, m=MOD):
+    """
+    Determinant of each 2x2 matrix, mod m.
+
+    Args:
+        matrices: (2, 2) or (N, 2, 2) array
+    Returns:
+        np.ndarray: (N,) determinants in 0..m-1
+    """
+    mats = _as_stack(matrices)
+    return (mats[:, 0, 0] * mats[:, 1, 1] - mats[:, 0, 1] * mats[:, 1, 0]) % m
+
+
+def invertible_mask(matrices):
+    """
+    Which matrices are invertible mod 26 (determinant coprime with 26).
+
+    Args:
+        matrices: (2, 2) or (N, 2, 2) array
+    Returns:
+        np.ndarray: (N,) bool mask
+    """
+    return MOD_INVERSES[det_mod(matrices)] != 0
+
+
+def inverse_mod(matrices):
+    """
+    Modular inverse of each 2x2 matrix (mod 26).
+
+    For matrix [[a,b],[c,d]]: inverse = det⁻¹ × [[d, -b], [-c, a]] (mod 26),
+    with det⁻¹ read from the 26-entry MOD_INVERSES table.
+    Non-invertible matrices come back as all zeros; use invertible_mask()
+    to tell them apart.
+
+    Args:
+        matrices: (2, 2) or (N, 2, 2) array
+    Returns:
+        np.ndarray: (N, 2, 2) int64 inverses
+    """
+    mats = _as_stack(matrices)
+    det_inv = MOD_INVERSES[det_mod(mats)]
+
+    # Adjugate matrix: swap diagonal, negate off-diagonal
+    adj = np.empty_like(mats)
+    adj[:, 0, 0] = mats[:, 1, 1]
+    adj[:, 0, 1] = -mats[:, 0, 1]
+    adj[:, 1, 0] = -mats[:, 1, 0]
+    adj[:, 1, 1] = mats[:, 0, 0]
+    return det_inv[:, None, None] * adj % MOD
+
+
+def matmul_mod(left, right, m=MOD):
+    """
+    Batched matrix product mod m (broadcasts like np.matmul).
+
+    Returns:
+        np.ndarray: (left @ right) % m as int64
+    """
+    return np.matmul(np.asarray(left, dtype=np.int64), np.asarray(right, dtype=np.int64)) % m
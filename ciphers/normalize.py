@@ -0,0 +1,69 @@
+"""
+Accent folding for non-ASCII Latin text.
+
+The ciphers only transform ASCII A-Z/a-z; accented letters such as é or
+Ä are copied through unchanged like punctuation. fold_accents() maps
+them to their base letters first ("Café" -> "Cafe", "Straße" ->
+"Strasse"), keeping case, so they get encrypted too.
+
+The mapping is a str.translate() table built once from unicodedata (NFKD
+decompositions of the Latin blocks, plus the letters that have no
+decomposition, like ß, æ or ø), so folding runs at str.translate speed
+instead of calling unicodedata per character.
+
+Usage:
+    from ciphers.normalize import fold_accents
+    HillCipher().encrypt(fold_accents("Crème brûlée"), '3,3,2,5')
+"""
+
+import unicodedata
+
+# Code point ranges whose letters are folded through their NFKD decomposition
+FOLD_RANGES = (
+    (0x00C0, 0x0250),  # Latin-1 Supplement, Latin Extended-A/B
+    (0x1E00, 0x1F00),  # Latin Extended Additional
+    (0xFB00, 0xFB07),  # Latin ligatures (ﬁ, ﬂ, ...)
+    (0xFF21, 0xFF5B),  # Fullwidth A-Z, a-z
+)
+
+# Letters without a decomposition to ASCII
+SPECIAL_FOLDS = {
+    'ß': 'ss', 'ẞ': 'SS', 'Æ': 'AE', 'æ': 'ae', 'Œ': 'OE', 'œ': 'oe',
+    'Ø': 'O', 'ø': 'o', 'Đ': 'D', 'đ': 'd', 'Ð': 'D', 'ð': 'd',
+    'Ł': 'L', 'ł': 'l', 'Þ': 'TH', 'þ': 'th', 'Ħ': 'H', 'ħ': 'h', 'ı': 'i',
+}
+
+_table = None
+
+
+def fold_table():
+    """
+    Translate table of every foldable character (built on first use)
+    Returns:
+        dict: Code point -> ASCII replacement string
+    """
+    global _table
+    if _table is None:
+        table = {}
+        for start, stop in FOLD_RANGES:
+            for code in range(start, stop):
+                decomposed = unicodedata.normalize('NFKD', chr(code))
+                folded = ''.join(c for c in decomposed if c.isascii() and c.isalpha())
+                if folded:
+                    table[code] = folded
+        table.update((ord(char), folded) for char, folded in SPECIAL_FOLDS.items())
+        _table = table
+    return _table
+
+
+def fold_accents(text):
+    """
+    Replace accented Latin letters by their ASCII base letters
+    Args:
+        text (str): Any text
+    Returns:
+        str: Text whose Latin letters are all A-Z/a-z (other characters unchanged)
+    """
+    if text.isascii():
+        return text
+    return text.translate(fold_table())
@@ -0,0 +1,202 @@
+"""
+Process-pool executor for large inputs.
+
+The input is encoded once into a shared memory block and cut into
+chunks of roughly chunk_bytes. Cuts are placed by counting letters, not
+characters: every chunk starts after a whole number of cipher blocks, so
+a Hill digraph never straddles two workers however the punctuation and
+spaces fall. Workers attach to the input and output blocks by name and
+transform their byte range in place (see byte_text), so no chunk data is
+pickled and the output is already in order when the last worker ends.
+The few letters that get the end-of-message rule (padding) are handled
+in the parent.
+
+Only stateless ciphers (Caesar, Affine, Hill) are split; Playfair's X
+insertion depends on neighbouring letters, so it runs in the parent.
+
+Usage:
+    with ParallelExecutor(workers=8) as executor:
+        ciphertext = executor.encrypt(text, 'hill', '3,3,2,5')
+        plaintext = executor.decrypt(ciphertext, 'hill', '3,3,2,5')
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .byte_text import (SLAB_BYTES, body_end, letter_mask, letter_positions,
+                        plan_tail, transform_body, transform_bytes, write_tail)
+from .registry import get_cipher
+from .tuning import tuned
+
+# Target bytes per worker task
+CHUNK_BYTES = tuned('chunk_bytes', 1 << 23)
+
+
+def _transform_chunk(source_name, target_name, size, out_size, lo, hi, cipher, key, decrypt):
+    """Worker: transform bytes lo:hi of the shared input into the shared output"""
+    source = shared_memory.SharedMemory(name=source_name)
+    target = shared_memory.SharedMemory(name=target_name)
+    try:
+        codes = np.ndarray(size, dtype=np.uint8, buffer=source.buf)
+        out = np.ndarray(out_size, dtype=np.uint8, buffer=target.buf)
+        transform_body(codes, out, lo, hi, cipher, key, decrypt)
+        del codes, out  # Release the buffer exports before closing
+    finally:
+        source.close()
+        target.close()
+    return hi - lo
+
+
+def _chunk_counts(codes, chunk_bytes):
+    """Letters in each chunk_bytes-sized piece of codes"""
+    return [int(np.count_nonzero(letter_mask(codes[lo:lo + chunk_bytes])))
+            for lo in range(0, len(codes), chunk_bytes)]
+
+
+def _chunk_bounds(codes, end, counts, chunk_bytes, block):
+    """
+    Byte offsets cutting codes[:end] into chunks of whole blocks
+    Args:
+        codes: uint8 input bytes
+        end (int): Body end (start of the tail)
+        counts (list): Letters per chunk_bytes piece, from _chunk_counts()
+        chunk_bytes (int): Nominal chunk size
+        block (int): Cipher block size in letters
+    Returns:
+        list: Increasing offsets from 0 to end
+    """
+    bounds = [0]
+    letters_before = 0
+    for index, count in enumerate(counts[:-1]):
+        letters_before += count
+        cut = (index + 1) * chunk_bytes
+        need = -letters_before % block
+        if need:
+            # Move the cut just past the letters that complete the block
+            positions = letter_positions(codes, cut, min(cut + SLAB_BYTES, len(codes)))
+            if len(positions) < need:
+                continue
+            cut = int(positions[need - 1]) + 1
+        if bounds[-1] < cut < end:
+            bounds.append(cut)
+    bounds.append(end)
+    return bounds
+
+
+class ParallelExecutor:
+    """Runs stateless ciphers over large inputs on a pool of processes"""
+
+    def __init__(self, workers=None, chunk_bytes=CHUNK_BYTES):
+        """
+        Args:
+            workers (int): Worker processes (default: os.cpu_count())
+            chunk_bytes (int): Target input bytes per task
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_bytes = chunk_bytes
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Shut the worker processes down"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def transform_bytes(self, data, cipher, key, decrypt=False):
+        """
+        Encrypt or decrypt UTF-8/ASCII bytes
+        Args:
+            data (bytes-like): Input text bytes
+            cipher: Cipher instance or registry name
+            key: Key (raw or compiled)
+            decrypt (bool): Direction
+        Returns:
+            bytes: Output text bytes
+        """
+        if isinstance(cipher, str):
+            cipher = get_cipher(cipher)
+        key = cipher.compile_key(key)
+
+        if not cipher.stateless:
+            transform = cipher.decrypt if decrypt else cipher.encrypt
+            return transform(bytes(data).decode('utf-8'), key).encode('utf-8')
+
+        size = len(data)
+        if self.workers == 1 or size <= self.chunk_bytes:
+            codes = np.frombuffer(data, dtype=np.uint8)
+            return transform_bytes(codes, cipher, key, decrypt).tobytes()
+
+        source = shared_memory.SharedMemory(create=True, size=size)
+        target = None
+        try:
+            codes = np.ndarray(size, dtype=np.uint8, buffer=source.buf)
+            codes[:] = np.frombuffer(data, dtype=np.uint8)
+
+            counts = _chunk_counts(codes, self.chunk_bytes)
+            tail, tail_letters, out_size = plan_tail(codes, cipher, key, decrypt, count=sum(counts))
+            end = body_end(codes, tail)
+            bounds = _chunk_bounds(codes, end, counts, self.chunk_bytes, cipher.block_size)
+
+            target = shared_memory.SharedMemory(create=True, size=max(out_size, 1))
+            out = np.ndarray(out_size, dtype=np.uint8, buffer=target.buf)
+            pool = self._get_pool()
+            futures = [pool.submit(_transform_chunk, source.name, target.name, size, out_size,
+                                   lo, hi, cipher, key, decrypt)
+                       for lo, hi in zip(bounds[:-1], bounds[1:])]
+            for future in futures:
+                future.result()
+
+            write_tail(codes, out, tail, tail_letters)
+            result = out.tobytes()
+            del codes, out
+            return result
+        finally:
+            source.close()
+            source.unlink()
+            if target is not None:
+                target.close()
+                target.unlink()
+
+    def _run(self, text, cipher, key, decrypt):
+        """str or bytes in, same type out"""
+        if isinstance(text, str):
+            return self.transform_bytes(text.encode('utf-8'), cipher, key, decrypt).decode('utf-8')
+        return self.transform_bytes(text, cipher, key, decrypt)
+
+    def encrypt(self, plaintext, cipher, key):
+        """
+        Encrypt a large text across the worker processes
+        Args:
+            plaintext (str or bytes): Text to encrypt
+            cipher: Cipher instance or registry name
+            key: Key (raw or compiled)
+        Returns:
+            str (or bytes): Same result as cipher.encrypt(plaintext, key)
+        """
+        return self._run(plaintext, cipher, key, decrypt=False)
+
+    def decrypt(self, ciphertext, cipher, key):
+        """
+        Decrypt a large text across the worker processes
+        Args:
+            ciphertext (str or bytes): Text to decrypt
+            cipher: Cipher instance or registry name
+            key: Key (raw or compiled)
+        Returns:
+            str (or bytes): Same result as cipher.decrypt(ciphertext, key)
+        """
+        return self._run(ciphertext, cipher, key, decrypt=True)
@@ -1,6 +1,23 @@
+from collections import namedtuple
+
+import numpy as np
+
+from .text_buffer import TextBuffer
+
+# Compiled key: the 5x5 square as a 25-letter string and digraph tables (bytes)
+PlayfairKey = namedtuple('PlayfairKey', ['square', 'encrypt', 'decrypt'])
+
+_I, _J, _X = ord('I') - 65, ord('J') - 65, ord('X') - 65
+
+
 class PlayfairCipher:
     """Playfair Cipher implementation using 5x5 key matrix"""
     
+    name = 'playfair'
+    block_size = 2
+    stateless = False  # X insertion depends on neighbouring letters
+    supports_streaming = False
+    
     def __init__(self):
         self.alphabet = 'ABCDEFGHIKLMNOPQRSTUVWXYZ'  # J is omitted, I/J treated as same
     
@@ -26,171 +43,128 @@ class PlayfairCipher:
         
         return matrix
     
-    def _find_position(self, matrix, char):
-        """Find position of character in matrix"""
-        for i in range(5):
-            for j in range(5):
-                if matrix[i][j] == char:
-                    return i, j
-        return None, None
+    def _pair_table(self, matrix, decrypt=False):
+        """
+        Digraph lookup table for the whole alphabet
+        Returns:
+            np.ndarray: (26*26, 2) uint8, row a*26+b holds the output pair for (a, b)
+        """
+        shift = -1 if decrypt else 1
+        position = {matrix[r][c]: (r, c) for r in range(5) for c in range(5)}
+        # J is never looked up (it becomes I) but keeps the table dense
+        position['J'] = position['I']
+        
+        table = np.zeros((26 * 26, 2), dtype=np.uint8)
+        for a in range(26):
+            row1, col1 = position[chr(65 + a)]
+            for b in range(26):
+                row2, col2 = position[chr(65 + b)]
+                if row1 == row2:  # Same row
+                    out1, out2 = matrix[row1][(col1 + shift) % 5], matrix[row2][(col2 + shift) % 5]
+                elif col1 == col2:  # Same column
+                    out1, out2 = matrix[(row1 + shift) % 5][col1], matrix[(row2 + shift) % 5][col2]
+                else:  # Rectangle
+                    out1, out2 = matrix[row1][col2], matrix[row2][col1]
+                table[a * 26 + b] = (ord(out1) - 65, ord(out2) - 65)
+        return table
     
-    def _prepare_text(self, text):
-        """Prepare text for Playfair cipher (create digraphs), preserving case and space info"""
-        # Store original case information and space positions
-        case_map = []
-        text_clean = ''
-        space_positions = []
-        current_pos = 0
-        original_length = 0
-        
-        for char in text:
-            if char == ' ':
-                space_positions.append(current_pos)
-            elif char.isalpha():
-                case_map.append(char.isupper())
-                text_clean += char.upper().replace('J', 'I')
-                current_pos += 1
-                original_length += 1
-        
-        prepared = ''
-        i = 0
-        padding_added = 0
-        
-        while i < len(text_clean):
-            prepared += text_clean[i]
-            
-            if i + 1 < len(text_clean):
-                if text_clean[i] == text_clean[i + 1]:
-                    # Same letter repeated, insert X
-                    prepared += 'X'
-                    case_map.insert(len(prepared) - 1, False)
-                    padding_added += 1
-                else:
-                    prepared += text_clean[i + 1]
-                    i += 1
-            else:
-                # Odd length, add X at the end
-                prepared += 'X'
-                case_map.append(False)
-                padding_added += 1
-            
-            i += 1
-        
-        if len(prepared) % 2 != 0:
-            prepared += 'X'
-            case_map.append(False)
-            padding_added += 1
+    def compile_key(self, key):
+        """
+        Build the key square and digraph tables once
+        Args:
+            key (str): Keyword for matrix generation, or an already compiled key
+        Returns:
+            PlayfairKey
+        """
+        if isinstance(key, PlayfairKey):
+            return key
+        matrix = self._create_matrix(key)
+        return PlayfairKey(''.join(''.join(row) for row in matrix),
+                           self._pair_table(matrix).tobytes(),
+                           self._pair_table(matrix, decrypt=True).tobytes())
+    
+    def _split_doubles(self, letters, upper=None):
+        """
+        Vectorized digraph preparation: insert X between doubled letters and pad
         
-        return prepared, case_map, space_positions, original_length
+        Splitting the text after every doubled letter gives segments without
+        repeats; each odd-length segment gets one (lowercase) X appended.
+        """
+        if not len(letters):
+            return letters, upper
+        ends = np.append(np.flatnonzero(letters[:-1] == letters[1:]), len(letters) - 1)
+        starts = np.concatenate(([0], ends[:-1] + 1))
+        insert_at = ends[(ends - starts) % 2 == 0] + 1
+        if upper is not None:
+            upper = np.insert(upper, insert_at, False)
+        return np.insert(letters, insert_at, _X), upper
+    
+    def _lookup(self, letters, table):
+        """Map an even-length letter array through a digraph table"""
+        pairs = letters.reshape(-1, 2).astype(np.intp)
+        return np.frombuffer(table, dtype=np.uint8).reshape(-1, 2)[pairs[:, 0] * 26 + pairs[:, 1]].ravel()
+    
+    def encrypt_array(self, letters, key, final=True):
+        """
+        Encrypt a uint8 letter-index array (J becomes I, X is inserted)
+        Returns:
+            np.ndarray: uint8 letter indices, usually longer than the input
+        """
+        letters = np.where(letters == _J, _I, letters).astype(np.uint8)
+        letters, _ = self._split_doubles(letters)
+        return self._lookup(letters, self.compile_key(key).encrypt)
+    
+    def decrypt_array(self, letters, key, final=True):
+        """
+        Decrypt a uint8 letter-index array
+        Returns:
+            np.ndarray: uint8 letter indices; with final=True a trailing X is dropped
+        """
+        letters = np.where(letters == _J, _I, letters).astype(np.uint8)
+        n = len(letters)
+        # An unpaired trailing letter is ignored
+        result = self._lookup(letters[:n - n % 2], self.compile_key(key).decrypt)
+        if final and n % 2 == 0 and len(result) and result[-1] == _X:
+            result = result[:-1]
+        return result
+    
+    def _transform_buffer(self, buffer, key, decrypt):
+        """Playfair transform of a TextBuffer's letters, keeping its layout"""
+        upper = buffer.upper
+        if decrypt:
+            result = self.decrypt_array(buffer.letters, key)
+        else:
+            letters = np.where(buffer.letters == _J, _I, buffer.letters).astype(np.uint8)
+            letters, upper = self._split_doubles(letters, upper)
+            result = self._lookup(letters, key.encrypt)
+        # Padding removed on decrypt drops the matching case flags
+        return buffer.replace_letters(result, upper[:len(result)])
     
-    def _restore_spaces(self, text, space_positions):
-        """Restore spaces to their original positions"""
-        result = list(text)
-        for pos in sorted(space_positions, reverse=True):
-            if pos <= len(result):
-                result.insert(pos, ' ')
-        return ''.join(result)
+    def _run(self, text, key, decrypt):
+        """Transform str or TextBuffer input, returning the same type"""
+        key = self.compile_key(key)
+        if isinstance(text, str):
+            return self._transform_buffer(TextBuffer.from_text(text), key, decrypt).to_text()
+        return self._transform_buffer(text, key, decrypt)
     
     def encrypt(self, plaintext, key):
         """
         Encrypt plaintext using Playfair cipher
         Args:
-            plaintext (str): Text to encrypt
+            plaintext (str or TextBuffer): Text to encrypt
             key (str): Keyword for matrix generation
         Returns:
-            str: Encrypted ciphertext
+            str (or TextBuffer): Encrypted ciphertext; non-letters stay in place
         """
-        matrix = self._create_matrix(key)
-        prepared_text, case_map, space_positions, original_length = self._prepare_text(plaintext)
-        ciphertext = ''
-        
-        for i in range(0, len(prepared_text), 2):
-            char1, char2 = prepared_text[i], prepared_text[i + 1]
-            row1, col1 = self._find_position(matrix, char1)
-            row2, col2 = self._find_position(matrix, char2)
-            
-            if row1 == row2:  # Same row
-                enc1 = matrix[row1][(col1 + 1) % 5]
-                enc2 = matrix[row2][(col2 + 1) % 5]
-            elif col1 == col2:  # Same column
-                enc1 = matrix[(row1 + 1) % 5][col1]
-                enc2 = matrix[(row2 + 1) % 5][col2]
-            else:  # Rectangle
-                enc1 = matrix[row1][col2]
-                enc2 = matrix[row2][col1]
-            
-            # Apply case from original text
-            if i < len(case_map):
-                ciphertext += enc1 if case_map[i] else enc1.lower()
-            else:
-                ciphertext += enc1
-            
-            if i + 1 < len(case_map):
-                ciphertext += enc2 if case_map[i + 1] else enc2.lower()
-            else:
-                ciphertext += enc2
-        
-        # Restore spaces
-        ciphertext = self._restore_spaces(ciphertext, space_positions)
-        
-        return ciphertext
+        return self._run(plaintext, key, decrypt=False)
     
     def decrypt(self, ciphertext, key):
         """
         Decrypt ciphertext using Playfair cipher
         Args:
-            ciphertext (str): Text to decrypt
+            ciphertext (str or TextBuffer): Text to decrypt
             key (str): Keyword for matrix generation
         Returns:
-            str: Decrypted plaintext
+            str (or TextBuffer): Decrypted plaintext; non-letters stay in place
         """
-        matrix = self._create_matrix(key)
-        # Get only alphabetic characters and preserve case and spaces
-        case_map = []
-        cipher_clean = ''
-        space_positions = []
-        current_pos = 0
-        
-        for char in ciphertext:
-            if char == ' ':
-                space_positions.append(current_pos)
-            elif char.isalpha():
-                case_map.append(char.isupper())
-                cipher_clean += char.upper().replace('J', 'I')
-                current_pos += 1
-        
-        plaintext = ''
-        
-        for i in range(0, len(cipher_clean) - 1, 2):
-            char1, char2 = cipher_clean[i], cipher_clean[i + 1]
-            row1, col1 = self._find_position(matrix, char1)
-            row2, col2 = self._find_position(matrix, char2)
-            
-            if row1 is None or row2 is None:
-                continue
-            
-            if row1 == row2:  # Same row
-                dec1 = matrix[row1][(col1 - 1) % 5]
-                dec2 = matrix[row2][(col2 - 1) % 5]
-            elif col1 == col2:  # Same column
-                dec1 = matrix[(row1 - 1) % 5][col1]
-                dec2 = matrix[(row2 - 1) % 5][col2]
-            else:  # Rectangle
-                dec1 = matrix[row1][col2]
-                dec2 = matrix[row2][col1]
-            
-            # Apply original case
-            plaintext += dec1 if case_map[i] else dec1.lower()
-            if i + 1 < len(case_map):
-                plaintext += dec2 if case_map[i + 1] else dec2.lower()
-        
-        # Remove trailing padding X (but only if added as padding, not part of original text)
-        # Check the expected length vs actual
-        expected_length = len([c for c in ciphertext if c.isalpha()])
-        if len(plaintext) > 0 and plaintext[-1].upper() == 'X' and len(plaintext) == expected_length:
-            plaintext = plaintext[:-1]
-        
-        # Restore spaces
-        plaintext = self._restore_spaces(plaintext, space_positions)
-        
-        return plaintext
+        return self._run(ciphertext, key, decrypt=True)
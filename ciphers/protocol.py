@@ -0,0 +1,110 @@
+"""
+Cipher protocol shared by the bulk, streaming and parallel engines.
+
+Every cipher in this package implements:
+    name                  Registry name ('caesar', 'hill', ...)
+    block_size            Letters transformed together (1 or 2)
+    stateless             True if each block transforms independently, so a
+                          letter stream may be cut at any block boundary
+    supports_streaming    True if CipherStream can drive the cipher
+    compile_key(key)      Parse and validate a key once; returns a hashable
+                          compiled key accepted everywhere a key is
+    encrypt_array(letters, key, final=True)
+    decrypt_array(letters, key, final=True)
+                          Transform a uint8 letter-index array (A=0 ... Z=25).
+                          With final=False the length must be a multiple of
+                          block_size and is preserved; with final=True the
+                          cipher applies its end-of-message rule (e.g. Hill
+                          pads an odd letter with X and strips it again).
+    encrypt(text, key) / decrypt(text, key)
+                          str -> str or TextBuffer -> TextBuffer
+
+Engines only use these members, so they work with any registered cipher.
+"""
+
+from collections import namedtuple
+
+# Compiled monoalphabetic key: 26-entry letter index tables (bytes)
+TableKey = namedtuple('TableKey', ['encrypt', 'decrypt'])
+
+
+def table_key(table):
+    """
+    Build a TableKey from an encryption table
+    Args:
+        table: 26 letter indices, a permutation of 0-25
+    Returns:
+        TableKey: With the inverse permutation as decryption table
+    """
+    encrypt = bytes(table)
+    decrypt = bytearray(26)
+    for index, value in enumerate(encrypt):
+        decrypt[value] = index
+    return TableKey(encrypt, bytes(decrypt))
+
+
+def transform_buffer(cipher, buffer, key, decrypt=False, **options):
+    """
+    Transform a TextBuffer through a stateless cipher's array kernel.
+
+    Case flags follow the letters: letters added by the end-of-message rule
+    (padding) are lowercase, letters it removes lose their flags.
+    Args:
+        cipher: Cipher with stateless = True
+        buffer (TextBuffer): Input text
+        key: Compiled key
+        decrypt (bool): Use decrypt_array instead of encrypt_array
+        **options: Extra keyword arguments for the array kernel
+    Returns:
+        TextBuffer: Same layout as the input
+    """
+    import numpy as np
+
+    transform = cipher.decrypt_array if decrypt else cipher.encrypt_array
+    letters = transform(buffer.letters, key, **options)
+    count = len(buffer.letters)
+    if len(letters) == count:
+        return buffer.replace_letters(letters)
+
+    upper = buffer.upper[:len(letters)]
+    if len(letters) > count:
+        upper = np.append(upper, np.zeros(len(letters) - count, dtype=bool))
+    return buffer.replace_letters(letters, upper)
+
+
+def _define_cipher():
+    from typing import Protocol, runtime_checkable
+
+    @runtime_checkable
+    class Cipher(Protocol):
+        """Structural type of a cipher usable by the engines"""
+
+        name: str
+        block_size: int
+        stateless: bool
+        supports_streaming: bool
+
+        def compile_key(self, key):
+            ...
+
+        def encrypt_array(self, letters, key, final=True):
+            ...
+
+        def decrypt_array(self, letters, key, final=True):
+            ...
+
+        def encrypt(self, plaintext, key):
+            ...
+
+        def decrypt(self, ciphertext, key):
+            ...
+
+    return Cipher
+
+
+def __getattr__(name):
+    # typing is slow to import; build the Protocol class only when asked for
+    if name == 'Cipher':
+        globals()['Cipher'] = _define_cipher()
+        return globals()['Cipher']
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,77 @@
+"""
+Name -> cipher lookup for the CLI, GUI and engines.
+
+Cipher classes are imported on first use, so looking up one cipher
+does not load the modules (or NumPy kernels) of the others.
+
+Usage:
+    from ciphers.registry import get_cipher, register_cipher
+    hill = get_cipher('hill')            # also 'Hill (2×2)', 'HILL'
+    register_cipher('rot13', 'mypackage.rot13:Rot13Cipher')
+"""
+
+import importlib
+
+# Registry name -> 'module:Class' (relative modules resolve in this package)
+_targets = {
+    'caesar': '.caesar_cipher:CaesarCipher',
+    'affine': '.affine_cipher:AffineCipher',
+    'playfair': '.playfair_cipher:PlayfairCipher',
+    'hill': '.hill_cipher:HillCipher',
+}
+
+# Alternative spellings (lowercase) -> registry name
+_aliases = {
+    'hill (2×2)': 'hill',
+    'hill (2x2)': 'hill',
+}
+
+_instances = {}
+
+
+def _resolve(name):
+    """Registry name for a name or alias (case-insensitive)"""
+    key = str(name).strip().lower()
+    key = _aliases.get(key, key)
+    if key not in _targets:
+        raise ValueError(f"Unknown cipher: {name}")
+    return key
+
+
+def register_cipher(name, target, aliases=()):
+    """
+    Register a cipher under a name
+    Args:
+        name (str): Registry name
+        target: Cipher class, or 'module:Class' string imported on first use
+        aliases: Other names the cipher can be looked up by
+    """
+    key = name.lower()
+    _targets[key] = target
+    _instances.pop(key, None)
+    for alias in aliases:
+        _aliases[alias.lower()] = key
+
+
+def get_cipher(name):
+    """
+    Shared cipher instance for a name
+    Args:
+        name (str): Registry name or alias, e.g. 'hill' or 'Hill (2×2)'
+    Returns:
+        Cipher instance
+    """
+    key = _resolve(name)
+    if key not in _instances:
+        target = _targets[key]
+        if isinstance(target, str):
+            module_name, class_name = target.split(':')
+            module = importlib.import_module(module_name, __package__)
+            target = getattr(module, class_name)
+        _instances[key] = target()
+    return _instances[key]
+
+
+def cipher_names():
+    """Registered cipher names, in registration order"""
+    return list(_targets)
@@ -0,0 +1,296 @@
+"""
+Adaptive routing of cipher jobs to inline, thread or process execution.
+
+Each job is routed by its predicted run time and by what the cipher is:
+    - inline    jobs predicted to finish within inline_budget run on the
+                caller's thread (a hop to a pool would cost more)
+    - thread    medium jobs of stateless ciphers (Caesar, Affine, Hill)
+                go to a thread pool; their array kernels release the
+                GIL, so the caller stays responsive
+    - process   large jobs, expected to run process_factor times longer
+                than a process round trip costs, go to a process pool.
+                GIL-bound jobs (ciphers that are not stateless, such as
+                Playfair, and cracking) go there as soon as they outweigh
+                the round trip and otherwise run inline, since a thread
+                would gain them nothing
+Only registry ciphers are sent to processes (by name, so the worker
+builds its own instance); other cipher objects (e.g. a Cascade) stay on
+threads.
+
+Predictions come from statistics updated after every job: a linear
+cost model (fixed cost + cost per character) of each (cipher, operation),
+fitted by exponentially weighted least squares, and the overhead of each
+route (its wall time minus the compute time) as a moving average. The
+thresholds between routes therefore move with the machine, the cipher
+and the load instead of being fixed constants.
+
+Usage:
+    with AdaptiveScheduler() as scheduler:
+        future = scheduler.encrypt(text, 'hill', '3,3,2,5')
+        ciphertext = future.result()
+        scheduler.thresholds('hill', 'encrypt')   # -> (inline chars, process chars)
+        scheduler.stats()
+"""
+
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from .aio import _crack, _transform
+from .registry import get_cipher
+from .tuning import tuned
+
+ROUTES = ('inline', 'thread', 'process')
+
+# Seconds a job may run on the caller's thread
+INLINE_BUDGET = 0.002
+
+# A job goes to a process once it is predicted to run this many times
+# longer than a process round trip costs
+PROCESS_FACTOR = 4
+
+# Weight of the newest measurement in the moving averages
+SMOOTHING = 0.2
+
+# Starting estimates (calibrated ones if saved), replaced by measurements:
+# (fixed seconds, seconds per character) per operation, and seconds of
+# overhead per route
+_TRANSFORM_COST = (tuned('transform_fixed', 2e-5), tuned('transform_per_char', 2e-7))
+DEFAULT_COSTS = {'encrypt': _TRANSFORM_COST, 'decrypt': _TRANSFORM_COST, 'crack': (0.05, 0.0)}
+DEFAULT_OVERHEAD = {'inline': 0.0, 'thread': tuned('thread_overhead', 1e-4),
+                    'process': tuned('process_overhead', 5e-3)}
+
+RouteStats = namedtuple('RouteStats', ['jobs', 'mean_latency', 'overhead'])
+
+
+class CostModel:
+    """Run time = fixed + per_char * size, fitted by exponentially weighted least squares"""
+
+    def __init__(self, fixed, per_char, decay=1 - SMOOTHING):
+        self.decay = decay
+        self.prior_per_char = per_char
+        self._sums = [0.0] * 5  # weight, n, n^2, t, n*t
+        # Two pseudo-measurements of the prior, soon outweighed by real ones
+        for size in (1_000, 100_000):
+            self.add(size, fixed + per_char * size)
+
+    def add(self, size, seconds):
+        for i, value in enumerate((1.0, size, size * size, seconds, size * seconds)):
+            self._sums[i] = self.decay * self._sums[i] + value
+
+    def coefficients(self):
+        """(fixed seconds, seconds per character), fixed clipped at 0"""
+        w, n, nn, t, nt = self._sums
+        spread = w * nn - n * n
+        per_char = (w * nt - n * t) / spread if spread > 1e-9 * w * nn else 0.0
+        if per_char <= 0:
+            # All recent sizes alike, or noise sloping the wrong way: a zero
+            # slope would send every size down the same route, so keep the prior's
+            per_char = self.prior_per_char
+        return max((t - per_char * n) / w, 0.0), per_char
+
+    def predict(self, size):
+        fixed, per_char = self.coefficients()
+        return fixed + per_char * size
+
+
+def _capabilities(cipher):
+    """
+    How a cipher's jobs may be run
+    Returns:
+        tuple: (python_bound: not stateless, so its work holds the GIL;
+                registered: the registry returns this cipher's class by name)
+    """
+    python_bound = not getattr(cipher, 'stateless', False)
+    try:
+        registered = type(get_cipher(cipher.name)) is type(cipher)
+    except (AttributeError, ValueError):
+        registered = False
+    return python_bound, registered
+
+
+def _timed(function, *args):
+    """Run a job and measure its compute time where it runs"""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+class AdaptiveScheduler:
+    """Routes encrypt/decrypt/crack jobs by predicted cost, learning as it goes"""
+
+    def __init__(self, thread_workers=None, process_workers=None,
+                 inline_budget=INLINE_BUDGET, process_factor=PROCESS_FACTOR):
+        """
+        Args:
+            thread_workers (int): Thread pool size (default: ThreadPoolExecutor's)
+            process_workers (int): Process pool size (default: os.cpu_count(); 0 disables it)
+            inline_budget (float): Seconds a job may run on the caller's thread
+            process_factor (float): Predicted run time / process overhead needed
+                to send a job to a process
+        """
+        self.thread_workers = thread_workers
+        self.process_workers = (os.cpu_count() or 1) if process_workers is None else process_workers
+        self.inline_budget = inline_budget
+        self.process_factor = process_factor
+        self._threads = None
+        self._processes = None
+        self._costs = {}  # (cipher name, operation) -> CostModel
+        self._overhead = dict(DEFAULT_OVERHEAD)
+        self._jobs = dict.fromkeys(ROUTES, 0)
+        self._latency = dict.fromkeys(ROUTES, 0.0)
+        self._warm = set()  # (kind, route) pairs past their first, cold job
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Shut the pools down (after their queued jobs finish)"""
+        for pool in (self._threads, self._processes):
+            if pool is not None:
+                pool.shutdown()
+        self._threads = self._processes = None
+
+    def _pool(self, route):
+        with self._lock:
+            if route == 'thread':
+                if self._threads is None:
+                    self._threads = ThreadPoolExecutor(self.thread_workers)
+                return self._threads
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(self.process_workers)
+            return self._processes
+
+    def _model(self, kind):
+        model = self._costs.get(kind)
+        if model is None:
+            model = self._costs[kind] = CostModel(*DEFAULT_COSTS[kind[1]])
+        return model
+
+    def route(self, kind, size, python_bound=False, process_ok=True):
+        """
+        Pick a route for a job
+        Args:
+            kind (tuple): (cipher name, operation)
+            size (int): Characters to process (1 for per-job costs)
+            python_bound (bool): The job holds the GIL (pure-Python code)
+            process_ok (bool): The job can run in another process
+        Returns:
+            str: 'inline', 'thread' or 'process'
+        """
+        with self._lock:
+            predicted = self._model(kind).predict(size)
+        if predicted <= self.inline_budget:
+            return 'inline'
+        process_ok = process_ok and self.process_workers
+        # GIL-bound jobs gain from a process as soon as it pays for its round trip
+        factor = 1 if python_bound else self.process_factor
+        if process_ok and predicted >= factor * self._overhead['process']:
+            return 'process'
+        # A thread gains a GIL-bound job nothing, unless no process can take it
+        return 'inline' if python_bound and process_ok else 'thread'
+
+    def thresholds(self, cipher, operation='encrypt'):
+        """
+        Current crossover points for a cipher operation
+        Returns:
+            tuple: (largest inline size, smallest size sent to a process) in characters
+        """
+        with self._lock:
+            fixed, per_char = self._model((cipher, operation)).coefficients()
+        process_time = max(self.process_factor * self._overhead['process'], self.inline_budget)
+        if not per_char:
+            return (0 if fixed > self.inline_budget else -1), (0 if fixed >= process_time else -1)
+        return (max(int((self.inline_budget - fixed) / per_char), 0),
+                max(int((process_time - fixed) / per_char), 0))
+
+    def _record(self, route, kind, size, wall, compute):
+        with self._lock:
+            self._jobs[route] += 1
+            self._latency[route] += wall
+            if (kind, route) not in self._warm:
+                # The first job pays for imports, caches and pool start-up
+                self._warm.add((kind, route))
+                return
+            self._model(kind).add(size, compute)
+            if route != 'inline':
+                overhead = max(0.0, wall - compute)
+                self._overhead[route] += SMOOTHING * (overhead - self._overhead[route])
+
+    def submit(self, kind, size, function, *args, python_bound=False, process_ok=True):
+        """
+        Run function(*args) on the route chosen for it
+        Args:
+            kind (tuple): (cipher name, operation), the statistics bucket
+            size (int): Characters to process (1 for per-job costs)
+            function: Module-level (picklable) function
+            python_bound (bool): The job holds the GIL
+            process_ok (bool): function and args can be sent to a process
+        Returns:
+            concurrent.futures.Future: The job's result
+        """
+        route = self.route(kind, size, python_bound, process_ok)
+        result = Future()
+        start = time.perf_counter()
+        if route == 'inline':
+            try:
+                value, compute = _timed(function, *args)
+            except Exception as e:
+                result.set_exception(e)
+            else:
+                self._record(route, kind, size, time.perf_counter() - start, compute)
+                result.set_result(value)
+            return result
+
+        def done(job):
+            try:
+                value, compute = job.result()
+            except Exception as e:
+                result.set_exception(e)
+            else:
+                self._record(route, kind, size, time.perf_counter() - start, compute)
+                result.set_result(value)
+
+        self._pool(route).submit(_timed, function, *args).add_done_callback(done)
+        return result
+
+    def transform(self, text, cipher, key, decrypt=False):
+        """Encrypt or decrypt text on the route its size and cipher call for; returns a Future"""
+        if isinstance(cipher, str):
+            cipher = get_cipher(cipher)
+        operation = 'decrypt' if decrypt else 'encrypt'
+        python_bound, registered = _capabilities(cipher)
+        # Registry ciphers travel by name; the worker looks up its own instance
+        return self.submit((cipher.name, operation), len(text), _transform,
+                           cipher.name if registered else cipher, text, key, decrypt,
+                           python_bound=python_bound, process_ok=registered)
+
+    def encrypt(self, plaintext, cipher, key):
+        """Future of cipher.encrypt(plaintext, key)"""
+        return self.transform(plaintext, cipher, key, decrypt=False)
+
+    def decrypt(self, ciphertext, cipher, key):
+        """Future of cipher.decrypt(ciphertext, key)"""
+        return self.transform(ciphertext, cipher, key, decrypt=True)
+
+    def crack(self, plaintext, ciphertext):
+        """Future of a known-plaintext attack on a 2x2 Hill key (pure Python, GIL-bound)"""
+        return self.submit(('hill', 'crack'), 1, _crack, plaintext, ciphertext, python_bound=True)
+
+    def stats(self):
+        """
+        Jobs per route so far
+        Returns:
+            dict: Route -> RouteStats(jobs, mean_latency seconds, overhead seconds)
+        """
+        with self._lock:
+            return {route: RouteStats(self._jobs[route],
+                                      self._latency[route] / self._jobs[route] if self._jobs[route] else 0.0,
+                                      self._overhead[route])
+                    for route in ROUTES}
@@ -0,0 +1,97 @@
+"""
+Incremental encryption/decryption for streaming-capable ciphers.
+
+Text is fed in chunks of any size; the concatenated output of feed()
+and finish() equals one-shot encrypt()/decrypt() of the whole text.
+
+Usage:
+    stream = CipherStream(HillCipher(), "3,3,2,5")
+    for chunk in chunks:
+        out.write(stream.feed(chunk))
+    out.write(stream.finish())
+"""
+
+class CipherStream:
+    """
+    Incremental encoder/decoder driven by the cipher protocol.
+
+    Only the input from the first incomplete block on is carried between
+    chunks. When decrypting, the last complete block is carried too, since
+    the cipher's end-of-message rule (e.g. dropping Hill's padding X) may
+    still change it.
+
+    The carry is kept as a list of chunks and rescanned only once, when its
+    block completes, so a long run of letterless chunks costs linear time.
+    """
+
+    def __init__(self, cipher, key, decrypt=False):
+        if not cipher.supports_streaming:
+            raise ValueError(f"The {cipher.name} cipher does not support streaming")
+        self.cipher = cipher
+        self.key = cipher.compile_key(key)
+        self.decrypt = decrypt
+        self._carry = []   # Input chunks starting at the first unfinished block
+        self._held = 0     # Letters in the carry
+        self._finished = False
+
+    def feed(self, chunk):
+        """
+        Process the next chunk of text
+        Args:
+            chunk (str): Next piece of the input
+        Returns:
+            str: Output that is final so far (may be empty)
+        """
+        if self._finished:
+            raise ValueError("Stream already finished")
+
+        from .text_buffer import TextBuffer
+        found = TextBuffer.from_text(chunk)
+        count = self._held + found.letter_count
+        ready = count - count % self.cipher.block_size
+        if self.decrypt and ready == count and count:
+            ready -= self.cipher.block_size
+
+        if not ready:
+            if not count:
+                return chunk
+            if self._carry:
+                # Still waiting for the block to complete: hold without rescanning
+                self._carry.append(chunk)
+                self._held = count
+                return ''
+            split = found.text_offset(0)
+            self._carry, self._held = [chunk[split:]], count
+            return chunk[:split]
+
+        text = ''.join(self._carry) + chunk
+        buffer = TextBuffer.from_text(text)
+        self._held = count - ready
+        if ready == count:
+            self._carry = []
+            head = buffer
+        else:
+            split = buffer.text_offset(ready)
+            self._carry = [text[split:]]
+            head = buffer.head(ready)
+
+        transform = self.cipher.decrypt_array if self.decrypt else self.cipher.encrypt_array
+        return head.replace_letters(transform(head.letters, self.key, final=False)).to_text()
+
+    def finish(self):
+        """
+        Flush the stream, applying the cipher's end-of-message rule
+        Returns:
+            str: Remaining output
+        """
+        if self._finished:
+            return ''
+        self._finished = True
+
+        carry = ''.join(self._carry)
+        self._carry, self._held = [], 0
+        if not carry:
+            return ''
+        from .text_buffer import TextBuffer
+        transform = self.cipher.decrypt if self.decrypt else self.cipher.encrypt
+        return transform(TextBuffer.from_text(carry), self.key).to_text()
@@ -0,0 +1,189 @@
+"""
+Compact shared text representation for all ciphers.
+
+A TextBuffer splits a text once into:
+    - letters:        uint8 array of letter indices (A=0 ... Z=25)
+    - case_bits:      uppercase flags, bit-packed (1 bit per letter)
+    - layout map:     runs of non-letter characters, each recorded by the
+                      number of letters in front of it (run-length encoded)
+
+Ciphers transform only the letter array and reuse the case bits and
+layout of their input, so a buffer can go encrypt -> decrypt without
+the text ever being re-scanned.
+
+Usage:
+    buffer = TextBuffer.from_text("Hello, World!")
+    buffer.letters            # -> [7 4 11 11 14 22 14 17 11 3]
+    buffer.to_text()          # -> "Hello, World!"
+"""
+
+import numpy as np
+
+# ASCII codes of 'a'..'z' by letter index
+_LOWERCASE_CODES = np.arange(97, 123, dtype=np.uint8)
+
+
+def _codes(text):
+    """Code points of text as the smallest unsigned array that fits"""
+    if text.isascii():
+        return np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+
+
+class TextBuffer:
+    """Letter indices + packed case bits + run-length layout of a text"""
+
+    __slots__ = ('letters', 'case_bits', 'gap_positions', 'gap_offsets', 'gap_text')
+
+    def __init__(self, letters, case_bits, gap_positions, gap_offsets, gap_text):
+        self.letters = letters              # uint8 (n,), values 0-25
+        self.case_bits = case_bits          # uint8 (ceil(n/8),), little bit order
+        self.gap_positions = gap_positions  # int (runs,), letters before each run
+        self.gap_offsets = gap_offsets      # int (runs+1,), run bounds in gap_text
+        self.gap_text = gap_text            # str, all non-letters concatenated
+
+    @classmethod
+    def from_text(cls, text):
+        """
+        Convert text in a single vectorized pass
+        Args:
+            text (str): Any text; only ASCII A-Z/a-z count as letters
+        Returns:
+            TextBuffer
+        """
+        codes = _codes(text)
+        is_letter = ((codes >= 65) & (codes <= 90)) | ((codes >= 97) & (codes <= 122))
+
+        letter_codes = codes[is_letter]
+        letters = ((letter_codes | 0x20) - 97).astype(np.uint8)
+        case_bits = np.packbits(letter_codes < 97, bitorder='little')
+
+        # Runs of non-letters: consecutive text indices belong to one run
+        index_dtype = np.int32 if len(codes) < 2 ** 31 else np.int64
+        gap_indices = np.flatnonzero(~is_letter)
+        run_start = np.ones(len(gap_indices), dtype=bool)
+        run_start[1:] = np.diff(gap_indices) != 1
+        # Non-letters in front of each run, and letters in front = text index minus that
+        gap_offsets = np.flatnonzero(run_start)
+        letters_before = (gap_indices[gap_offsets] - gap_offsets).astype(index_dtype)
+        gap_offsets = np.append(gap_offsets, len(gap_indices)).astype(index_dtype)
+
+        gap_codes = codes[gap_indices].tobytes()
+        gap_text = gap_codes.decode('ascii' if codes.dtype == np.uint8 else 'utf-32-le')
+        return cls(letters, case_bits, letters_before, gap_offsets, gap_text)
+
+    @classmethod
+    def from_letters(cls, letters, upper=None):
+        """Buffer holding only letters (no layout), all uppercase by default"""
+        letters = np.asarray(letters, dtype=np.uint8)
+        if upper is None:
+            upper = np.ones(len(letters), dtype=bool)
+        return cls(letters, np.packbits(upper, bitorder='little'),
+                   np.zeros(0, dtype=np.int32), np.zeros(1, dtype=np.int32), '')
+
+    @property
+    def upper(self):
+        """Uppercase flag of every letter as a bool array"""
+        return np.unpackbits(self.case_bits, count=len(self.letters),
+                             bitorder='little').astype(bool)
+
+    @property
+    def letter_count(self):
+        return len(self.letters)
+
+    @property
+    def nbytes(self):
+        """Memory held by the buffer's arrays and layout text"""
+        return (self.letters.nbytes + self.case_bits.nbytes + self.gap_positions.nbytes
+                + self.gap_offsets.nbytes + len(self.gap_text.encode('utf-8')))
+
+    def __len__(self):
+        """Number of characters in the represented text"""
+        return len(self.letters) + len(self.gap_text)
+
+    def text_offset(self, k):
+        """
+        Index in the text of letter k (k == letter_count: end of the last
+        letter's trailing runs, i.e. len(text) when no runs dangle)
+        """
+        runs = np.searchsorted(self.gap_positions, k, side='right')
+        return int(k + self.gap_offsets[runs])
+
+    def head(self, k):
+        """
+        Buffer of the first k letters and every run in front of letter k
+        Returns:
+            TextBuffer: Represents text[:self.text_offset(k)]
+        """
+        runs = int(np.searchsorted(self.gap_positions, k, side='right'))
+        return TextBuffer(self.letters[:k], np.packbits(self.upper[:k], bitorder='little'),
+                          self.gap_positions[:runs], self.gap_offsets[:runs + 1],
+                          self.gap_text[:self.gap_offsets[runs]])
+
+    def replace_letters(self, letters, upper=None):
+        """
+        New buffer with other letters and the same layout
+        Args:
+            letters: uint8 letter indices (length may differ from this buffer)
+            upper: bool case flags; defaults to this buffer's case bits
+        Returns:
+            TextBuffer
+        """
+        letters = np.asarray(letters, dtype=np.uint8)
+        if upper is None:
+            if len(letters) != len(self.letters):
+                raise ValueError("Case flags are required when the letter count changes")
+            case_bits = self.case_bits
+        else:
+            case_bits = np.packbits(np.asarray(upper, dtype=bool), bitorder='little')
+        return TextBuffer(letters, case_bits, self.gap_positions, self.gap_offsets, self.gap_text)
+
+    def map_letters(self, table):
+        """
+        New buffer with every letter replaced through a 26-entry lookup table
+        Args:
+            table: Sequence/bytes where table[i] is the new index of letter i
+        Returns:
+            TextBuffer
+        """
+        lookup = np.frombuffer(bytes(table), dtype=np.uint8)
+        return self.replace_letters(lookup[self.letters])
+
+    def to_text(self):
+        """
+        Rebuild the text: letters with their case, non-letters in place
+
+        Layout restoration is a single forward pass into a preallocated
+        array sized letters + non-letters: non-letter j of run k goes to
+        slot j + (letters before run k) and letters fill the remaining
+        slots in order. Runs recorded past the last letter (e.g. after
+        padding was removed) are appended at the end.
+        Returns:
+            str
+        """
+        n = len(self.letters)
+        # Clearing bit 0x20 turns a lowercase ASCII letter into uppercase
+        upper_bits = np.unpackbits(self.case_bits, count=n, bitorder='little')
+        chars = _LOWERCASE_CODES[self.letters] ^ (upper_bits << 5)
+        if not self.gap_text:
+            return chars.tobytes().decode('ascii')
+
+        gap_codes = _codes(self.gap_text)
+        run_lengths = np.diff(self.gap_offsets)
+        positions = np.minimum(self.gap_positions, n)
+
+        # Non-letter j of run k lands at j + (letters before run k)
+        gap_slots = np.arange(len(gap_codes), dtype=np.int64) + np.repeat(positions, run_lengths)
+        result = np.empty(n + len(gap_codes), dtype=gap_codes.dtype)
+        is_letter = np.ones(len(result), dtype=bool)
+        is_letter[gap_slots] = False
+        result[gap_slots] = gap_codes
+        result[is_letter] = chars
+
+        if result.dtype == np.uint8:
+            return result.tobytes().decode('ascii')
+        return result.tobytes().decode('utf-32-le')
+
+    def __repr__(self):
+        return (f"TextBuffer(letters={len(self.letters)}, runs={len(self.gap_positions)}, "
+                f"chars={len(self)})")
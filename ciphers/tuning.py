@@ -0,0 +1,118 @@
+"""
+Machine-specific engine parameters.
+
+`python main.py calibrate` (see ciphers.calibrate) benchmarks the engines
+on the current machine and saves the best values to a JSON file:
+    $CIPHER_TUNING                          if set (empty: use no file)
+    $XDG_CONFIG_HOME/cipher-tool/tuning.json
+    ~/.config/cipher-tool/tuning.json       otherwise
+
+Engine modules read their constants through tuned() when they are
+imported, so the saved values replace the built-in defaults for every
+later process. Missing, unreadable or ill-typed entries fall back to the
+defaults.
+"""
+
+import os
+
+# Environment variable overriding the config file path
+TUNING_ENV = 'CIPHER_TUNING'
+
+# Application directory under the user's config and cache directories
+# (the Hill key table cache uses it too, see ciphers.hill_keys)
+APP_DIR = 'cipher-tool'
+
+_loaded = None
+
+
+def tuning_path():
+    """
+    Location of the tuning file
+    Returns:
+        str: Path, or None if tuning is disabled
+    """
+    path = os.environ.get(TUNING_ENV)
+    if path is not None:
+        return path or None
+    base = os.environ.get('XDG_CONFIG_HOME') or os.path.join(os.path.expanduser('~'), '.config')
+    return os.path.join(base, APP_DIR, 'tuning.json')
+
+
+def load_tuning():
+    """
+    Saved parameters (read once per process)
+    Returns:
+        dict: Parameter name -> value (empty without a tuning file)
+    """
+    global _loaded
+    if _loaded is None:
+        _loaded = {}
+        path = tuning_path()
+        if path and os.path.exists(path):
+            import json
+            try:
+                with open(path, encoding='utf-8') as f:
+                    values = json.load(f)
+            except (OSError, ValueError):
+                values = None
+            if isinstance(values, dict):
+                _loaded = values
+    return _loaded
+
+
+def tuned(name, default):
+    """
+    A calibrated parameter, or its default
+    Args:
+        name (str): Parameter name
+        default: Built-in value (None for "no fixed value")
+    Returns:
+        The saved value if it is a positive number of the default's type
+        (an int for None defaults), else default
+    """
+    value = load_tuning().get(name)
+    kind = int if default is None else type(default)
+    if kind is float and type(value) is int:
+        value = float(value)
+    if type(value) is not kind or not value > 0:
+        return default
+    return value
+
+
+def save_tuning(values, path=None):
+    """
+    Write parameters to the tuning file (atomically)
+    Args:
+        values (dict): Parameter name -> value
+        path: Target file (default: tuning_path())
+    Returns:
+        str: Path written
+    Raises:
+        ValueError: If tuning is disabled and no path is given
+    """
+    import json
+    import tempfile
+    path = path or tuning_path()
+    if not path:
+        raise ValueError(f"Tuning is disabled (${TUNING_ENV} is empty); pass a path")
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    # A unique temp file in the same directory, so concurrent saves never
+    # share it and os.replace stays on one filesystem
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory,
+                                     prefix='.tuning-', suffix='.tmp',
+                                     delete=False) as f:
+        temp = f.name
+        try:
+            json.dump(values, f, indent=2, sort_keys=True)
+            f.write('\n')
+        except BaseException:
+            f.close()
+            os.unlink(temp)
+            raise
+    try:
+        os.replace(temp, path)
+    except OSError:
+        os.unlink(temp)
+        raise
+    return path
@@ -13,7 +13,13 @@ Mathematical Background:
 
 Attack Strategy:
     1. Algebraic Attack: Find invertible plaintext matrix, compute K = C × P⁻¹
-    2. Brute Force Fallback: Search all valid 2x2 keys (~157,248 candidates)
+    2. Brute Force Fallback: Search each key row over its 676 candidates
+       (C = K × P splits row by row), then check the determinant of the
+       surviving row combinations
+    3. Exhaustive Mode (-x): Test every invertible key, slab by slab, with
+       one vectorized multiply-mod-compare per known digraph
+    The attack itself lives in ciphers.crack; this script is its command
+    line and interactive front end.
 
 Usage:
     Command Line:
@@ -31,350 +37,12 @@ Author: Cipher Tool Team
 License: MIT
 """
 
-import numpy as np
-import argparse
-from math import gcd
-
-
-class HillCipherCracker:
-    """
-    Robust 2x2 Hill Cipher Cracker using Known Plaintext Attack.
-    
-    Works with ANY valid plaintext-ciphertext pair by combining:
-    1. Fast algebraic approach (when plaintext matrix is invertible)
-    2. Optimized brute force (when algebraic approach fails)
-    """
-    
-    ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
-    MOD = 26
-    # Determinants coprime with 26 (have modular inverse)
-    VALID_DETS = frozenset({1, 3, 5, 7, 9, 11, 15, 17, 19, 21, 23, 25})
-    
-    def __init__(self):
-        # Precompute modular inverses for efficiency
-        self._mod_inverses = {d: self._compute_mod_inverse(d) for d in self.VALID_DETS}
-    
-    @staticmethod
-    def _compute_mod_inverse(a, m=26):
-        """Compute modular multiplicative inverse using extended Euclidean algorithm"""
-        if gcd(a, m) != 1:
-            return None
-        # Extended Euclidean Algorithm
-        m0, x0, x1 = m, 0, 1
-        while a > 1:
-            q = a // m
-            m, a = a % m, m
-            x0, x1 = x1 - q * x0, x0
-        return x1 % m0
-    
-    def _char_to_num(self, char):
-        """Convert character to number (A=0, B=1, ..., Z=25)"""
-        return ord(char.upper()) - ord('A')
-    
-    def _num_to_char(self, num):
-        """Convert number to character"""
-        return chr((num % self.MOD) + ord('A'))
-    
-    def _clean_text(self, text):
-        """Remove non-alphabetic characters and convert to uppercase"""
-        return ''.join(c.upper() for c in text if c.isalpha())
-    
-    def _pad_text(self, text):
-        """Pad text with 'X' to make length even (for 2x2 block size)"""
-        if len(text) % 2 != 0:
-            text += 'X'
-        return text
-    
-    def _text_to_digraphs(self, text):
-        """Convert text to list of digraph tuples [(a,b), (c,d), ...]"""
-        text = self._pad_text(self._clean_text(text))
-        return [(self._char_to_num(text[i]), self._char_to_num(text[i+1])) 
-                for i in range(0, len(text), 2)]
-    
-    def _det_2x2(self, a, b, c, d):
-        """Calculate determinant of 2x2 matrix [[a,b],[c,d]] mod 26"""
-        return (a * d - b * c) % self.MOD
-    
-    def _matrix_mod_inverse_2x2(self, matrix):
-        """
-        Calculate modular inverse of 2x2 matrix mod 26.
-        
-        For matrix [[a,b],[c,d]]:
-        - det = ad - bc
-        - inverse = det⁻¹ × [[d, -b], [-c, a]] (mod 26)
-        
-        Returns None if matrix is not invertible.
-        """
-        a, b = int(matrix[0][0]), int(matrix[0][1])
-        c, d = int(matrix[1][0]), int(matrix[1][1])
-        
-        det = self._det_2x2(a, b, c, d)
-        
-        if det not in self.VALID_DETS:
-            return None
-        
-        det_inv = self._mod_inverses[det]
-        
-        # Adjugate matrix: [[d, -b], [-c, a]]
-        inv = np.array([
-            [(det_inv * d) % self.MOD, (det_inv * (-b)) % self.MOD],
-            [(det_inv * (-c)) % self.MOD, (det_inv * a) % self.MOD]
-        ], dtype=int)
-        
-        return inv
-    
-    def _encrypt_digraph(self, digraph, key):
-        """Encrypt a single digraph (p1, p2) with key matrix"""
-        p = np.array(digraph)
-        c = np.dot(key, p) % self.MOD
-        return (int(c[0]), int(c[1]))
-    
-    def _verify_key(self, pt_digraphs, ct_digraphs, key):
-        """Verify that key encrypts all plaintext digraphs to ciphertext digraphs"""
-        for pt, ct in zip(pt_digraphs, ct_digraphs):
-            if self._encrypt_digraph(pt, key) != ct:
-                return False
-        return True
-    
-    def _crack_algebraic(self, pt_digraphs, ct_digraphs):
-        """
-        Algebraic attack: Find key using K = C × P⁻¹ (mod 26)
-        
-        We need to find 2 plaintext digraphs that form an invertible 2x2 matrix.
-        The matrix P has digraphs as columns: P = [[p1, p3], [p2, p4]]
-        """
-        from itertools import combinations
-        
-        n = len(pt_digraphs)
-        
-        # Try all pairs of digraphs to form invertible matrix
-        for i, j in combinations(range(n), 2):
-            # Build plaintext matrix P (columns are digraphs)
-            p1, p2 = pt_digraphs[i]
-            p3, p4 = pt_digraphs[j]
-            P = np.array([[p1, p3], [p2, p4]], dtype=int)
-            
-            # Check if P is invertible
-            det = self._det_2x2(p1, p3, p2, p4)
-            if det not in self.VALID_DETS:
-                continue
-            
-            # P is invertible, compute P⁻¹
-            P_inv = self._matrix_mod_inverse_2x2(P)
-            if P_inv is None:
-                continue
-            
-            # Build ciphertext matrix C (columns are digraphs)
-            c1, c2 = ct_digraphs[i]
-            c3, c4 = ct_digraphs[j]
-            C = np.array([[c1, c3], [c2, c4]], dtype=int)
-            
-            # Compute K = C × P⁻¹ (mod 26)
-            K = np.dot(C, P_inv) % self.MOD
-            K = K.astype(int)
-            
-            # Verify key works on ALL digraphs
-            if self._verify_key(pt_digraphs, ct_digraphs, K):
-                return K
-        
-        return None
-    
-    def _crack_bruteforce(self, pt_digraphs, ct_digraphs):
-        """
-        Brute force attack: Search all valid 2x2 key matrices.
-        
-        Optimization: Only test keys with valid determinants (coprime with 26).
-        This reduces search from 26⁴ = 456,976 to ~157,248 candidates.
-        
-        Further optimization: Test against first digraph pair to eliminate
-        candidates early before verifying against all pairs.
-        """
-        pt_first = pt_digraphs[0]
-        ct_first = ct_digraphs[0]
-        
-        for a in range(self.MOD):
-            for b in range(self.MOD):
-                # Early check: first row of K must produce correct first ciphertext char
-                c1_expected = ct_first[0]
-                c1_computed = (a * pt_first[0] + b * pt_first[1]) % self.MOD
-                if c1_computed != c1_expected:
-                    continue
-                
-                for c in range(self.MOD):
-                    for d in range(self.MOD):
-                        # Check determinant validity
-                        det = (a * d - b * c) % self.MOD
-                        if det not in self.VALID_DETS:
-                            continue
-                        
-                        # Early check: second row must produce correct second ciphertext char
-                        c2_expected = ct_first[1]
-                        c2_computed = (c * pt_first[0] + d * pt_first[1]) % self.MOD
-                        if c2_computed != c2_expected:
-                            continue
-                        
-                        # Full verification
-                        K = np.array([[a, b], [c, d]], dtype=int)
-                        if self._verify_key(pt_digraphs, ct_digraphs, K):
-                            return K
-        
-        return None
-    
-    def crack_key(self, plaintext, ciphertext):
-        """
-        Crack 2x2 Hill Cipher key using known plaintext attack.
-        
-        Args:
-            plaintext: Known plaintext string
-            ciphertext: Corresponding ciphertext string
-        
-        Returns:
-            2x2 numpy array containing the key matrix, or None if not found
-        
-        Strategy:
-            1. Try algebraic approach first (fast, O(n²) where n = number of digraphs)
-            2. Fall back to optimized brute force if algebraic fails
-        
-        Note: With only 1 digraph (2 chars), multiple keys may produce the same
-        ciphertext. Use at least 4 characters (2 digraphs) for unique key recovery.
-        """
-        # Prepare digraphs
-        pt_digraphs = self._text_to_digraphs(plaintext)
-        ct_digraphs = self._text_to_digraphs(ciphertext)
-        
-        # Validate input
-        if len(pt_digraphs) < 1:
-            print("Error: Need at least 2 characters (1 digraph)")
-            return None
-        
-        if len(pt_digraphs) != len(ct_digraphs):
-            print(f"Error: Plaintext ({len(pt_digraphs)} digraphs) and ciphertext ({len(ct_digraphs)} digraphs) must have same length")
-            return None
-        
-        # Warn about uniqueness with insufficient data
-        if len(pt_digraphs) < 2:
-            print("Warning: Only 1 digraph provided. Multiple keys may match.")
-            print("         Use 4+ characters for guaranteed unique key recovery.")
-        
-        # Method 1: Algebraic attack (requires invertible plaintext matrix)
-        key = self._crack_algebraic(pt_digraphs, ct_digraphs)
-        if key is not None:
-            return key
-        
-        # Method 2: Optimized brute force
-        print("Algebraic approach failed (no invertible plaintext matrix). Using brute force...")
-        return self._crack_bruteforce(pt_digraphs, ct_digraphs)
-    
-    def encrypt(self, plaintext, key):
-        """Encrypt plaintext using key matrix"""
-        digraphs = self._text_to_digraphs(plaintext)
-        result = ''
-        for dg in digraphs:
-            enc = self._encrypt_digraph(dg, key)
-            result += self._num_to_char(enc[0]) + self._num_to_char(enc[1])
-        return result
-    
-    def decrypt(self, ciphertext, key, original_plaintext_length=None):
-        """Decrypt ciphertext using key matrix, preserving original case and spacing.
-        
-        Args:
-            ciphertext: The ciphertext to decrypt
-            key: The key matrix
-            original_plaintext_length: If provided, strips padding 'X' if it was added
-        """
-        key_inv = self._matrix_mod_inverse_2x2(key)
-        if key_inv is None:
-            print("Error: Key is not invertible")
-            return None
-        
-        digraphs = self._text_to_digraphs(ciphertext)
-        decrypted_letters = ''
-        for dg in digraphs:
-            dec = self._encrypt_digraph(dg, key_inv)
-            decrypted_letters += self._num_to_char(dec[0]) + self._num_to_char(dec[1])
-        
-        # Restore original case and spacing from ciphertext
-        result = ''
-        letter_idx = 0
-        for char in ciphertext:
-            if char.isalpha():
-                if letter_idx < len(decrypted_letters):
-                    dec_char = decrypted_letters[letter_idx]
-                    # Preserve original case
-                    result += dec_char.lower() if char.islower() else dec_char.upper()
-                    letter_idx += 1
-            else:
-                # Preserve non-alphabetic characters (spaces, punctuation)
-                result += char
-        
-        # Strip padding X if original plaintext length is known and was odd
-        if original_plaintext_length is not None:
-            # Count letters in result
-            result_letters = sum(1 for c in result if c.isalpha())
-            if result_letters > original_plaintext_length and result.rstrip()[-1].upper() == 'X':
-                # Remove the last character (padding X)
-                # Find and remove the last letter
-                result_list = list(result)
-                for i in range(len(result_list) - 1, -1, -1):
-                    if result_list[i].isalpha():
-                        result_list.pop(i)
-                        break
-                result = ''.join(result_list)
-        
-        return result
-    
-    def format_key(self, key):
-        """Format key matrix for display"""
-        if key is None:
-            return "No key found"
-        
-        det = self._det_2x2(key[0][0], key[0][1], key[1][0], key[1][1])
-        
-        result = f"\n{'='*50}\n"
-        result += "CRACKED KEY MATRIX (2x2):\n"
-        result += f"{'='*50}\n"
-        result += f"┌{'─'*15}┐\n"
-        result += f"│ {int(key[0][0]):5d}  {int(key[0][1]):5d} │\n"
-        result += f"│ {int(key[1][0]):5d}  {int(key[1][1]):5d} │\n"
-        result += f"└{'─'*15}┘\n"
-        result += f"Determinant (mod 26): {det}\n"
-        result += f"Key as flat array: [{','.join(str(int(x)) for x in key.flatten())}]\n"
-        result += f"{'='*50}\n"
-        
-        return result
-    
-    def analyze_plaintext(self, plaintext):
-        """Analyze plaintext to check if algebraic attack is possible"""
-        digraphs = self._text_to_digraphs(plaintext)
-        n = len(digraphs)
-        
-        print(f"\nPlaintext Analysis: '{plaintext}'")
-        print(f"Cleaned & padded: '{self._pad_text(self._clean_text(plaintext))}'")
-        print(f"Digraphs: {digraphs}")
-        print(f"\nPossible matrix pairs and their determinants:")
-        
-        from itertools import combinations
-        invertible_count = 0
-        
-        for i, j in combinations(range(n), 2):
-            p1, p2 = digraphs[i]
-            p3, p4 = digraphs[j]
-            det = self._det_2x2(p1, p3, p2, p4)
-            invertible = det in self.VALID_DETS
-            if invertible:
-                invertible_count += 1
-            status = "✓ INVERTIBLE" if invertible else "✗ not invertible"
-            print(f"  Digraphs ({i},{j}): det = {det:2d} -> {status}")
-        
-        print(f"\nResult: {invertible_count} invertible pairs found")
-        if invertible_count > 0:
-            print("Algebraic attack WILL work.")
-        else:
-            print("Algebraic attack will fail. Brute force required.")
+from ciphers.crack import HillCipherCracker
 
 
 def interactive_mode():
     """Run cracker in interactive mode"""
+    import numpy as np
     cracker = HillCipherCracker()
     
     print("\n" + "="*60)
@@ -460,6 +128,7 @@ def interactive_mode():
 
 
 def main():
+    import argparse
     parser = argparse.ArgumentParser(
         description='Hill Cipher Known Plaintext Attack Cracker (2x2 Matrix)',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -468,6 +137,7 @@ Examples:
   %(prog)s -p "HELP" -c "HIAT"           # Crack key from pair
   %(prog)s -p "fahim" -c "pktcbj"        # Works with any case
   %(prog)s -p "mishu" -c "imxtzz"        # Uses brute force if needed
+  %(prog)s -p "HELP" -c "HIAT" -x        # Search the whole keyspace
   %(prog)s -p "HELLO" -c "TFJJC" -d "WORLD"  # Crack and decrypt more
   %(prog)s -a "mishu"                    # Analyze plaintext invertibility
   %(prog)s -i                            # Interactive mode
@@ -489,6 +159,8 @@ Mathematical Background:
                         help='Analyze plaintext for invertibility')
     parser.add_argument('-i', '--interactive', action='store_true',
                         help='Run in interactive mode')
+    parser.add_argument('-x', '--exhaustive', action='store_true',
+                        help='Test every invertible key (vectorized) instead of the algebraic attack')
     
     args = parser.parse_args()
     
@@ -514,7 +186,8 @@ Mathematical Background:
     print(f"Ciphertext: {args.ciphertext}")
     
     # Crack the key
-    key = cracker.crack_key(args.plaintext, args.ciphertext)
+    key = cracker.crack_key(args.plaintext, args.ciphertext,
+                            method='exhaustive' if args.exhaustive else 'auto')
     
     if key is not None:
         print(cracker.format_key(key))
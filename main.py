@@ -6,13 +6,36 @@ A user-friendly tool for encryption and decryption using classical ciphers:
 - Affine Cipher
 - Playfair Cipher
 - Hill Cipher (2x2 matrix)
+
+Run without arguments for the interactive menu, or transform whole files:
+    python main.py encrypt hill 3,3,2,5 plain.txt secret.txt
+    python main.py decrypt caesar 3 secret.txt plain.txt
+    python main.py encrypt caesar 3 corpus.txt.xz secret.txt.gz
+    python main.py encrypt hill 3,3,2,5 accented.txt secret.txt --fold-accents
+    python main.py encrypt hill 3,3,2,5 archive.txt secret.txt --index
+    python main.py encrypt hill 3,3,2,5 archive.txt secret.txt --verify 1%
+    python main.py decrypt-range hill 3,3,2,5 secret.txt 1048576 1052672
+    python main.py pack hill 3,3,2,5 archive.txt archive.cph --workers 4
+    python main.py unpack 3,3,2,5 archive.cph archive.txt --workers 4
+    python main.py encrypt-log hill 3,3,2,5 app.log app.log.enc
+    python main.py calibrate
 """
 
+import os
+import sys
 import readline  # Enable arrow keys and command history
-from ciphers.caesar_cipher import CaesarCipher
-from ciphers.affine_cipher import AffineCipher
-from ciphers.playfair_cipher import PlayfairCipher
-from ciphers.hill_cipher import HillCipher
+from ciphers.registry import get_cipher, cipher_names
+
+_result_cache = None
+
+
+def result_cache():
+    """Results of this session, so repeating an operation is instant"""
+    global _result_cache
+    if _result_cache is None:
+        from ciphers.cache import ResultCache
+        _result_cache = ResultCache()
+    return _result_cache
 
 
 def print_banner():
@@ -55,7 +78,7 @@ def get_input(prompt, input_type=str):
 
 def caesar_cipher_interface():
     """Interface for Caesar Cipher"""
-    cipher = CaesarCipher()
+    cipher = get_cipher('caesar')
     
     print("\n" + "─" * 60)
     print("CAESAR CIPHER - Simple Shift Cipher")
@@ -75,7 +98,7 @@ def caesar_cipher_interface():
             plaintext = get_input("\nEnter plaintext: ")
             key = get_input("Enter shift value (0-25): ")
             try:
-                result = cipher.encrypt(plaintext, key)
+                result = result_cache().encrypt(cipher, plaintext, key)
                 print(f"\n" + "═" * 60)
                 print("[ENCRYPTION RESULT]")
                 print("═" * 60)
@@ -90,7 +113,7 @@ def caesar_cipher_interface():
             ciphertext = get_input("\nEnter ciphertext: ")
             key = get_input("Enter shift value (0-25): ")
             try:
-                result = cipher.decrypt(ciphertext, key)
+                result = result_cache().decrypt(cipher, ciphertext, key)
                 print(f"\n" + "═" * 60)
                 print("[DECRYPTION RESULT]")
                 print("═" * 60)
@@ -107,7 +130,7 @@ def caesar_cipher_interface():
 
 def affine_cipher_interface():
     """Interface for Affine Cipher"""
-    cipher = AffineCipher()
+    cipher = get_cipher('affine')
     
     print("\n" + "─" * 60)
     print("AFFINE CIPHER - E(x) = (ax + b) mod 26")
@@ -131,7 +154,7 @@ def affine_cipher_interface():
             plaintext = get_input("\nEnter plaintext: ")
             key = get_input("Enter key (format: a,b): ")
             try:
-                result = cipher.encrypt(plaintext, key)
+                result = result_cache().encrypt(cipher, plaintext, key)
                 print(f"\n" + "═" * 60)
                 print("[ENCRYPTION RESULT]")
                 print("═" * 60)
@@ -146,7 +169,7 @@ def affine_cipher_interface():
             ciphertext = get_input("\nEnter ciphertext: ")
             key = get_input("Enter key (format: a,b): ")
             try:
-                result = cipher.decrypt(ciphertext, key)
+                result = result_cache().decrypt(cipher, ciphertext, key)
                 print(f"\n" + "═" * 60)
                 print("[DECRYPTION RESULT]")
                 print("═" * 60)
@@ -163,7 +186,7 @@ def affine_cipher_interface():
 
 def playfair_cipher_interface():
     """Interface for Playfair Cipher"""
-    cipher = PlayfairCipher()
+    cipher = get_cipher('playfair')
     
     print("\n" + "─" * 60)
     print("PLAYFAIR CIPHER - 5x5 Key Matrix Cipher")
@@ -185,7 +208,7 @@ def playfair_cipher_interface():
             plaintext = get_input("\nEnter plaintext: ")
             key = get_input("Enter key (keyword): ")
             try:
-                result = cipher.encrypt(plaintext, key)
+                result = result_cache().encrypt(cipher, plaintext, key)
                 print(f"\n" + "═" * 60)
                 print("[ENCRYPTION RESULT]")
                 print("═" * 60)
@@ -200,7 +223,7 @@ def playfair_cipher_interface():
             ciphertext = get_input("\nEnter ciphertext: ")
             key = get_input("Enter key (keyword): ")
             try:
-                result = cipher.decrypt(ciphertext, key)
+                result = result_cache().decrypt(cipher, ciphertext, key)
                 print(f"\n" + "═" * 60)
                 print("[DECRYPTION RESULT]")
                 print("═" * 60)
@@ -278,7 +301,7 @@ def validate_and_display_matrix(key_str):
 
 def hill_cipher_interface():
     """Interface for Hill Cipher (2x2 matrix)"""
-    cipher = HillCipher()
+    cipher = get_cipher('hill')
     
     display_hill_help()
     
@@ -306,7 +329,7 @@ def hill_cipher_interface():
                 print("Please enter a valid key matrix.\n")
             
             try:
-                result = cipher.encrypt(plaintext, key)
+                result = result_cache().encrypt(cipher, plaintext, key)
                 print(f"\n" + "═" * 60)
                 print("[ENCRYPTION RESULT]")
                 print("═" * 60)
@@ -334,7 +357,7 @@ def hill_cipher_interface():
                 print("Please enter a valid key matrix.\n")
             
             try:
-                result = cipher.decrypt(ciphertext, key)
+                result = result_cache().decrypt(cipher, ciphertext, key)
                 print(f"\n" + "═" * 60)
                 print("[DECRYPTION RESULT]")
                 print("═" * 60)
@@ -349,6 +372,17 @@ def hill_cipher_interface():
             print("Invalid choice. Please select 1, 2, or 3.")
 
 
+def print_cache_stats():
+    """Print how often results were served from the session cache"""
+    if _result_cache is None:
+        return
+    stats = _result_cache.stats()
+    lookups = stats.hits + stats.misses
+    if lookups:
+        print(f"\nResult cache: {stats.hits}/{lookups} hits ({stats.hit_rate:.0%}), "
+              f"{stats.entries} results in {stats.bytes / 1024:.1f} KB")
+
+
 def main():
     """Main application loop"""
     print_banner()
@@ -366,6 +400,7 @@ def main():
         elif choice == '4':
             hill_cipher_interface()
         elif choice == '5':
+            print_cache_stats()
             print("\nThank you for using Classical Cipher Tool!")
             print("=" * 60 + "\n")
             break
@@ -373,5 +408,192 @@ def main():
             print("\nInvalid choice. Please select a number between 1 and 5.")
 
 
+def run_file_command(argv):
+    """
+    Non-interactive file mode
+    Args:
+        argv (list): Command line arguments (without the program name)
+    Returns:
+        int: Exit status
+    """
+    import argparse
+    parser = argparse.ArgumentParser(description="Encrypt or decrypt files with a classical cipher")
+    commands = parser.add_subparsers(dest='command', required=True)
+    for command in ('encrypt', 'decrypt'):
+        sub = commands.add_parser(command, help=f"{command.capitalize()} a file")
+        sub.add_argument('cipher', help=f"Cipher name ({', '.join(cipher_names())})")
+        sub.add_argument('key', help="Cipher key, e.g. 3 or 5,8 or MONARCHY or 3,3,2,5")
+        sub.add_argument('source', help="Input text file (.gz/.bz2/.xz are decompressed)")
+        sub.add_argument('destination', help="Output file, overwritten (.gz/.bz2/.xz are compressed)")
+        if command == 'encrypt':
+            sub.add_argument('--fold-accents', action='store_true',
+                             help="Encrypt accented letters as their base letters (é -> e, ß -> ss)")
+            sub.add_argument('--index', action='store_true',
+                             help="Also write a letter-offset index for decrypt-range")
+            sub.add_argument('--verify', type=parse_fraction, metavar='FRACTION',
+                             help="Decrypt a random sample of the output (e.g. 1%% or 0.01) "
+                                  "and compare it with the source")
+    sub = commands.add_parser('decrypt-range', help="Decrypt a byte range of a file to stdout")
+    sub.add_argument('cipher', help=f"Cipher name ({', '.join(cipher_names())})")
+    sub.add_argument('key', help="Cipher key, e.g. 3 or 5,8 or MONARCHY or 3,3,2,5")
+    sub.add_argument('source', help="Uncompressed ciphertext file")
+    sub.add_argument('start', type=int, help="First byte offset")
+    sub.add_argument('end', type=int, help="Byte offset after the range")
+    sub = commands.add_parser('pack', help="Encrypt a file into a chunk-indexed container")
+    sub.add_argument('cipher', help=f"Cipher name ({', '.join(cipher_names())})")
+    sub.add_argument('key', help="Cipher key, e.g. 3 or 5,8 or MONARCHY or 3,3,2,5")
+    sub.add_argument('source', help="Uncompressed input text file")
+    sub.add_argument('destination', help="Container file, overwritten")
+    sub.add_argument('--workers', type=int, default=1, help="Processes encrypting chunks")
+    sub = commands.add_parser('unpack', help="Decrypt a container (the cipher is read from it)")
+    sub.add_argument('key', help="Cipher key the container was written with")
+    sub.add_argument('source', help="Container file")
+    sub.add_argument('destination', help="Output text file, overwritten")
+    sub.add_argument('--workers', type=int, default=1, help="Processes decrypting chunks")
+    sub = commands.add_parser('encrypt-log', help="Encrypt what was appended to a log since the last run")
+    sub.add_argument('cipher', help=f"Cipher name ({', '.join(cipher_names())})")
+    sub.add_argument('key', help="Cipher key, e.g. 3 or 5,8 or MONARCHY or 3,3,2,5")
+    sub.add_argument('source', help="Growing log file")
+    sub.add_argument('destination', help="Encrypted copy, appended to (checkpoint: destination.ckpt)")
+    sub.add_argument('--follow', action='store_true', help="Keep encrypting as the log grows")
+    sub.add_argument('--interval', type=float, default=1.0, help="Seconds between checks with --follow")
+    sub.add_argument('--finish', action='store_true', help="Pad and flush the last block (log closed)")
+    sub = commands.add_parser('calibrate', help="Benchmark the engines and save tuned parameters")
+    sub.add_argument('--size', type=int, default=32, help="Megabytes of sample text to time (default: 32)")
+    sub.add_argument('--output', help="Tuning file (default: $CIPHER_TUNING or ~/.config/cipher-tool/tuning.json)")
+    sub.add_argument('--dry-run', action='store_true', help="Print the values without saving them")
+    args = parser.parse_args(argv)
+    
+    if args.command == 'calibrate':
+        return run_calibrate_command(args)
+    if args.command == 'encrypt-log':
+        return run_log_command(args)
+    if args.command == 'decrypt-range':
+        return run_range_command(args)
+    if args.command in ('pack', 'unpack'):
+        return run_container_command(args)
+    
+    from ciphers.files import encrypt_file, decrypt_file
+    options = {'fold': args.fold_accents, 'index': args.index} if args.command == 'encrypt' else {}
+    transform = encrypt_file if args.command == 'encrypt' else decrypt_file
+    try:
+        written = transform(args.source, args.destination, args.cipher, args.key, **options)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 1
+    print(f"✓ {args.command.capitalize()}ed {os.path.basename(args.source)} -> "
+          f"{args.destination} ({written} bytes)")
+    if args.command == 'encrypt' and args.verify:
+        return run_verification(args)
+    return 0
+
+
+def parse_fraction(text):
+    """Parse '1%' or '0.01' into a fraction between 0 and 1"""
+    import argparse
+    try:
+        value = float(text[:-1]) / 100 if text.endswith('%') else float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid fraction: {text!r}") from None
+    if not 0 < value <= 1:
+        raise argparse.ArgumentTypeError("fraction must be between 0 and 1 (or 0% and 100%)")
+    return value
+
+
+def run_verification(args):
+    """Spot-check an encrypted file by decrypting a sample of it"""
+    from ciphers.verify import can_verify, verify_sample
+    if args.fold_accents or not can_verify(args.source, args.destination, args.cipher):
+        print("⚠ Verification skipped: sampling needs a stateless cipher (caesar, affine, hill), "
+              "uncompressed files and no accent folding")
+        return 0
+    try:
+        checked, mismatches = verify_sample(args.source, args.destination, args.cipher,
+                                            args.key, args.verify)
+    except (OSError, ValueError) as e:
+        print(f"❌ Verification error: {e}", file=sys.stderr)
+        return 1
+    if mismatches:
+        print(f"❌ Verification failed: {len(mismatches)} of {checked} sampled chunks differ",
+              file=sys.stderr)
+        for mismatch in mismatches:
+            print(f"   offset {mismatch.offset}: expected {mismatch.expected!r}, "
+                  f"decrypted {mismatch.actual!r}", file=sys.stderr)
+        return 1
+    if not checked:
+        print("⚠ Verification skipped: the output is too short to sample (only its last block)")
+        return 0
+    print(f"✓ Verified {checked} sampled chunks")
+    return 0
+
+
+def run_container_command(args):
+    """Pack a text file into a container, or unpack one"""
+    from ciphers.container import write_container, read_container
+    try:
+        if args.command == 'pack':
+            chunks = write_container(args.source, args.destination, args.cipher, args.key,
+                                     workers=args.workers)
+            result = f"{chunks} chunks"
+        else:
+            result = f"{read_container(args.source, args.destination, args.key, workers=args.workers)} bytes"
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 1
+    print(f"✓ {args.command.capitalize()}ed {os.path.basename(args.source)} -> "
+          f"{args.destination} ({result})")
+    return 0
+
+
+def run_log_command(args):
+    """Append the encryption of a log's new bytes to its encrypted copy"""
+    from ciphers.append_log import LogEncryptor
+    try:
+        log = LogEncryptor(args.source, args.destination, args.cipher, args.key)
+        if args.follow:
+            log.follow(args.interval)
+        written = log.finish() if args.finish else log.sync()
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 0
+    print(f"✓ Appended {written} bytes to {args.destination}")
+    return 0
+
+
+def run_calibrate_command(args):
+    """Benchmark the engines on this machine and save the best parameters"""
+    import json
+    from ciphers.calibrate import calibrate
+    from ciphers.tuning import save_tuning
+    values = calibrate(args.size << 20, report=print)
+    if args.dry_run:
+        print(json.dumps(values, indent=2, sort_keys=True))
+        return 0
+    try:
+        path = save_tuning(values, args.output)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 1
+    print(f"✓ Saved {len(values)} parameters to {path}")
+    return 0
+
+
+def run_range_command(args):
+    """Write the decryption of args.source[args.start:args.end] to stdout"""
+    from ciphers.letter_index import decrypt_range
+    try:
+        data = decrypt_range(args.source, args.start, args.end, args.cipher, args.key)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 1
+    sys.stdout.buffer.write(data)
+    sys.stdout.flush()
+    return 0
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_file_command(sys.argv[1:]))
     main()
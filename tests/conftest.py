@@ -0,0 +1,29 @@
+"""Shared pytest setup: import the package from the repo root, untuned."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Engine constants are read from the tuning file at import; keep the
+# built-in defaults so results do not depend on this machine's calibration
+os.environ['CIPHER_TUNING'] = ''
+
+# Cipher name -> a valid key, for tests that run every registered cipher
+KEYS = {
+    'caesar': 3,
+    'affine': (5, 8),
+    'playfair': 'MONARCHY',
+    'hill': '3,3,2,5',
+}
+
+# Mixed case, punctuation, newlines and an odd letter count
+SAMPLE = "Attack at dawn! Meet me by the old mill,\nbring 3 maps.\n"
+
+
+@pytest.fixture(autouse=True, scope='session')
+def _key_table_cache(tmp_path_factory):
+    """Build the Hill key table in a scratch cache, not the user's"""
+    os.environ['CIPHER_TOOL_CACHE'] = str(tmp_path_factory.mktemp('cache'))
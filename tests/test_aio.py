@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from ciphers import aio, get_cipher
+from conftest import KEYS, SAMPLE
+
+LONG = SAMPLE * 200  # Past INLINE_CHARS: runs on the executor
+
+
+class MemoryWriter:
+    """The part of asyncio.StreamWriter that transform_stream uses"""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+
+def feed_reader(data):
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+@pytest.mark.parametrize('name', sorted(KEYS))
+def test_coroutines_match_plain_calls(name):
+    cipher, key = get_cipher(name), KEYS[name]
+
+    async def main():
+        short, long = await asyncio.gather(aio.encrypt(SAMPLE, name, key), aio.encrypt(LONG, name, key))
+        return short, long, await aio.decrypt(long, name, key)
+
+    short, long, back = asyncio.run(main())
+    assert short == cipher.encrypt(SAMPLE, key)
+    assert long == cipher.encrypt(LONG, key)
+    assert back == cipher.decrypt(long, key)
+
+
+def test_default_runner_survives_several_event_loops():
+    async def burst():
+        return await asyncio.gather(*[aio.encrypt(LONG, 'caesar', 3) for _ in range(12)])
+
+    expected = get_cipher('caesar').encrypt(LONG, 3)
+    for _ in range(3):
+        assert asyncio.run(burst()) == [expected] * 12
+
+
+def test_crack_recovers_the_key():
+    key = asyncio.run(aio.crack('HELP', 'HIAT'))
+    assert key is not None
+    assert get_cipher('hill').encrypt('HELP', key.tolist()) == 'HIAT'
+
+
+@pytest.mark.parametrize('name', ['hill', 'playfair'])
+def test_stream_matches_plain_calls(name):
+    cipher, key = get_cipher(name), KEYS[name]
+    text = LONG + 'Crème brûlée.'
+
+    async def main():
+        writer = MemoryWriter()
+        await aio.encrypt_stream(feed_reader(text.encode('utf-8')), writer, name, key, chunk_size=101)
+        return writer.data.decode('utf-8')
+
+    assert asyncio.run(main()) == cipher.encrypt(text, key)
@@ -0,0 +1,56 @@
+import pytest
+
+from ciphers import encrypt_file
+from ciphers.append_log import LogEncryptor
+from conftest import KEYS, SAMPLE
+
+PARTS = ["2024-01-01 start\n", "user bob logged in; ", "é", "ok\n", SAMPLE, "x", "yz done\n"]
+
+
+def _append(path, text):
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(text)
+
+
+@pytest.mark.parametrize('name', ['caesar', 'affine', 'hill'])
+def test_synced_log_matches_encrypt_file(tmp_path, name):
+    log, enc, ref = tmp_path / 'app.log', tmp_path / 'app.log.enc', tmp_path / 'ref.enc'
+    log.write_bytes(b'')
+    encryptor = LogEncryptor(log, enc, name, KEYS[name])
+    for part in PARTS:
+        _append(log, part)
+        encryptor.sync()
+    encryptor.finish()
+    encrypt_file(log, ref, name, KEYS[name])
+    assert enc.read_bytes() == ref.read_bytes()
+
+
+def test_resume_from_checkpoint(tmp_path):
+    log, enc, ref = tmp_path / 'app.log', tmp_path / 'app.log.enc', tmp_path / 'ref.enc'
+    log.write_text(PARTS[0], encoding='utf-8')
+    LogEncryptor(log, enc, 'hill', KEYS['hill']).sync()
+    for part in PARTS[1:]:
+        _append(log, part)
+        # A fresh process picks up where the checkpoint left off
+        LogEncryptor(log, enc, 'hill', KEYS['hill']).sync()
+    LogEncryptor(log, enc, 'hill', KEYS['hill']).finish()
+    encrypt_file(log, ref, 'hill', KEYS['hill'])
+    assert enc.read_bytes() == ref.read_bytes()
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_refuses_rewritten_source(tmp_path):
+    log, enc = tmp_path / 'app.log', tmp_path / 'app.log.enc'
+    log.write_text("hello worl, ", encoding='utf-8')  # Odd letter count: one carried
+    LogEncryptor(log, enc, 'hill', KEYS['hill']).sync()
+    log.write_text("hello worX, more", encoding='utf-8')
+    with pytest.raises(ValueError, match="rewritten"):
+        LogEncryptor(log, enc, 'hill', KEYS['hill']).sync()
+
+
+def test_refuses_other_key(tmp_path):
+    log, enc = tmp_path / 'app.log', tmp_path / 'app.log.enc'
+    log.write_text(SAMPLE, encoding='utf-8')
+    LogEncryptor(log, enc, 'caesar', 3).sync()
+    with pytest.raises(ValueError):
+        LogEncryptor(log, enc, 'caesar', 4)
@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+from ciphers import get_cipher
+from ciphers.batch import decrypt_many, encrypt_many
+from conftest import KEYS, SAMPLE
+
+TEXTS = ["", "a", "Hi!", "xyz", "Ünïcödé and ascii", "  ...  ", SAMPLE,
+         "Attack at dawn", "Attack at dawn", SAMPLE * 3, "AbCd EfGh"]
+
+OTHER_KEYS = {'caesar': [1, 7, 25], 'affine': [(3, 1), (7, 0), (25, 4)],
+              'playfair': ['KEYWORD', 'CIPHER', 'MONARCHY'],
+              'hill': ['3,3,2,5', '5,17,4,15', '1,0,0,1']}
+
+
+@pytest.mark.parametrize('name', ['caesar', 'affine', 'playfair', 'hill'])
+def test_shared_key_matches_single_calls(name):
+    cipher, key = get_cipher(name), KEYS[name]
+    encrypted = encrypt_many(TEXTS, name, KEYS[name])
+    assert encrypted == [cipher.encrypt(text, key) for text in TEXTS]
+    assert decrypt_many(encrypted, name, key) == [cipher.decrypt(text, key) for text in encrypted]
+
+
+@pytest.mark.parametrize('name', ['caesar', 'affine', 'playfair', 'hill'])
+def test_per_message_keys_match_single_calls(name):
+    cipher = get_cipher(name)
+    rng = random.Random(name)
+    keys = [rng.choice(OTHER_KEYS[name]) for _ in TEXTS]
+    encrypted = encrypt_many(TEXTS, cipher, keys=keys)
+    assert encrypted == [cipher.encrypt(text, key) for text, key in zip(TEXTS, keys)]
+    decrypted = decrypt_many(encrypted, cipher, keys=keys)
+    assert decrypted == [cipher.decrypt(text, key) for text, key in zip(encrypted, keys)]
+
+
+def test_key_arguments_are_checked():
+    with pytest.raises(ValueError):
+        encrypt_many(TEXTS, 'caesar')
+    with pytest.raises(ValueError):
+        encrypt_many(TEXTS, 'caesar', 3, keys=[3] * len(TEXTS))
+    with pytest.raises(ValueError):
+        encrypt_many(TEXTS, 'caesar', keys=[3])
@@ -0,0 +1,40 @@
+import sys
+
+import pytest
+
+from ciphers import ResultCache, get_cipher
+from conftest import KEYS, SAMPLE
+
+
+@pytest.mark.parametrize('name', sorted(KEYS))
+def test_cached_results_match_plain_calls(name):
+    cipher, key = get_cipher(name), KEYS[name]
+    cache = ResultCache()
+    ciphertext = cipher.encrypt(SAMPLE, key)
+    for _ in range(2):
+        assert cache.encrypt(cipher, SAMPLE, key) == ciphertext
+        assert cache.decrypt(cipher, ciphertext, key) == cipher.decrypt(ciphertext, key)
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (2, 2, 2)
+
+
+def test_equivalent_key_spellings_share_an_entry():
+    cipher, cache = get_cipher('hill'), ResultCache()
+    cache.encrypt(cipher, SAMPLE, '3,3,2,5')
+    assert cache.encrypt(cipher, SAMPLE, [[3, 3], [2, 5]]) == cipher.encrypt(SAMPLE, '3,3,2,5')
+    assert cache.stats().hits == 1
+
+
+def test_least_recently_used_results_are_evicted_by_size():
+    cipher = get_cipher('caesar')
+    texts = [f"{i} {SAMPLE}" for i in range(10)]
+    size = sys.getsizeof(cipher.encrypt(texts[0], 3))
+    cache = ResultCache(max_bytes=3 * size)
+    for text in texts[:3]:
+        cache.encrypt(cipher, text, 3)
+    cache.encrypt(cipher, texts[0], 3)          # Now the most recently used
+    cache.encrypt(cipher, texts[3], 3)          # Evicts texts[1]
+    stats = cache.stats()
+    assert stats.bytes <= 3 * size and stats.evictions == 1
+    assert cache.get(cache.make_key(cipher, 3, False, texts[0])) is not None
+    assert cache.get(cache.make_key(cipher, 3, False, texts[1])) is None
@@ -0,0 +1,37 @@
+import pytest
+
+from ciphers import Cascade, get_cipher
+from conftest import KEYS, SAMPLE
+
+EVEN = SAMPLE + 'x'  # Even letter count: no stage pads
+
+
+def chained(names, text, decrypt=False):
+    """Stage by stage with the plain encrypt()/decrypt() calls"""
+    stages = list(zip(names, (KEYS[n] for n in names)))
+    for name, key in (reversed(stages) if decrypt else stages):
+        cipher = get_cipher(name)
+        text = (cipher.decrypt if decrypt else cipher.encrypt)(text, key)
+    return text
+
+
+@pytest.mark.parametrize('names', [
+    ['caesar', 'affine'],
+    ['caesar', 'affine', 'hill', 'caesar'],
+    ['hill', 'hill', 'affine'],
+    ['affine', 'playfair', 'hill'],
+])
+def test_fused_stages_match_chained_calls(names):
+    cascade = Cascade(names)
+    keys = [KEYS[n] for n in names]
+    ciphertext = cascade.encrypt(EVEN, keys)
+    assert ciphertext == chained(names, EVEN)
+    assert cascade.decrypt(ciphertext, keys) == chained(names, ciphertext, decrypt=True)
+
+
+def test_stateless_cascade_round_trips_odd_text():
+    names = ['caesar', 'hill', 'affine', 'hill']
+    cascade = Cascade(names)
+    keys = [KEYS[n] for n in names]
+    assert cascade.stateless
+    assert cascade.decrypt(cascade.encrypt(SAMPLE, keys), keys) == SAMPLE
@@ -0,0 +1,50 @@
+import pytest
+
+from ciphers import ContainerReader, get_cipher, read_container, write_container
+from conftest import KEYS, SAMPLE
+
+TEXT = SAMPLE * 60 + "Crème brûlée, 漢字 — the end.\n"
+
+
+@pytest.mark.parametrize('name', ['caesar', 'affine', 'hill', 'playfair'])
+def test_round_trip_matches_plain_decrypt(tmp_path, name):
+    cipher, key = get_cipher(name), KEYS[name]
+    src, box, out = tmp_path / 'plain.txt', tmp_path / 'secret.cph', tmp_path / 'out.txt'
+    src.write_text(TEXT, encoding='utf-8')
+    chunks = write_container(src, box, name, key, chunk_bytes=256)
+    assert chunks > 1
+    read_container(box, out, key)
+    expected = cipher.decrypt(cipher.encrypt(TEXT, key), key)
+    assert out.read_text(encoding='utf-8') == expected
+
+
+def test_chunks_decrypt_in_any_order(tmp_path):
+    cipher, key = get_cipher('hill'), KEYS['hill']
+    src, box = tmp_path / 'plain.txt', tmp_path / 'secret.cph'
+    src.write_text(TEXT, encoding='utf-8')
+    write_container(src, box, cipher, key, chunk_bytes=200)
+    with ContainerReader(box) as reader:
+        order = list(range(reader.chunk_count))[::-1]
+        parts = {i: reader.decrypt_chunk(i, key) for i in order}
+        assert b''.join(parts[i] for i in sorted(parts)) == b''.join(reader.iter_decrypt(key))
+        with pytest.raises(ValueError, match="Key does not match"):
+            reader.check_key('1,0,0,1')
+    expected = cipher.decrypt(cipher.encrypt(TEXT, key), key)
+    assert b''.join(parts[i] for i in sorted(parts)).decode('utf-8') == expected
+
+
+def test_wrong_key_leaves_no_output(tmp_path):
+    src, box, out = tmp_path / 'plain.txt', tmp_path / 'secret.cph', tmp_path / 'out.txt'
+    src.write_text(TEXT, encoding='utf-8')
+    write_container(src, box, 'caesar', 3)
+    with pytest.raises(ValueError):
+        read_container(box, out, 4)
+    assert not out.exists()
+
+
+@pytest.mark.parametrize('data', [b'', b'not a container at all'])
+def test_rejects_other_files(tmp_path, data):
+    path = tmp_path / 'other.bin'
+    path.write_bytes(data)
+    with pytest.raises(ValueError, match="Not a cipher container"):
+        ContainerReader(path)
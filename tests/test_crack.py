@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+
+from ciphers import HillCipherCracker, get_cipher
+from ciphers.hill_keys import sample_keys
+from ciphers.modular import MOD_INVERSES
+
+
+def first_matching_key(pt_digraphs, ct_digraphs):
+    """Reference search: the first invertible key in (a, b, c, d) order that fits"""
+    keys = np.indices((26,) * 4).reshape(4, -1).T.reshape(-1, 2, 2)
+    det = (keys[:, 0, 0] * keys[:, 1, 1] - keys[:, 0, 1] * keys[:, 1, 0]) % 26
+    keys = keys[(det % 2 != 0) & (det % 13 != 0)]
+    produced = np.einsum('kij,nj->kni', keys, np.array(pt_digraphs)) % 26
+    match = (produced == np.array(ct_digraphs)).all(axis=(1, 2))
+    return keys[np.argmax(match)] if match.any() else None
+
+
+def encrypt(key, plaintext):
+    return get_cipher('hill').encrypt(plaintext, ','.join(map(str, np.ravel(key))))
+
+
+def even_letter_cribs(count, rng):
+    """Plaintexts whose digraph matrices are all singular (even letters only)"""
+    for _ in range(count):
+        letters = rng.choice(np.arange(0, 26, 2), size=2 * rng.integers(1, 5))
+        yield ''.join(chr(97 + letter) for letter in letters)
+
+
+def test_row_search_matches_full_search():
+    cracker, rng = HillCipherCracker(), np.random.default_rng(48)
+    for key, plaintext in zip(sample_keys(10, rng), even_letter_cribs(10, rng)):
+        ciphertext = encrypt(key, plaintext)
+        pt = cracker._text_to_digraphs(plaintext)
+        ct = cracker._text_to_digraphs(ciphertext)
+        found = cracker._crack_bruteforce(pt, ct)
+        expected = first_matching_key(pt, ct)
+        assert np.array_equal(found, expected)
+        assert encrypt(found, plaintext) == ciphertext
+
+
+@pytest.mark.parametrize('plaintext, ciphertext', [('mishu', 'imxtzz'), ('aceg', None)])
+def test_fallback_key_reproduces_the_ciphertext(plaintext, ciphertext):
+    ciphertext = ciphertext or encrypt([[3, 3], [2, 5]], plaintext)
+    key = HillCipherCracker().crack_key(plaintext, ciphertext)
+    assert key is not None
+    assert encrypt(key, plaintext).lower() == ciphertext.lower()
+
+
+def test_row_search_rejects_impossible_pairs():
+    # Equal plaintext digraphs cannot map to different ciphertext digraphs
+    assert HillCipherCracker().crack_key('abab', 'cdef') is None
+
+
+@pytest.mark.parametrize('keyspace, slab_keys', [('invertible', 1 << 15), ('all', 1 << 15),
+                                                 ('invertible', 157248)])
+def test_exhaustive_search_matches_row_search(keyspace, slab_keys):
+    cracker, rng = HillCipherCracker(), np.random.default_rng(49)
+    keys = sample_keys(5, rng)
+    cribs = ['hello', 'mishu', *even_letter_cribs(3, rng)]
+    for key, plaintext in zip(keys, cribs):
+        ciphertext = encrypt(key, plaintext)
+        pt = cracker._text_to_digraphs(plaintext)
+        ct = cracker._text_to_digraphs(ciphertext)
+        found = cracker._crack_exhaustive(pt, ct, keyspace, slab_keys)
+        assert np.array_equal(found, cracker._crack_bruteforce(pt, ct))
+        assert encrypt(found, plaintext) == ciphertext
+
+
+def test_exhaustive_method():
+    cracker = HillCipherCracker()
+    assert cracker.crack_key('hello', 'hiozhn', method='exhaustive').tolist() == [[3, 3], [2, 5]]
+    assert cracker.crack_key('abab', 'cdef', method='exhaustive') is None
+    with pytest.raises(ValueError):
+        cracker.crack_key('hello', 'hiozhn', method='fast')
+
+
+@pytest.mark.parametrize('n, batch_pairs', [(2, 1), (7, 1), (7, 4), (30, 100), (30, 10 ** 6)])
+def test_pair_batches_follow_combinations_order(n, batch_pairs):
+    from itertools import combinations
+    batches = list(HillCipherCracker()._pair_batches(n, batch_pairs))
+    pairs = [(int(i), int(j)) for first, second in batches for i, j in zip(first, second)]
+    assert pairs == list(combinations(range(n), 2))
+
+
+@pytest.mark.parametrize('batch_pairs', [1, 3, 1 << 16])
+def test_algebraic_attack_recovers_random_keys(monkeypatch, batch_pairs):
+    monkeypatch.setattr(HillCipherCracker, 'BATCH_PAIRS', batch_pairs)
+    cracker, rng = HillCipherCracker(), np.random.default_rng(50)
+    for key, length in zip(sample_keys(10, rng), [4, 6, 10, 40, 400] * 2):
+        # Singular (even-letter) digraphs first, so the early batches hold no invertible pair
+        letters = np.concatenate([rng.choice(np.arange(0, 26, 2), size=6),
+                                  rng.integers(0, 26, size=length)])
+        plaintext = ''.join(chr(97 + letter) for letter in letters)
+        ciphertext = encrypt(key, plaintext)
+        pt = cracker._text_to_digraphs(plaintext)
+        ct = cracker._text_to_digraphs(ciphertext)
+        found = cracker._crack_algebraic(pt, ct)
+        if found is None:
+            # Only when no two digraphs form an invertible matrix
+            det = cracker._pair_determinants(pt)[2]
+            assert not (MOD_INVERSES[det] != 0).any()
+            continue
+        assert encrypt(found, plaintext) == ciphertext
+        assert np.array_equal(cracker.crack_key(plaintext, ciphertext), found)
+
+
+def test_algebraic_attack_rejects_inconsistent_cribs():
+    cracker = HillCipherCracker()
+    plaintext = 'hello world'
+    ciphertext = list(encrypt([[3, 3], [2, 5]], plaintext).replace(' ', ''))
+    ciphertext[-2] = 'a' if ciphertext[-2] != 'a' else 'b'
+    pt = cracker._text_to_digraphs(plaintext)
+    ct = cracker._text_to_digraphs(''.join(ciphertext))
+    assert cracker._crack_algebraic(pt, ct) is None
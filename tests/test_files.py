@@ -0,0 +1,74 @@
+import bz2
+import gzip
+import lzma
+import random
+
+import pytest
+
+from ciphers import byte_text, decrypt_file, encrypt_file, files, get_cipher
+from conftest import KEYS, SAMPLE
+
+TEXT = SAMPLE + "Crème brûlée, 漢字 and naïve façades.\n" + SAMPLE * 40
+
+
+@pytest.mark.parametrize('name', sorted(KEYS))
+def test_file_round_trip_matches_encrypt(tmp_path, name):
+    cipher, key = get_cipher(name), KEYS[name]
+    src, enc, dec = tmp_path / 'plain.txt', tmp_path / 'secret.txt', tmp_path / 'back.txt'
+    src.write_text(TEXT, encoding='utf-8')
+    encrypt_file(src, enc, name, key)
+    ciphertext = enc.read_text(encoding='utf-8')
+    assert ciphertext == cipher.encrypt(TEXT, key)
+    decrypt_file(enc, dec, name, key)
+    assert dec.read_text(encoding='utf-8') == cipher.decrypt(ciphertext, key)
+
+
+@pytest.mark.parametrize('name', ['hill', 'affine'])
+def test_small_slabs_match_one_slab(tmp_path, monkeypatch, name):
+    monkeypatch.setattr(byte_text, 'SLAB_BYTES', 7)
+    cipher, key = get_cipher(name), KEYS[name]
+    src, enc = tmp_path / 'plain.txt', tmp_path / 'secret.txt'
+    src.write_text(TEXT, encoding='utf-8')
+    encrypt_file(src, enc, name, key)
+    assert enc.read_text(encoding='utf-8') == cipher.encrypt(TEXT, key)
+
+
+def test_empty_file(tmp_path):
+    src, enc = tmp_path / 'empty.txt', tmp_path / 'secret.txt'
+    src.write_bytes(b'')
+    assert encrypt_file(src, enc, 'hill', KEYS['hill']) == 0
+    assert enc.read_bytes() == b''
+
+
+@pytest.mark.parametrize('suffix', ['.gz', '.bz2', '.xz'])
+@pytest.mark.parametrize('name', sorted(KEYS))
+def test_compressed_round_trip_matches_encrypt(tmp_path, monkeypatch, suffix, name):
+    monkeypatch.setattr(files, 'STREAM_CHUNK', 97)  # Cuts UTF-8 characters and blocks
+    opener = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}[suffix]
+    cipher, key = get_cipher(name), KEYS[name]
+    src, enc, dec = (tmp_path / ('plain.txt' + suffix), tmp_path / ('secret.txt' + suffix),
+                     tmp_path / 'back.txt')
+    with opener(src, 'wt', encoding='utf-8') as f:
+        f.write(TEXT)
+    encrypt_file(src, enc, name, key)
+    with opener(enc, 'rt', encoding='utf-8') as f:
+        ciphertext = f.read()
+    assert ciphertext == cipher.encrypt(TEXT, key)
+    decrypt_file(enc, dec, name, key)
+    assert dec.read_text(encoding='utf-8') == cipher.decrypt(ciphertext, key)
+
+
+@pytest.mark.parametrize('name', ['caesar', 'hill'])
+@pytest.mark.parametrize('decrypt', [False, True])
+def test_byte_stream_matches_one_shot(name, decrypt):
+    cipher, key = get_cipher(name), KEYS[name]
+    one_shot = cipher.decrypt if decrypt else cipher.encrypt
+    rng = random.Random(name)
+    for text in [TEXT, '', 'é', 'a' + ' ' * 300 + 'b'] + \
+            [''.join(rng.choice('aB .é\n') for _ in range(60)) for _ in range(100)]:
+        data, stream, out, i = text.encode('utf-8'), byte_text.ByteStream(cipher, key, decrypt), b'', 0
+        while i < len(data):
+            size = rng.randint(0, 9)
+            out += stream.feed(data[i:i + size])
+            i += size
+        assert (out + stream.finish()).decode('utf-8') == one_shot(text, key)
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from ciphers.hill_cipher import HillCipher, transform_pairs
+from conftest import KEYS, SAMPLE
+
+KEY = [[3, 3], [2, 5]]
+
+
+def reference(pairs, matrix):
+    return (pairs.astype(int) @ np.array(matrix).T % 26).astype(np.uint8)
+
+
+@pytest.mark.parametrize('threads', [1, 2, 4])
+def test_bulk_matches_plain_encrypt(threads):
+    cipher, key = HillCipher(), KEYS['hill']
+    text = SAMPLE * 300
+    ciphertext = cipher.encrypt_bulk(text, key, threads=threads)
+    assert ciphertext == cipher.encrypt(text, key)
+    assert cipher.decrypt_bulk(ciphertext, key, threads=threads) == text
+
+
+@pytest.mark.parametrize('threads', [1, 3])
+@pytest.mark.parametrize('slab_pairs', [1, 7, 4096])
+def test_slabs_match_one_matmul(threads, slab_pairs):
+    pairs = np.random.default_rng(0).integers(0, 26, size=(5000, 2), dtype=np.uint8)
+    out = transform_pairs(pairs, KEY, threads=threads, slab_pairs=slab_pairs)
+    assert out.dtype == np.uint8
+    assert (out == reference(pairs, KEY)).all()
@@ -0,0 +1,30 @@
+import numpy as np
+
+from ciphers.hill_cipher import HillCipher
+from ciphers.hill_keys import KEY_COUNT, build_key_table, load_key_table, sample_keys
+from conftest import SAMPLE
+
+
+def test_table_holds_every_invertible_key_once():
+    table = build_key_table()
+    assert len(table) == KEY_COUNT
+    keys = table['key'].astype(int)
+    assert len(np.unique(keys.reshape(-1, 4), axis=0)) == KEY_COUNT
+    identity = np.einsum('nij,njk->nik', keys, table['inverse'].astype(int)) % 26
+    assert (identity == np.eye(2, dtype=int)).all()
+
+
+def test_sampled_keys_round_trip():
+    cipher = HillCipher()
+    for key in sample_keys(20, rng=1):
+        ciphertext = cipher.encrypt(SAMPLE, key)
+        assert cipher.decrypt(ciphertext, key) == SAMPLE
+
+
+def test_corrupt_table_file_is_rebuilt(tmp_path):
+    path = tmp_path / 'keys.npy'
+    for junk in (b'', b'\x93NUMPY', b'not a table' * 100):
+        path.write_bytes(junk)
+        table = load_key_table(str(path))
+        assert table.shape == (KEY_COUNT,)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['keys.npy']
@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+from check_import_time import CHECKS  # noqa: E402
+
+
+@pytest.mark.parametrize('snippet,forbidden', CHECKS)
+def test_light_entry_points_skip_heavy_modules(snippet, forbidden):
+    probe = f"{snippet}\nimport sys\nprint(','.join(m for m in {forbidden!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-c', probe], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ''
+
+
+def test_lazy_exports_are_the_module_objects():
+    import ciphers
+    from ciphers.hill_cipher import HillCipher
+    from ciphers.registry import get_cipher
+
+    assert ciphers.HillCipher is HillCipher
+    assert ciphers.get_cipher is get_cipher
+    assert set(ciphers.__all__) <= set(dir(ciphers))
+    with pytest.raises(AttributeError):
+        ciphers.NoSuchCipher
+    assert ciphers.CaesarCipher().decrypt(ciphers.CaesarCipher().encrypt('Hello', 3), 3) == 'Hello'
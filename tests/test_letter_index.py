@@ -0,0 +1,28 @@
+import random
+
+import pytest
+
+from ciphers import decrypt_range, encrypt_file, get_cipher
+from ciphers.letter_index import build_index, load_index
+from conftest import KEYS, SAMPLE
+
+TEXT = (SAMPLE + "Crème brûlée, 漢字.\n...   ;\n") * 30
+
+
+@pytest.mark.parametrize('name', ['hill', 'affine'])
+def test_ranges_match_slices_of_the_full_decryption(tmp_path, name):
+    cipher, key = get_cipher(name), KEYS[name]
+    src, enc = tmp_path / 'plain.txt', tmp_path / 'secret.txt'
+    src.write_text(TEXT, encoding='utf-8')
+    encrypt_file(src, enc, name, key, index=True)
+    data = enc.read_bytes()
+    plain = cipher.decrypt(data.decode('utf-8'), key).encode('utf-8')
+    index = build_index(str(enc), stride=64)
+    rng = random.Random(name)
+    ranges = [(0, len(data)), (0, 1), (len(data) - 3, len(data)), (63, 65), (5, 5)]
+    ranges += sorted((rng.randrange(len(data)), rng.randrange(len(data))) for _ in range(200))
+    for start, end in ranges:
+        assert decrypt_range(enc, start, end, name, key, index=index) == plain[start:end]
+    # The sidecar written by encrypt_file works as well
+    assert load_index(str(enc)) is not None
+    assert decrypt_range(enc, 100, 400, name, key) == plain[100:400]
@@ -0,0 +1,29 @@
+from math import gcd
+
+import numpy as np
+
+from ciphers.hill_cipher import HillCipher
+from ciphers.modular import VALID_DETS, det_mod, inverse_mod, invertible_mask, matmul_mod
+
+
+def test_batched_results_match_scalar_math():
+    mats = np.random.default_rng(0).integers(-30, 60, size=(2000, 2, 2))
+    dets = det_mod(mats)
+    assert list(dets) == [int(round(np.linalg.det(m))) % 26 for m in mats]
+    assert list(invertible_mask(mats)) == [gcd(int(d), 26) == 1 for d in dets]
+    assert VALID_DETS == {1, 3, 5, 7, 9, 11, 15, 17, 19, 21, 23, 25}
+
+
+def test_inverse_undoes_each_matrix():
+    mats = np.random.default_rng(1).integers(0, 26, size=(2000, 2, 2))
+    mask = invertible_mask(mats)
+    inverses = inverse_mod(mats)
+    assert (matmul_mod(mats[mask], inverses[mask]) == np.eye(2, dtype=int)).all()
+    assert not inverses[~mask].any()
+
+
+def test_hill_inverse_decrypts_its_encryption():
+    cipher = HillCipher()
+    for key in ([[3, 3], [2, 5]], [[5, 8], [17, 3]], [[7, 8], [11, 11]]):
+        inverse = cipher._matrix_inverse_2x2(np.array(key))
+        assert (matmul_mod(key, inverse) == np.eye(2, dtype=int)).all()
@@ -0,0 +1,31 @@
+import numpy as np
+
+from ciphers import HillCipherCracker, encrypt_file, fold_accents, get_cipher
+from conftest import KEYS
+
+
+def test_folding_keeps_case_and_everything_else():
+    assert fold_accents("Crème Brûlée, Straße, ÆØ!") == "Creme Brulee, Strasse, AEO!"
+    assert fold_accents("Ωμέγα 漢字 plain") == "Ωμέγα 漢字 plain"
+    assert fold_accents("ascii only") == "ascii only"
+
+
+def test_folded_file_matches_encrypting_folded_text(tmp_path):
+    text = "Crème brûlée à la façade, Straße.\n" * 50
+    src, enc = tmp_path / 'plain.txt', tmp_path / 'secret.txt'
+    src.write_text(text, encoding='utf-8')
+    for name in ('hill', 'playfair'):
+        encrypt_file(src, enc, name, KEYS[name], fold=True)
+        expected = get_cipher(name).encrypt(fold_accents(text), KEYS[name])
+        assert enc.read_text(encoding='utf-8') == expected
+
+
+def test_cracker_decrypt_keeps_unfoldable_letters_in_place():
+    cracker, key = HillCipherCracker(), np.array([[3, 3], [2, 5]])
+    hill = get_cipher('hill')
+    for text in ["Hé ΩΩ llo wx, 漢字 abc", "Ωmega café", "naïve"]:
+        letters = sum(c.isascii() and c.isalpha() for c in fold_accents(text))
+        ciphertext = hill.encrypt(fold_accents(text), KEYS['hill'])
+        assert cracker.decrypt(ciphertext, key, letters) == fold_accents(text)
+        if letters % 2 == 0:
+            assert cracker.decrypt(text, key) == hill.decrypt(fold_accents(text), KEYS['hill'])
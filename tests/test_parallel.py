@@ -0,0 +1,28 @@
+import pytest
+
+from ciphers import ParallelExecutor, get_cipher
+from conftest import KEYS, SAMPLE
+
+TEXT = (SAMPLE + "Crème brûlée, 漢字 and naïve façades.\n") * 60
+
+
+@pytest.fixture(scope='module')
+def executor():
+    with ParallelExecutor(workers=2, chunk_bytes=256) as executor:
+        yield executor
+
+
+@pytest.mark.parametrize('name', sorted(KEYS))
+def test_chunked_workers_match_encrypt(executor, name):
+    cipher, key = get_cipher(name), KEYS[name]
+    ciphertext = executor.encrypt(TEXT, name, key)
+    assert ciphertext == cipher.encrypt(TEXT, key)
+    assert executor.decrypt(ciphertext, name, key) == cipher.decrypt(ciphertext, key)
+
+
+def test_bytes_with_split_utf8_at_chunk_edges(executor):
+    cipher, key = get_cipher('hill'), KEYS['hill']
+    for size in (255, 256, 257, 1023):
+        text = ('é' * size + 'ab c' + TEXT)[:4 * size]
+        data = executor.transform_bytes(text.encode('utf-8'), 'hill', key)
+        assert data.decode('utf-8') == cipher.encrypt(text, key)
@@ -0,0 +1,40 @@
+import pytest
+
+from ciphers import Cipher, cipher_names, get_cipher
+from ciphers.text_buffer import TextBuffer
+from conftest import KEYS, SAMPLE
+
+
+def test_every_cipher_is_registered_with_a_test_key():
+    assert sorted(cipher_names()) == sorted(KEYS)
+
+
+@pytest.mark.parametrize('name', sorted(KEYS))
+def test_compiled_key_matches_raw_key(name):
+    cipher, key = get_cipher(name), KEYS[name]
+    assert isinstance(cipher, Cipher)
+    compiled = cipher.compile_key(key)
+    hash(compiled)
+    assert cipher.compile_key(compiled) == compiled
+    ciphertext = cipher.encrypt(SAMPLE, key)
+    assert cipher.encrypt(SAMPLE, compiled) == ciphertext
+    assert cipher.decrypt(ciphertext, compiled) == cipher.decrypt(ciphertext, key)
+
+
+@pytest.mark.parametrize('name', [n for n in sorted(KEYS) if get_cipher(n).stateless])
+def test_array_kernel_matches_text_path(name):
+    cipher = get_cipher(name)
+    key = cipher.compile_key(KEYS[name])
+    letters = TextBuffer.from_text(SAMPLE).letters
+    expected = TextBuffer.from_text(cipher.encrypt(SAMPLE, key)).letters
+    encrypted = cipher.encrypt_array(letters, key)
+    assert (encrypted == expected).all()
+    assert (cipher.decrypt_array(encrypted, key) == letters).all()
+    even = letters[:len(letters) - len(letters) % cipher.block_size]
+    assert (cipher.encrypt_array(even, key, final=False) == expected[:len(even)]).all()
+
+
+def test_lookup_by_alias_and_unknown_name():
+    assert get_cipher('Hill (2×2)') is get_cipher('HILL') is get_cipher('hill')
+    with pytest.raises(ValueError):
+        get_cipher('enigma')
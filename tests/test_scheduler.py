@@ -0,0 +1,69 @@
+import pytest
+
+from ciphers import get_cipher
+from ciphers.scheduler import AdaptiveScheduler, CostModel
+from conftest import KEYS, SAMPLE
+
+TEXTS = ["", "Hi!", SAMPLE, SAMPLE * 50]
+
+
+@pytest.mark.parametrize('budget', [1.0, 0.0])
+@pytest.mark.parametrize('name', ['caesar', 'affine', 'playfair', 'hill'])
+def test_futures_match_plain_calls(name, budget):
+    cipher, key = get_cipher(name), KEYS[name]
+    # A zero budget sends every job to a thread (no process pool here)
+    with AdaptiveScheduler(process_workers=0, inline_budget=budget) as scheduler:
+        encrypted = [scheduler.encrypt(text, name, key) for text in TEXTS]
+        encrypted = [future.result() for future in encrypted]
+        assert encrypted == [cipher.encrypt(text, key) for text in TEXTS]
+        decrypted = [scheduler.decrypt(text, cipher, key).result() for text in encrypted]
+        assert decrypted == [cipher.decrypt(text, key) for text in encrypted]
+        assert sum(stats.jobs for stats in scheduler.stats().values()) == 2 * len(TEXTS)
+
+
+def test_process_route_matches_plain_calls():
+    cipher, key = get_cipher('hill'), KEYS['hill']
+    with AdaptiveScheduler(process_workers=1, inline_budget=0.0, process_factor=0) as scheduler:
+        assert scheduler.route(('hill', 'encrypt'), len(SAMPLE)) == 'process'
+        assert scheduler.encrypt(SAMPLE, 'hill', key).result() == cipher.encrypt(SAMPLE, key)
+        assert scheduler.stats()['process'].jobs == 1
+
+
+def test_crack_future():
+    with AdaptiveScheduler(process_workers=0) as scheduler:
+        key = scheduler.crack('hello', 'hiozhn').result()
+    assert key.tolist() == [[3, 3], [2, 5]]
+
+
+def test_errors_reach_the_future():
+    with AdaptiveScheduler(process_workers=0) as scheduler:
+        with pytest.raises(ValueError):
+            scheduler.encrypt(SAMPLE, 'hill', '2,4,6,8').result()
+
+
+def test_routes_and_thresholds():
+    scheduler = AdaptiveScheduler(process_workers=0)
+    inline, process = scheduler.thresholds('hill', 'encrypt')
+    assert 0 < inline
+    assert scheduler.route(('hill', 'encrypt'), 10) == 'inline'
+    assert scheduler.route(('hill', 'encrypt'), 10 ** 8) == 'thread'
+    # GIL-bound jobs never go to a thread while a process can take them
+    scheduler.process_workers = 1
+    assert scheduler.route(('playfair', 'encrypt'), 10 ** 8, python_bound=True) == 'process'
+    assert scheduler.route(('playfair', 'encrypt'), 10 ** 4, python_bound=True) != 'thread'
+
+
+def test_cost_model_never_loses_its_slope():
+    # Equal sizes: the slope stays positive, so larger jobs still cost more
+    model = CostModel(1e-5, 2e-7)
+    for _ in range(100):
+        model.add(5_000, 0.01)
+    assert model.coefficients()[1] > 0
+    assert model.predict(5_000) == pytest.approx(0.01, rel=0.05)
+    assert model.predict(50_000) > model.predict(5_000)
+
+    # Noise sloping the wrong way falls back to the prior slope
+    model = CostModel(1e-5, 2e-7)
+    for size, seconds in [(1_000, 0.02), (100_000, 0.01)] * 50:
+        model.add(size, seconds)
+    assert model.coefficients()[1] == 2e-7
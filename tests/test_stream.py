@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from ciphers import get_cipher
+from ciphers.stream import CipherStream
+from conftest import KEYS, SAMPLE
+
+STREAMING = ['caesar', 'affine', 'hill']
+
+
+def chunked(text, rng):
+    """Split text into random pieces, empty ones included"""
+    pieces, i = [], 0
+    while i < len(text):
+        size = rng.randint(0, 7)
+        pieces.append(text[i:i + size])
+        i += size
+    return pieces
+
+
+def run_stream(stream, pieces):
+    return ''.join(stream.feed(piece) for piece in pieces) + stream.finish()
+
+
+@pytest.mark.parametrize('name', STREAMING)
+@pytest.mark.parametrize('decrypt', [False, True])
+def test_any_chunking_matches_one_shot(name, decrypt):
+    cipher, key = get_cipher(name), KEYS[name]
+    one_shot = cipher.decrypt if decrypt else cipher.encrypt
+    rng = random.Random(name)
+    texts = [SAMPLE, '', 'a', 'ab', '...', 'x ' * 50, 'Hello,\n\n  World!' + ' ' * 200 + 'q']
+    texts += [''.join(rng.choice('abXY .,\n') for _ in range(rng.randint(0, 80)))
+              for _ in range(100)]
+    for text in texts:
+        expected = one_shot(text, key)
+        for _ in range(3):
+            assert run_stream(CipherStream(cipher, key, decrypt), chunked(text, rng)) == expected
+
+
+def test_hill_encryptor_and_decryptor_round_trip():
+    cipher, key = get_cipher('hill'), KEYS['hill']
+    pieces = chunked(SAMPLE, random.Random(0))
+    ciphertext = run_stream(cipher.encryptor(key), pieces)
+    assert ciphertext == cipher.encrypt(SAMPLE, key)
+    assert run_stream(cipher.decryptor(key), [ciphertext[:9], ciphertext[9:]]) == SAMPLE
+
+
+def test_streaming_requires_support():
+    with pytest.raises(ValueError):
+        CipherStream(get_cipher('playfair'), KEYS['playfair'])
@@ -0,0 +1,74 @@
+import random
+
+import numpy as np
+import pytest
+
+from ciphers import get_cipher
+from ciphers.text_buffer import TextBuffer
+from conftest import KEYS, SAMPLE
+
+
+def random_text(rng, size):
+    return ''.join(rng.choice('aZ .,\n\tß漢é!') for _ in range(size))
+
+
+def test_text_round_trips_through_a_buffer():
+    rng = random.Random(0)
+    for text in ['', 'abc', '...', SAMPLE] + [random_text(rng, 40) for _ in range(200)]:
+        buffer = TextBuffer.from_text(text)
+        assert buffer.to_text() == text
+        assert len(buffer) == len(text)
+        assert buffer.letter_count == sum(c.isascii() and c.isalpha() for c in text)
+
+
+@pytest.mark.parametrize('name', sorted(KEYS))
+def test_buffer_input_matches_text_input(name):
+    cipher, key = get_cipher(name), KEYS[name]
+    for text in [SAMPLE, 'b , ', '.ax.XXxx!.']:
+        ciphertext = cipher.encrypt(text, key)
+        assert cipher.encrypt(TextBuffer.from_text(text), key).to_text() == ciphertext
+        assert cipher.decrypt(TextBuffer.from_text(ciphertext), key).to_text() == \
+            cipher.decrypt(ciphertext, key)
+
+
+def test_gui_reencrypts_a_decrypted_result_like_fresh_text():
+    pytest.importorskip('PyQt6')
+    from cipher_gui.actions.cipher_actions import CipherActions
+
+    for name in ('playfair', 'hill'):
+        cipher, key = get_cipher(name), KEYS[name]
+        for text in ['b , ', '.ax.XXxx!.', SAMPLE]:
+            actions = CipherActions(parent=None)
+            plaintext = actions.decrypt(cipher, cipher.encrypt(text, key), key)
+            assert actions.encrypt(cipher, plaintext, key) == cipher.encrypt(plaintext, key)
+
+
+def reference_layout(buffer, letters):
+    """The layout rule written out character by character"""
+    runs = [(int(position), buffer.gap_text[start:stop]) for position, start, stop in
+            zip(buffer.gap_positions, buffer.gap_offsets[:-1], buffer.gap_offsets[1:])]
+    out = []
+    for i, letter in enumerate(letters):
+        out += [text for position, text in runs if position == i]
+        out.append(letter)
+    out += [text for position, text in runs if position >= len(letters)]
+    return ''.join(out)
+
+
+def test_layout_pass_matches_the_rule_for_any_letter_count():
+    rng = random.Random(1)
+    for _ in range(300):
+        buffer = TextBuffer.from_text(random_text(rng, 30))
+        count = max(0, buffer.letter_count + rng.randint(-3, 3))
+        letters = np.array([rng.randrange(26) for _ in range(count)], dtype=np.uint8)
+        text = buffer.replace_letters(letters, np.zeros(count, dtype=bool)).to_text()
+        assert text == reference_layout(buffer, ''.join(chr(97 + i) for i in letters))
+
+
+@pytest.mark.parametrize('name', ['hill', 'playfair'])
+def test_padding_keeps_punctuation_in_place(name):
+    cipher, key = get_cipher(name), KEYS[name]
+    text = "Hello, world... it's me!"
+    ciphertext = cipher.encrypt(text, key)
+    assert [c for c in ciphertext if not c.isalpha()] == [c for c in text if not c.isalpha()]
+    assert ciphertext.index(',') == text.index(',')
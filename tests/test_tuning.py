@@ -0,0 +1,64 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from ciphers import get_cipher, hill_cipher, tuning
+from ciphers.tuning import load_tuning, save_tuning, tuned
+from conftest import KEYS, SAMPLE
+
+
+def test_save_tuning_writes_json_atomically(tmp_path):
+    path = tmp_path / 'config' / 'tuning.json'
+    assert save_tuning({'slab_bytes': 4096, 'thread_overhead': 1e-4}, str(path)) == str(path)
+    assert json.loads(path.read_text()) == {'slab_bytes': 4096, 'thread_overhead': 1e-4}
+    assert os.listdir(path.parent) == ['tuning.json']
+
+
+def test_save_tuning_needs_a_path_when_disabled():
+    with pytest.raises(ValueError):
+        save_tuning({'slab_bytes': 4096})
+
+
+def test_tuned_falls_back_on_bad_values(monkeypatch):
+    monkeypatch.setattr(tuning, '_loaded', {'ints': 8, 'float_as_int': 2, 'negative': -1,
+                                            'wrong_type': '8', 'flag': True})
+    assert tuned('ints', 4) == 8
+    assert tuned('ints', None) == 8
+    assert tuned('float_as_int', 0.5) == 2.0
+    assert tuned('negative', 4) == 4
+    assert tuned('wrong_type', 4) == 4
+    assert tuned('flag', 4) == 4
+    assert tuned('missing', 4) == 4
+    assert load_tuning() == tuning._loaded
+
+
+@pytest.mark.parametrize('dtype', [np.uint8, np.int64])
+def test_pair_table_matches_matmul(dtype):
+    matrix = np.array([[3, 3], [2, 5]])
+    pairs = np.random.default_rng(1).integers(0, 26, size=(5000, 2)).astype(dtype)
+    expected = (pairs.astype(np.int64) @ matrix.T) % 26
+    for table_pairs in (0, 1 << 62):
+        for threads, slab_pairs in ((1, 1 << 20), (3, 128)):
+            result = hill_cipher.transform_pairs(pairs, matrix, threads, slab_pairs,
+                                                 table_pairs=table_pairs)
+            assert result.dtype == np.uint8
+            assert np.array_equal(result, expected)
+
+
+def test_saved_values_change_nothing_but_speed(tmp_path):
+    path = tmp_path / 'tuning.json'
+    save_tuning({'hill_table_pairs': 1, 'hill_threads': 2, 'hill_slab_pairs': 64,
+                 'slab_bytes': 4096, 'inline_chars': 16}, str(path))
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = ("import sys; from ciphers import get_cipher, hill_cipher\n"
+              "assert hill_cipher.TABLE_PAIRS == 1\n"
+              "sys.stdout.write(get_cipher('hill').encrypt(sys.stdin.read(), '3,3,2,5'))\n")
+    text = SAMPLE * 500
+    env = dict(os.environ, CIPHER_TUNING=str(path))
+    result = subprocess.run([sys.executable, '-c', script], input=text, capture_output=True,
+                            text=True, cwd=root, env=env, check=True)
+    assert result.stdout == get_cipher('hill').encrypt(text, KEYS['hill'])
@@ -0,0 +1,47 @@
+import pytest
+
+from ciphers import encrypt_file
+from ciphers.verify import can_verify, verify_sample
+from conftest import KEYS, SAMPLE
+
+TEXT = (SAMPLE + "Crème brûlée.\n") * 200
+
+
+def _encrypt(tmp_path, name, text=TEXT):
+    src, dst = tmp_path / 'plain.txt', tmp_path / 'secret.txt'
+    src.write_text(text, encoding='utf-8')
+    encrypt_file(src, dst, name, KEYS[name])
+    return src, dst
+
+
+@pytest.mark.parametrize('name', ['caesar', 'affine', 'hill'])
+def test_good_file_has_no_mismatches(tmp_path, name):
+    src, dst = _encrypt(tmp_path, name)
+    checked, mismatches = verify_sample(src, dst, name, KEYS[name], fraction=1, sample_bytes=512)
+    assert checked > 1
+    assert mismatches == []
+
+
+def test_detects_corrupted_output(tmp_path):
+    src, dst = _encrypt(tmp_path, 'hill')
+    data = bytearray(dst.read_bytes())
+    spot = next(i for i in range(1000, len(data)) if bytes([data[i]]).isalpha())
+    data[spot] = ord('A') if data[spot] != ord('A') else ord('B')
+    dst.write_bytes(bytes(data))
+    checked, mismatches = verify_sample(src, dst, 'hill', KEYS['hill'], fraction=1, sample_bytes=512)
+    assert len(mismatches) == 1
+    assert mismatches[0].start <= spot < mismatches[0].start + 512
+
+
+def test_short_file_is_still_checked(tmp_path):
+    src, dst = _encrypt(tmp_path, 'hill', SAMPLE)
+    checked, mismatches = verify_sample(src, dst, 'hill', KEYS['hill'], fraction=0.01)
+    assert checked == 1
+    assert mismatches == []
+
+
+def test_playfair_cannot_be_sampled(tmp_path):
+    src, dst = _encrypt(tmp_path, 'playfair')
+    assert not can_verify(src, dst, 'playfair')
+    with pytest.raises(ValueError):
+        verify_sample(src, dst, 'playfair', KEYS['playfair'])